@@ -0,0 +1,331 @@
+"""
+Benchmark for the costs of the PySide6 and pygfx renderers per element type.
+
+For every element type of the backend (the types in `TYPE_MAPPING` of the
+PySideRenderer and the common world objects of the PygfxRenderer), mounts a
+keyed list of elements into a suitable parent and measures:
+
+* mount: rendering the list
+* update: changing a bound attribute of every element
+* churn: removing 10% of the elements from the front and appending as many
+* unmount: clearing the list
+
+Times are reported in µs per element that is mounted, updated, churned
+(removed plus added) or unmounted. Changes are flushed once per operation.
+For PySide, the widgets are shown and the posted events (layout, deferred
+deletes) are processed as part of every operation, under the offscreen
+platform plugin of Qt. For pygfx, a frame of the scene is also drawn on an
+offscreen canvas after the mount, when a wgpu adapter is available (a
+software adapter will do); otherwise only the renderer itself is measured.
+Types that can't be mounted in this environment are reported as errors.
+
+Run headless (on a CPU-only box) with:
+
+    python benchmarks/backends.py --backend pyside pygfx --count 1000
+    python benchmarks/backends.py --backend pyside --types label button
+"""
+
+import argparse
+import json
+import os
+import textwrap
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from observ import reactive, scheduler
+
+from kolla import EventLoopType, Kolla
+from kolla.sfc import compiler
+
+SOURCE = """
+<{parent}>
+  <{tag}
+    v-for="i in items"
+    :key="i"
+    {extra}
+    :{attribute}="{value}"
+  />
+</{parent}>
+
+<script>
+import kolla
+{imports}
+
+class Bench(kolla.Component):
+    pass
+</script>
+"""
+
+# Expression for the bound attribute per kind of value
+VALUES = {
+    "text": "f'{i}:{tick}'",
+    "number": "(i + tick) % 100",
+    "bool": "(i + tick) % 2 == 0",
+    "columns": "{0: f'{i}:{tick}'}",
+    "position": "(i % 100, i // 100, tick)",
+}
+
+# Per element type: container, parent element, extra attributes, the bound
+# attribute and the kind of its value. None for types that only appear once
+# per parent (or not in a list at all).
+PYSIDE_CASES = {
+    "action": ("widget", "toolbar", "", "text", "text"),
+    "button": ("widget", "widget", "", "text", "text"),
+    "checkbox": ("widget", "widget", "", "checked", "bool"),
+    "combobox": ("widget", "widget", "", "tool_tip", "text"),
+    "dialogbuttonbox": ("widget", "widget", "", "tool_tip", "text"),
+    "dock": ("widget", "window", ':area="area"', "window_title", "text"),
+    "groupbox": ("widget", "widget", "", "title", "text"),
+    "itemmodel": None,
+    "itemselectionmodel": None,
+    "label": ("widget", "widget", "", "text", "text"),
+    "lineedit": ("widget", "widget", "", "text", "text"),
+    "menu": ("widget", "menubar", "", "title", "text"),
+    "menubar": None,
+    "progessbar": ("widget", "widget", "", "value", "number"),
+    "radiobutton": ("widget", "widget", "", "text", "text"),
+    "scrollarea": ("widget", "widget", "", "tool_tip", "text"),
+    "slider": ("widget", "widget", "", "value", "number"),
+    "spinbox": ("widget", "widget", "", "value", "number"),
+    "standarditem": ("treeview", "itemmodel", "", "text", "text"),
+    "statusbar": None,
+    "textedit": ("widget", "widget", "", "plain_text", "text"),
+    "toolbar": ("widget", "window", "", "window_title", "text"),
+    "treeview": ("widget", "widget", "", "tool_tip", "text"),
+    "treewidget": ("widget", "widget", "", "tool_tip", "text"),
+    "treewidgetitem": ("widget", "treewidget", "", "content", "columns"),
+    "widget": ("widget", "widget", "", "tool_tip", "text"),
+    "window": None,
+}
+PYSIDE_IMPORTS = """
+from PySide6 import QtCore
+
+area = QtCore.Qt.DockWidgetArea.LeftDockWidgetArea
+"""
+
+PYGFX_CASES = {
+    "group": ("scene", "group", "", "visible", "bool"),
+    "mesh": (
+        "scene",
+        "group",
+        ':geometry="box" :material="mesh_material"',
+        "local.position",
+        "position",
+    ),
+    "points": (
+        "scene",
+        "group",
+        ':geometry="points" :material="points_material"',
+        "local.position",
+        "position",
+    ),
+    "line": (
+        "scene",
+        "group",
+        ':geometry="points" :material="line_material"',
+        "local.position",
+        "position",
+    ),
+    "cull-group": ("scene", "group", "", "visible", "bool"),
+}
+PYGFX_IMPORTS = """
+import numpy as np
+import pygfx as gfx
+
+box = gfx.box_geometry()
+points = gfx.Geometry(positions=np.zeros((4, 3), dtype=np.float32))
+mesh_material = gfx.MeshBasicMaterial()
+points_material = gfx.PointsMaterial()
+line_material = gfx.LineMaterial()
+"""
+
+
+class PySideBackend:
+    name = "pyside"
+    cases = PYSIDE_CASES
+    imports = PYSIDE_IMPORTS
+    # Qt draws the (offscreen) frames while processing the events
+    columns = ("mount", "update", "churn", "unmount")
+    frame_error = None
+
+    def __init__(self):
+        from PySide6 import QtCore, QtWidgets
+
+        from kolla.renderers import PySideRenderer
+
+        self.QtCore = QtCore
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication()
+        self.renderer_class = PySideRenderer
+
+    def create(self, container_tag):
+        renderer = self.renderer_class(autoshow=False)
+        container = renderer.create_element(container_tag)
+        container.show()
+        return renderer, container
+
+    def process(self, container):
+        self.app.sendPostedEvents(None, self.QtCore.QEvent.Type.DeferredDelete)
+        self.app.processEvents()
+
+    def frame(self, container):
+        return None
+
+    def close(self, container):
+        container.close()
+        container.deleteLater()
+        self.process(container)
+
+
+class PygfxBackend:
+    name = "pygfx"
+    cases = PYGFX_CASES
+    imports = PYGFX_IMPORTS
+    columns = ("mount", "frame", "update", "churn", "unmount")
+
+    def __init__(self):
+        import pygfx as gfx
+
+        from kolla.renderers import PygfxRenderer
+
+        self.gfx = gfx
+        self.renderer_class = PygfxRenderer
+        self.camera = gfx.OrthographicCamera(100, 100)
+        self.frame_error = None
+        try:
+            from rendercanvas.offscreen import RenderCanvas
+
+            self.canvas = RenderCanvas(size=(256, 256))
+            self.wgpu_renderer = gfx.renderers.WgpuRenderer(self.canvas)
+        except Exception as e:
+            # For instance no (software) wgpu adapter
+            self.canvas = None
+            self.frame_error = f"{type(e).__name__}: {str(e).splitlines()[-1].strip()}"
+
+    def create(self, container_tag):
+        return self.renderer_class(), self.gfx.Scene()
+
+    def process(self, container):
+        pass
+
+    def frame(self, container):
+        """Returns the time in seconds to draw a frame, if possible."""
+        if self.canvas is None:
+            return None
+        self.canvas.request_draw(
+            lambda: self.wgpu_renderer.render(container, self.camera)
+        )
+        start = time.perf_counter()
+        self.canvas.draw()
+        return time.perf_counter() - start
+
+    def close(self, container):
+        pass
+
+
+BACKENDS = {"pyside": PySideBackend, "pygfx": PygfxBackend}
+
+
+def load_component(backend, tag, case):
+    _, parent, extra, attribute, kind = case
+    source = SOURCE.format(
+        parent=parent,
+        tag=tag,
+        extra=extra,
+        attribute=attribute,
+        value=VALUES[kind],
+        imports=backend.imports,
+    )
+    Bench, _ = compiler.load_from_string(textwrap.dedent(source))
+    return Bench
+
+
+def run(backend, component, case, count):
+    """Returns the time per element in seconds of every operation."""
+    container_tag = case[0]
+    renderer, container = backend.create(container_tag)
+    state = reactive({"items": list(range(count)), "tick": 0})
+    gui = Kolla(renderer, event_loop_type=EventLoopType.SYNC)
+    # Flush once per operation instead of on every change
+    scheduler.register_request_flush(lambda: None)
+
+    def timed(operation):
+        start = time.perf_counter()
+        operation()
+        scheduler.flush()
+        backend.process(container)
+        return time.perf_counter() - start
+
+    churned = max(count // 10, 1)
+
+    def churn():
+        items = state["items"]
+        del items[:churned]
+        items.extend(range(count, count + churned))
+
+    def update():
+        state["tick"] += 1
+
+    times = {"mount": timed(lambda: gui.render(component, container, state=state))}
+    times["mount"] /= count
+    if (frame := backend.frame(container)) is not None:
+        times["frame"] = frame / count
+    times["update"] = timed(update) / count
+    times["churn"] = timed(churn) / (2 * churned)
+    times["unmount"] = timed(lambda: state.__setitem__("items", [])) / count
+    backend.close(container)
+    return times
+
+
+def benchmark(backend, types, count, repeat):
+    results = {}
+    columns = backend.columns
+    print(f"{backend.name}: {count} elements, best of {repeat} (µs per element)")
+    if backend.frame_error:
+        print(f"No frames are drawn: {backend.frame_error}")
+    print(f"{'type':>18}" + "".join(f" {column:>9}" for column in columns))
+    for tag in types or backend.cases:
+        if (case := backend.cases.get(tag)) is None:
+            print(f"{tag:>18} skipped (not an element of a list)")
+            continue
+        try:
+            component = load_component(backend, tag, case)
+            runs = [run(backend, component, case, count) for _ in range(repeat)]
+        except Exception as e:
+            print(f"{tag:>18} error: {type(e).__name__}: {e}")
+            results[tag] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        result = {key: min(r[key] for r in runs) * 1e6 for key in runs[0]}
+        results[tag] = result
+        print(
+            f"{tag:>18}"
+            + "".join(
+                f" {result[column]:>9.2f}" if column in result else f" {'-':>9}"
+                for column in columns
+            )
+        )
+    return results
+
+
+def main(args):
+    results = {}
+    for name in args.backend:
+        backend = BACKENDS[name]()
+        results[name] = benchmark(backend, args.types, args.count, args.repeat)
+        print()
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--backend", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    parser.add_argument("--types", nargs="+", help="element types (default: all)")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this JSON file")
+    main(parser.parse_args())
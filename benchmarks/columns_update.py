@@ -0,0 +1,85 @@
+"""
+Update benchmark for columnar v-for sources.
+
+Renders a table of rows with the DictRenderer and updates a single column
+every tick, in which only a fraction of the rows actually changes. Compares
+writing the column into a reactive list of dicts with a Columns source.
+
+Run with:
+
+    python benchmarks/columns_update.py --rows 10000 --changed 100
+"""
+
+import argparse
+import textwrap
+import time
+
+import numpy as np
+from observ import reactive
+
+from kolla import Columns, EventLoopType, Kolla
+from kolla.renderers import DictRenderer
+from kolla.sfc import compiler
+
+SOURCE = """
+<item v-for="row in table" :name="row['name']" :value="row['value']" />
+
+<script>
+import kolla
+
+class Table(kolla.Component):
+    pass
+</script>
+"""
+
+
+def render(table):
+    Table, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    state = reactive({"table": table})
+    gui = Kolla(renderer=DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(Table, {"type": "root"}, state=state)
+    return gui, state
+
+
+def list_of_dicts(rows, changed, ticks, rng):
+    names = [f"sensor {i}" for i in range(rows)]
+    values = np.zeros(rows)
+    _gui, state = render([{"name": n, "value": v} for n, v in zip(names, values)])
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        values[rng.integers(0, rows, changed)] += 1
+        # The whole column is written, but only changed values trigger watchers
+        for row, value in zip(state["table"], values.tolist()):
+            row["value"] = value
+    return (time.perf_counter() - start) / ticks
+
+
+def columns(rows, changed, ticks, rng):
+    names = np.array([f"sensor {i}" for i in range(rows)])
+    values = np.zeros(rows)
+    table = Columns({"name": names, "value": values})
+    _gui, _state = render(table)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        values = values.copy()
+        values[rng.integers(0, rows, changed)] += 1
+        table.update(value=values)
+    return (time.perf_counter() - start) / ticks
+
+
+def main(rows, changed, ticks):
+    print(f"{rows} rows, {changed} changed rows per tick, {ticks} ticks")
+    for name, scenario in [("list of dicts", list_of_dicts), ("columns", columns)]:
+        duration = scenario(rows, changed, ticks, np.random.default_rng(0)) * 1000
+        print(f"{name:>13}: {duration:8.3f} ms per tick")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--changed", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.changed, args.ticks)
@@ -0,0 +1,149 @@
+"""
+Benchmark for the throughput of the .cgx compiler.
+
+Generates synthetic templates of an increasing number of elements, made of
+sections with a chain of nested v-for and v-if elements around a number of
+fields with bound attributes and events. Reports the time of parsing the
+template with the KollaParser, of building the AST of the component (which
+includes the render function) and of compiling the AST with `compile()`,
+together with the time per element. A time per element that grows with the
+size of the template points to superlinear behaviour in the compiler.
+
+With `--profile`, the complete compilation of the largest template is run
+under cProfile, the top functions are printed and the stats are written to
+the given file (for pstats, snakeviz, ...).
+
+Run with:
+
+    python benchmarks/compiler.py --elements 250 500 1000 2000 --depth 4
+    python benchmarks/compiler.py --elements 2000 --profile compiler.prof
+"""
+
+import argparse
+import cProfile
+import pstats
+import time
+
+from kolla.sfc import compiler
+from kolla.sfc.parser import KollaParser
+
+SCRIPT = """
+<script>
+import kolla
+
+class Form(kolla.Component):
+    def update(self, *args):
+        pass
+</script>
+"""
+
+
+def generate(elements, depth, fields, attributes):
+    """
+    Returns a template with at least the given number of elements. Every
+    section is a chain of `depth` nested elements that alternate between
+    v-for and v-if around `fields` fields with `attributes` bound attributes.
+    """
+    lines = ["<form>"]
+    count = 1
+    section = 0
+    while count < elements:
+        item = None
+        for level in range(depth):
+            indent = "  " * (level + 1)
+            if level % 2 == 0:
+                source = f"{item}['children']" if item else f"sections[{section}]"
+                item = f"item{level}"
+                lines.append(
+                    f'{indent}<group v-for="{item} in {source}" :key="{item}[\'id\']">'
+                )
+            else:
+                lines.append(f"{indent}<group v-if=\"{item}['visible']\">")
+        indent = "  " * (depth + 1)
+        value = f"{item}['value']" if item else "value"
+        for field in range(fields):
+            bound = " ".join(
+                f':attr{a}="{value} + {a} if enabled else {field}"'
+                for a in range(attributes)
+            )
+            lines.append(
+                f'{indent}<field name="field{field}" {bound}'
+                f' @change="update({value}, {field})" />'
+            )
+        for level in reversed(range(depth)):
+            lines.append(f"{'  ' * (level + 1)}</group>")
+        count += depth + fields
+        section += 1
+    lines.append("</form>")
+    return "\n".join(lines) + "\n" + SCRIPT, count
+
+
+def best(fn, repeat):
+    """Returns the result and the minimum time in seconds of `fn`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def parse(template):
+    parser = KollaParser()
+    parser.feed(template)
+    return parser.root
+
+
+def measure(template, repeat):
+    """Returns the time of the parse, build and compile phases in seconds."""
+    _, parse_time = best(lambda: parse(template), repeat)
+    # Building the AST includes parsing the template
+    (tree, _), construct_time = best(
+        lambda: compiler.construct_ast("<template>", template), repeat
+    )
+    _, compile_time = best(lambda: compile(tree, "<template>", "exec"), repeat)
+    return parse_time, construct_time - parse_time, compile_time
+
+
+def main(args):
+    print(
+        f"depth {args.depth}, {args.fields} fields with {args.attributes} bound"
+        f" attributes per section, best of {args.repeat} (ms, µs per element)"
+    )
+    print(
+        f"{'elements':>8} {'lines':>7} {'parse':>9} {'build':>9} {'compile':>9}"
+        f" {'total':>9} {'µs/el':>7}"
+    )
+    template = None
+    for elements in args.elements:
+        template, count = generate(elements, args.depth, args.fields, args.attributes)
+        times = measure(template, args.repeat)
+        total = sum(times)
+        print(
+            f"{count:>8} {len(template.splitlines()):>7}"
+            + "".join(f" {t * 1000:>9.2f}" for t in times)
+            + f" {total * 1000:>9.2f} {total / count * 1e6:>7.1f}"
+        )
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(compiler.load_from_string, template)
+        profiler.dump_stats(args.profile)
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--elements", type=int, nargs="+", default=[250, 500, 1000, 2000, 4000]
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fields", type=int, default=5)
+    parser.add_argument("--attributes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--profile", help="profile the largest template and write the stats here"
+    )
+    parser.add_argument("--top", type=int, default=25)
+    main(parser.parse_args())
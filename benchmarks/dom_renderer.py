@@ -0,0 +1,159 @@
+"""
+Benchmark for the number of Python to JavaScript calls of the DOM renderers.
+
+Mounts a table of (by default) 10k nodes with the DomRenderer and with the
+BatchedDomRenderer, against a stand-in for pyodide's `js` module that counts
+the calls that would cross the boundary between Python and JavaScript. In
+pyodide, each of those calls goes through a proxy, which dominates the time
+of large renders. Also reports the time of the mount in CPython (without
+any proxy overhead), excluding the time of applying the recorded operations.
+
+Run with:
+
+    python benchmarks/dom_renderer.py --nodes 10000
+"""
+
+import argparse
+import json
+import sys
+import textwrap
+import time
+from types import SimpleNamespace
+
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.sfc import compiler
+
+SOURCE = """
+<table>
+  <tr v-for="row in rows" :class="row['kind']" @click="select">
+    <td :title="row['name']" />
+    <td :value="row['value']" />
+    <td :value="row['value'] * 2" />
+  </tr>
+</table>
+
+<script>
+import kolla
+
+class Table(kolla.Component):
+    def select(self, event):
+        pass
+</script>
+"""
+
+# Number of calls from Python into JavaScript
+crossings = 0
+
+
+class Node:
+    """Stand-in for a DOM node."""
+
+    def __init__(self, type):
+        self.type = type
+        self.children = []
+        self.attributes = {}
+
+    def insertBefore(self, el, anchor):  # noqa: N802
+        global crossings
+        crossings += 1
+        index = self.children.index(anchor) if anchor is not None else None
+        self.children.insert(len(self.children) if index is None else index, el)
+
+    def appendChild(self, el):  # noqa: N802
+        global crossings
+        crossings += 1
+        self.children.append(el)
+
+    def setAttribute(self, attr, value):  # noqa: N802
+        global crossings
+        crossings += 1
+        self.attributes[attr] = value
+
+    def addEventListener(self, event_type, listener):  # noqa: N802
+        global crossings
+        crossings += 1
+
+
+class Document:
+    def createElement(self, type):  # noqa: N802
+        global crossings
+        crossings += 1
+        return Node(type)
+
+
+def create_applier(container, dispatch):
+    """Stand-in for the function that is created by `APPLIER_SOURCE`."""
+    nodes = {0: container}
+
+    def apply(data):
+        global crossings
+        crossings += 1
+        # Apply the operations without counting them: this happens in JavaScript
+        ops = json.loads(data)
+        i = 0
+        while i < len(ops):
+            op, node = ops[i], nodes.get(ops[i + 1])
+            if op == 0:
+                nodes[ops[i + 1]] = Node(ops[i + 2])
+                i += 3
+            elif op == 2:
+                parent = nodes[ops[i + 2]]
+                parent.children.append(node)
+                i += 4
+            elif op == 5:
+                node.attributes[ops[i + 2]] = ops[i + 3]
+                i += 4
+            elif op == 7:
+                i += 4
+            else:
+                raise ValueError(op)
+
+    return SimpleNamespace(apply=apply, node=nodes.get)
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def main(nodes):
+    global crossings
+    sys.modules["js"] = SimpleNamespace(
+        window=SimpleNamespace(document=Document()), eval=lambda _: create_applier
+    )
+    from kolla.renderers.dom_renderer import BatchedDomRenderer, DomRenderer
+
+    Table, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    rows = [
+        {"name": f"Row {i}", "value": i, "kind": "odd" if i % 2 else "even"}
+        for i in range(nodes // 4)
+    ]
+
+    print(f"{'renderer':>18} {'nodes':>7} {'crossings':>10} {'time (ms)':>10}")
+    for name in ["DomRenderer", "BatchedDomRenderer"]:
+        container = Node("root")
+        crossings = 0
+        start = time.perf_counter()
+        if name == "DomRenderer":
+            renderer, target = DomRenderer(), container
+        else:
+            renderer = BatchedDomRenderer(container)
+            target = renderer.root
+        gui = Kolla(renderer, event_loop_type=EventLoopType.SYNC)
+        # Flushed manually below, instead of right after mounting
+        renderer.register_request_flush(None)
+        gui.render(Table, target, state=reactive({"rows": rows}))
+        elapsed = time.perf_counter() - start
+        if name == "BatchedDomRenderer":
+            # Not included in the time, since this happens in JavaScript
+            renderer.flush()
+        mounted = count_nodes(container) - 1
+        print(f"{name:>18} {mounted:>7} {crossings:>10} {elapsed * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.nodes)
@@ -0,0 +1,110 @@
+"""
+Benchmark for rendering many static HTML documents over a process pool.
+
+Renders a number of report documents (each a table of rows) serially with
+the HTMLRenderer and `format_element`, serially with `render_html` and with
+a `BatchRenderer` for an increasing number of processes. Reports the
+throughput in documents per second and the speedup relative to a single
+worker process.
+
+Run with:
+
+    python benchmarks/html_batch.py --documents 1000 --rows 100
+"""
+
+import argparse
+import os
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers.html_batch import BatchRenderer, resolve_component
+from kolla.renderers.html_renderer import (
+    Element,
+    HTMLRenderer,
+    format_element,
+    render_html,
+)
+
+SOURCE = """
+<report :title="title">
+  <row v-for="item in rows" :name="item['name']" :value="item['value']">
+    <cell :text="item['value'] * 2" />
+  </row>
+</report>
+
+<script>
+import kolla
+
+class Report(kolla.Component):
+    pass
+</script>
+"""
+
+
+def create_documents(documents, rows):
+    return [
+        {
+            "title": f"Report {d}",
+            "rows": [{"name": f"Row {i}", "value": d + i} for i in range(rows)],
+        }
+        for d in range(documents)
+    ]
+
+
+def html_renderer(path, documents):
+    Report = resolve_component(path)
+    for props in documents:
+        gui = Kolla(HTMLRenderer(), event_loop_type=EventLoopType.SYNC)
+        container = Element("root")
+        gui.render(Report, container, state=reactive(props))
+        format_element(container)
+
+
+def streaming(path, documents):
+    Report = resolve_component(path)
+    for props in documents:
+        "".join(render_html(Report, props))
+
+
+def main(documents, rows, max_processes):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "report.cgx"
+        path.write_text(textwrap.dedent(SOURCE))
+        props = create_documents(documents, rows)
+
+        print(f"{documents} documents with {rows} rows")
+        print(f"{'variant':>16} {'docs/s':>9} {'speedup':>8}")
+        for name, fn in [("HTMLRenderer", html_renderer), ("render_html", streaming)]:
+            start = time.perf_counter()
+            fn(path, props)
+            print(f"{name:>16} {documents / (time.perf_counter() - start):>9.1f}")
+
+        processes = 1
+        single = None
+        while processes <= max_processes:
+            with BatchRenderer(path, processes=processes) as batch:
+                # Warm up the workers
+                list(batch.render(props[:processes]))
+                batch.documents, batch.elapsed = 0, 0.0
+                for _ in batch.render(props):
+                    pass
+            single = single or batch.throughput
+            print(
+                f"{f'{processes} processes':>16} {batch.throughput:>9.1f}"
+                f" {batch.throughput / single:>8.2f}"
+            )
+            processes *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    main(args.documents, args.rows, args.processes)
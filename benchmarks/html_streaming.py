@@ -0,0 +1,94 @@
+"""
+Benchmark for rendering a large static page to HTML.
+
+Renders a table with (by default) 20k rows of 4 cells, so 100k elements, once
+with the HTMLRenderer followed by `format_element` and once by streaming the
+HTML with `render_html`. Reports the time and the peak memory use (traced
+in a separate run, since tracing slows things down).
+
+Run with:
+
+    python benchmarks/html_streaming.py --rows 20000
+"""
+
+import argparse
+import textwrap
+import time
+import tracemalloc
+
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers.html_renderer import (
+    Element,
+    HTMLRenderer,
+    format_element,
+    render_html,
+)
+from kolla.sfc import compiler
+
+SOURCE = """
+<table>
+  <tr v-for="row in rows" :class="row['kind']">
+    <td :title="row['name']" />
+    <td :value="row['value']" />
+    <td :value="row['value'] * 2" />
+    <td :note="'<' + row['kind'] + '>'" />
+  </tr>
+</table>
+
+<script>
+import kolla
+
+class Report(kolla.Component):
+    pass
+</script>
+"""
+
+
+def create_props(rows):
+    return {
+        "rows": [
+            {"name": f"Row {i}", "value": i, "kind": "odd" if i % 2 else "even"}
+            for i in range(rows)
+        ]
+    }
+
+
+def html_renderer(Report, props):  # noqa: N803
+    gui = Kolla(HTMLRenderer(), event_loop_type=EventLoopType.SYNC)
+    container = Element("root")
+    gui.render(Report, container, state=reactive(props))
+    return len(format_element(container))
+
+
+def streaming(Report, props):  # noqa: N803
+    return sum(len(chunk) for chunk in render_html(Report, props))
+
+
+def measure(fn, Report, props):  # noqa: N803
+    start = time.perf_counter()
+    size = fn(Report, props)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(Report, props)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main(rows):
+    Report, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    print(f"{rows} rows, {rows * 5} elements")
+    print(f"{'variant':>14} {'time (s)':>9} {'peak (MB)':>10} {'output (MB)':>12}")
+    for name, fn in [("HTMLRenderer", html_renderer), ("render_html", streaming)]:
+        elapsed, peak, size = measure(fn, Report, create_props(rows))
+        print(f"{name:>14} {elapsed:>9.2f} {peak / 1e6:>10.1f} {size / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,76 @@
+"""
+Startup benchmark for `import kolla`.
+
+Runs `python -X importtime` in a fresh interpreter for a number of scenarios
+(plain `import kolla` and accessing the renderer of each installed extra)
+and reports the cumulative import time of the measured statement.
+
+    python benchmarks/import_time.py --repeat 10 --json results.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from importlib.util import find_spec
+
+SCENARIOS = {
+    "kolla": ("import kolla", None),
+    "dict": ("import kolla; kolla.DictRenderer", None),
+    "pyside": ("import kolla; kolla.PySideRenderer", "PySide6"),
+    "pygfx": ("import kolla; kolla.PygfxRenderer", "pygfx"),
+}
+
+
+def import_time(statement):
+    """
+    Returns the sum of the cumulative import times (in ms) of all the
+    top-level imports that are triggered by the given statement.
+    """
+    # Import the modules that are imported by every interpreter anyway
+    # so that they are not part of the measurement
+    baseline = "import encodings, site"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{baseline}; {statement}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented, top-level imports are not
+        if not cumulative.strip().isdigit() or name.startswith("   "):
+            continue
+        total += int(cumulative)
+    return total / 1000
+
+
+def main(repeat, output):
+    results = {}
+    print(f"{'scenario':<10} {'min (ms)':>10} {'median (ms)':>12}")
+    for name, (statement, dependency) in SCENARIOS.items():
+        if dependency and not find_spec(dependency):
+            print(f"{name:<10} {'skipped':>10} ({dependency} is not installed)")
+            continue
+        timings = sorted(import_time(statement) for _ in range(repeat))
+        results[name] = {
+            "statement": statement,
+            "min": timings[0],
+            "median": timings[len(timings) // 2],
+        }
+        print(f"{name:<10} {timings[0]:>10.1f} {timings[len(timings) // 2]:>12.1f}")
+
+    if output:
+        with open(output, mode="w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="output", help="Write results to this file")
+    args = parser.parse_args()
+    main(args.repeat, args.output)
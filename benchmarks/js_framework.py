@@ -0,0 +1,307 @@
+"""
+Benchmark suite for the core runtime, after the js-framework-benchmark.
+
+Runs the classic operations on a keyed table of rows (create 1k and 10k
+rows, replace all rows, update every 10th row, select a row, swap two rows,
+remove a row, append 1k rows and clear all rows) headless, with either the
+DictRenderer or a renderer that does nothing (to measure only the runtime
+itself). Every operation is run against a component that is compiled from a
+.cgx template and against a component with a hand-written render function.
+The state is changed in one go and the scheduler is flushed once per
+operation, just like in a browser.
+
+Results can be written as JSON with `--output` and compared against such a
+file with `--baseline`, which reports the change of the median time of every
+operation and exits with status 1 when any of them is slower than the
+threshold.
+
+Run with:
+
+    python benchmarks/js_framework.py --output baseline.json
+    # ...change kolla/fragment.py...
+    python benchmarks/js_framework.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import textwrap
+import time
+from itertools import count
+
+from observ import reactive, scheduler
+
+import kolla
+from kolla import EventLoopType, Kolla
+from kolla.renderers import DictRenderer, Renderer
+from kolla.sfc import compiler
+
+SOURCE = """
+<table>
+  <tr
+    v-for="row in rows"
+    :key="row['id']"
+    :class="'danger' if row['id'] == selected else ''"
+  >
+    <td :text="row['id']" />
+    <td :text="row['label']" @click="select(row['id'])" />
+  </tr>
+</table>
+
+<script>
+import kolla
+
+class Rows(kolla.Component):
+    def select(self, id):
+        self.state["selected"] = id
+</script>
+"""
+
+ADJECTIVES = ["pretty", "large", "big", "small", "tall", "short", "long", "cheap"]
+NOUNS = ["table", "chair", "house", "bbq", "desk", "car", "pony", "cookie"]
+
+
+class Rows(kolla.Component):
+    """The component of SOURCE with a hand-written render function."""
+
+    def select(self, id):
+        self.state["selected"] = id
+
+    def render(self, renderer):
+        from kolla.fragment import ComponentFragment, Fragment, ListFragment
+
+        props = self.props
+        component = ComponentFragment(renderer)
+        table = Fragment(renderer, tag="table", parent=component)
+        rows = ListFragment(renderer, parent=table)
+
+        def create_row(context):
+            tr = Fragment(renderer, tag="tr")
+            tr.set_bind("key", lambda: context()["id"])
+            tr.set_bind(
+                "class",
+                lambda: "danger" if context()["id"] == props["selected"] else "",
+            )
+            td = Fragment(renderer, tag="td", parent=tr)
+            td.set_bind("text", lambda: context()["id"])
+            td = Fragment(renderer, tag="td", parent=tr)
+            td.set_bind("text", lambda: context()["label"])
+            td.set_event("click", lambda: self.select(context()["id"]))
+            return tr
+
+        rows.set_create_fragment(create_row, is_keyed=True)
+        rows.set_expression(lambda: props["rows"])
+        return component
+
+
+class NullRenderer(Renderer):
+    """Renderer that does nothing, to measure the runtime by itself."""
+
+    def create_element(self, type):
+        return object()
+
+    def create_text_element(self):
+        return object()
+
+    def insert(self, el, parent, anchor=None):
+        pass
+
+    def remove(self, el, parent):
+        pass
+
+    def set_element_text(self, el, value):
+        pass
+
+    def set_attribute(self, el, attr, value):
+        pass
+
+    def remove_attribute(self, el, attr, value):
+        pass
+
+    def add_event_listener(self, el, event_type, value):
+        pass
+
+    def remove_event_listener(self, el, event_type, value):
+        pass
+
+
+RENDERERS = {"dict": DictRenderer, "null": NullRenderer}
+
+ids = count(1)
+
+
+def build_rows(n):
+    return [
+        {
+            "id": next(ids),
+            "label": f"{ADJECTIVES[i % len(ADJECTIVES)]} {NOUNS[i % len(NOUNS)]}",
+        }
+        for i in range(n)
+    ]
+
+
+def create_1k(state):
+    state["rows"] = build_rows(1_000)
+
+
+def create_10k(state):
+    state["rows"] = build_rows(10_000)
+
+
+def replace_all(state):
+    state["rows"] = build_rows(1_000)
+
+
+def partial_update(state):
+    rows = state["rows"]
+    for i in range(0, len(rows), 10):
+        rows[i]["label"] += " !!!"
+
+
+def select_row(state):
+    state["selected"] = state["rows"][1]["id"]
+
+
+def swap_rows(state):
+    rows = state["rows"]
+    rows[1], rows[998] = rows[998], rows[1]
+
+
+def remove_row(state):
+    del state["rows"][1]
+
+
+def append_1k(state):
+    state["rows"].extend(build_rows(1_000))
+
+
+def clear(state):
+    state["rows"] = []
+
+
+# Operation and the number of rows that are rendered before the operation
+OPERATIONS = {
+    "create_1k": (create_1k, 0),
+    "create_10k": (create_10k, 0),
+    "replace_all": (replace_all, 1_000),
+    "partial_update": (partial_update, 10_000),
+    "select_row": (select_row, 1_000),
+    "swap_rows": (swap_rows, 1_000),
+    "remove_row": (remove_row, 1_000),
+    "append_1k": (append_1k, 1_000),
+    "clear": (clear, 1_000),
+}
+
+
+def load_components():
+    Compiled, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    return {"cgx": Compiled, "render": Rows}
+
+
+def run(component, renderer, operation, rows):
+    """Returns the time in seconds of a single run of the operation."""
+    state = reactive({"rows": build_rows(rows), "selected": None})
+    gui = Kolla(renderer(), event_loop_type=EventLoopType.SYNC)
+    # Flush once per operation instead of on every change
+    scheduler.register_request_flush(lambda: None)
+    gui.render(component, {"type": "root"}, state=state)
+    scheduler.flush()
+
+    start = time.perf_counter()
+    operation(state)
+    scheduler.flush()
+    return time.perf_counter() - start
+
+
+def benchmark(variants, renderer, operations, repeat):
+    results = {}
+    for variant, component in variants.items():
+        for name in operations:
+            operation, rows = OPERATIONS[name]
+            # Warm up
+            run(component, renderer, operation, rows)
+            times = [
+                run(component, renderer, operation, rows) * 1000 for _ in range(repeat)
+            ]
+            result = {
+                "median": statistics.median(times),
+                "min": min(times),
+                "runs": times,
+            }
+            key = f"{variant}/{name}"
+            results[key] = result
+            print(f"{key:>22} {result['median']:>9.2f} {result['min']:>9.2f}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change relative to the baseline, returns the regressions."""
+    regressions = []
+    print(f"{'benchmark':>22} {'baseline':>9} {'median':>9} {'change':>8}")
+    for key, result in results.items():
+        if key not in baseline:
+            print(f"{key:>22} {'-':>9} {result['median']:>9.2f}")
+            continue
+        before = baseline[key]["median"]
+        change = result["median"] / before - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(
+            f"{key:>22} {before:>9.2f} {result['median']:>9.2f} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main(args):
+    variants = load_components()
+    if args.variant:
+        variants = {args.variant: variants[args.variant]}
+    operations = args.operations or list(OPERATIONS)
+
+    print(f"{args.renderer} renderer, median of {args.repeat} runs (ms)")
+    print(f"{'benchmark':>22} {'median':>9} {'min':>9}")
+    results = benchmark(variants, RENDERERS[args.renderer], operations, args.repeat)
+
+    if args.output:
+        data = {
+            "renderer": args.renderer,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "results": results,
+        }
+        with open(args.output, "w") as fh:
+            json.dump(data, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if (renderer := baseline.get("renderer")) != args.renderer:
+            print(f"Warning: the baseline was run with the {renderer} renderer")
+        print()
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--renderer", choices=list(RENDERERS), default="dict")
+    parser.add_argument("--variant", choices=["cgx", "render"])
+    parser.add_argument(
+        "--operations", nargs="+", choices=list(OPERATIONS), metavar="OPERATION"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown that counts as regression (default: 0.1)",
+    )
+    main(parser.parse_args())
@@ -0,0 +1,110 @@
+"""
+Benchmark for streaming live updates of a page as patches.
+
+Renders a table with a number of rows with the PatchRenderer on the asyncio
+event loop and applies the patches with an in-process PatchClient. Then
+changes a single row a number of times and reports the bytes per patch
+compared to re-sending the whole page as HTML, and the latency from the
+state change until the patch is applied by the client.
+
+Run with:
+
+    python benchmarks/patch_renderer.py --rows 1000 --updates 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import textwrap
+import time
+
+from observ import reactive
+
+from kolla import DictRenderer, Kolla
+from kolla.renderers.html_renderer import render_html
+from kolla.renderers.patch_renderer import PatchClient, PatchRenderer
+from kolla.sfc import compiler
+
+SOURCE = """
+<table>
+  <tr v-for="row in rows" :class="row['kind']">
+    <td :title="row['name']" />
+    <td :value="row['value']" />
+  </tr>
+</table>
+
+<script>
+import kolla
+
+class Table(kolla.Component):
+    pass
+</script>
+"""
+
+
+def create_props(rows):
+    return {
+        "rows": [
+            {"name": f"Row {i}", "value": i, "kind": "odd" if i % 2 else "even"}
+            for i in range(rows)
+        ]
+    }
+
+
+async def measure(Table, rows, updates):  # noqa: N803
+    loop = asyncio.get_running_loop()
+    applied = None
+    client = PatchClient(DictRenderer(), {"type": "root"}, lambda message: None)
+
+    def send(patch):
+        client.apply(patch)
+        applied.set_result(time.perf_counter())
+
+    renderer = PatchRenderer(send)
+    gui = Kolla(renderer)
+    state = reactive(create_props(rows))
+
+    applied = loop.create_future()
+    start = time.perf_counter()
+    gui.render(Table, renderer.root, state=state)
+    mount = await applied - start
+    mount_bytes = renderer.bytes
+
+    latencies = []
+    for i in range(updates):
+        applied = loop.create_future()
+        start = time.perf_counter()
+        state["rows"][i % rows]["value"] = -i - 1
+        latencies.append(await applied - start)
+
+    # Let the scheduler clean up before the loop is closed
+    await asyncio.sleep(0)
+    update_bytes = (renderer.bytes - mount_bytes) / updates
+    return mount, mount_bytes, update_bytes, latencies
+
+
+def main(rows, updates):
+    Table, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    page = len("".join(render_html(Table, create_props(rows))).encode())
+    mount, mount_bytes, update_bytes, latencies = asyncio.run(
+        measure(Table, rows, updates)
+    )
+
+    print(f"{rows} rows, {updates} updates of a single cell")
+    print(f"page as HTML:      {page:>10} bytes")
+    print(f"mount patch:       {mount_bytes:>10} bytes in {mount * 1e3:.1f} ms")
+    print(f"update patch:      {update_bytes:>10.1f} bytes")
+    latencies.sort()
+    print(
+        "flush-to-patch:    "
+        f"median {statistics.median(latencies) * 1e6:.0f} µs, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f} µs"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.rows, args.updates)
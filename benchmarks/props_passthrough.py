@@ -0,0 +1,120 @@
+"""
+Benchmark for passing a large data structure through components as props.
+
+Passes a list of 1M dicts down through three levels of components and
+reports the time to render, to replace the data with a new list and to
+notify a modification in place. The plain variant passes the list as-is,
+which means that it is proxied on access; the raw and shallow variants pass
+the list in a `kolla.raw` or `kolla.shallow` box.
+
+Run with:
+
+    python benchmarks/props_passthrough.py --size 1000000
+"""
+
+import argparse
+import textwrap
+import time
+
+from observ import reactive
+
+import kolla
+from kolla import EventLoopType, Kolla
+from kolla.renderers import DictRenderer
+from kolla.sfc import compiler
+
+LEAF = """
+<leaf :size="len(data)" :first="data[0]['value']" :last="data[-1]['value']" />
+
+<script>
+import kolla
+
+class Leaf(kolla.Component):
+    pass
+</script>
+"""
+
+PASS = """
+<{child} :data="data" />
+
+<script>
+import kolla
+
+try:
+    import {child}
+except ImportError:
+    pass
+
+class {name}(kolla.Component):
+    pass
+</script>
+"""
+
+
+def load_components(leaf):
+    _, namespace = compiler.load_from_string(textwrap.dedent(leaf))
+    _, namespace = compiler.load_from_string(
+        textwrap.dedent(PASS.format(child="Leaf", name="Middle")), namespace=namespace
+    )
+    Top, namespace = compiler.load_from_string(
+        textwrap.dedent(PASS.format(child="Middle", name="Top")), namespace=namespace
+    )
+    return Top
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(wrap, leaf, size):
+    Top = load_components(leaf)
+    items = [{"value": i} for i in range(size)]
+    state = reactive({"data": wrap(items)})
+    container = {"type": "root"}
+    gui = Kolla(renderer=DictRenderer(), event_loop_type=EventLoopType.SYNC)
+
+    render = timed(lambda: gui.render(Top, container, state=state))
+
+    new_items = wrap([{"value": -i} for i in range(size)])
+
+    def replace():
+        state["data"] = new_items
+
+    replace_time = timed(replace)
+    assert container["children"][0]["attrs"]["last"] == -(size - 1)
+
+    def modify():
+        data = state["data"]
+        if isinstance(data, kolla.Raw):
+            data.value[-1]["value"] = 0
+            data.changed()
+        else:
+            data[-1]["value"] = 0
+
+    modify_time = timed(modify)
+    assert container["children"][0]["attrs"]["last"] == 0
+    return render, replace_time, modify_time
+
+
+def main(size):
+    raw_leaf = LEAF.replace("data", "data.value")
+    print(f"{size} items, passed through 3 components")
+    print(
+        f"{'variant':>8} {'render (ms)':>12} {'replace (ms)':>13} {'modify (ms)':>12}"
+    )
+    for name, wrap, leaf in [
+        ("plain", lambda items: items, LEAF),
+        ("raw", kolla.raw, raw_leaf),
+        ("shallow", kolla.shallow, raw_leaf),
+    ]:
+        render, replace, modify = run(wrap, leaf, size)
+        print(f"{name:>8} {render:>12.2f} {replace:>13.2f} {modify:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.size)
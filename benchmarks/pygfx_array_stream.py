@@ -0,0 +1,104 @@
+"""
+Streaming benchmark for binding arrays to the PygfxRenderer.
+
+Updates a slice of a large point cloud every frame, either by replacing the
+geometry with a new one (copying the data) or by writing into a RawArray
+that is bound to the buffer of the geometry (zero-copy, partial upload).
+Reports the Python-side time per frame, which should stay well below the
+16.7 ms budget of a 60 Hz display for the RawArray variant.
+
+Run with:
+
+    python benchmarks/pygfx_array_stream.py --points 1000000 --dirty 10000
+"""
+
+import argparse
+import textwrap
+import time
+
+import numpy as np
+import pygfx as gfx
+from observ import reactive
+
+from kolla import EventLoopType, Kolla, RawArray
+from kolla.renderers import PygfxRenderer
+from kolla.sfc import compiler
+
+SOURCE = """
+<points :geometry="make_geometry(frame)" />
+
+<script>
+import kolla
+
+class Stream(kolla.Component):
+    pass
+</script>
+"""
+
+RAW_SOURCE = """
+<points :geometry="geometry" :geometry.positions="positions" />
+
+<script>
+import kolla
+
+class Stream(kolla.Component):
+    pass
+</script>
+"""
+
+
+def replace_geometry(points, dirty, frames):
+    positions = np.zeros((points, 3), dtype=np.float32)
+
+    def make_geometry(frame):
+        return gfx.Geometry(positions=positions.copy())
+
+    Stream, _ = compiler.load_from_string(
+        textwrap.dedent(SOURCE), namespace={"make_geometry": make_geometry}
+    )
+    state = reactive({"frame": 0})
+    gui = Kolla(renderer=PygfxRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(Stream, gfx.Scene(), state=state)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        offset = (frame * dirty) % points
+        positions[offset : offset + dirty] += 1
+        state["frame"] = frame + 1
+    return (time.perf_counter() - start) / frames
+
+
+def raw_array(points, dirty, frames):
+    Stream, _ = compiler.load_from_string(
+        textwrap.dedent(RAW_SOURCE), namespace={"geometry": gfx.Geometry()}
+    )
+    positions = RawArray(np.zeros((points, 3), dtype=np.float32))
+    state = reactive({"positions": positions})
+    gui = Kolla(renderer=PygfxRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(Stream, gfx.Scene(), state=state)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        offset = (frame * dirty) % points
+        positions.array[offset : offset + dirty] += 1
+        positions.mark_dirty(offset, offset + dirty)
+    return (time.perf_counter() - start) / frames
+
+
+def main(points, dirty, frames):
+    print(f"{points} points, {dirty} dirty points per frame, {frames} frames")
+    for name, scenario in [
+        ("replace geometry", replace_geometry),
+        ("raw array", raw_array),
+    ]:
+        duration = scenario(points, dirty, frames) * 1000
+        print(f"{name:>16}: {duration:8.3f} ms per frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--dirty", type=int, default=10_000)
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+    main(args.points, args.dirty, args.frames)
@@ -0,0 +1,91 @@
+"""
+Asset sharing benchmark for the PygfxRenderer.
+
+Mounts a list of spheres that either create their own geometry and material
+or that describe them as shared assets, and reports the time to mount, the
+number of distinct geometries and the number of bytes in buffers that need
+to be uploaded to the GPU.
+
+Run with:
+
+    python benchmarks/pygfx_assets.py --count 5000
+"""
+
+import argparse
+import textwrap
+import time
+
+import pygfx as gfx
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers import PygfxRenderer
+from kolla.renderers.pygfx.assets import resource_size
+from kolla.sfc import compiler
+
+SOURCE = """
+<group>
+  <mesh
+    v-for="i in range(count)"
+    :geometry="{geometry}"
+    :material="{material}"
+    :local.position="(i, 0, 0)"
+  />
+</group>
+
+<script>
+import kolla
+import pygfx as gfx
+from kolla.renderers.pygfx.assets import asset
+
+class Spheres(kolla.Component):
+    pass
+</script>
+"""
+
+VARIANTS = {
+    "own": (
+        "gfx.sphere_geometry(radius=0.5)",
+        "gfx.MeshPhongMaterial(color=[1, 0, 0])",
+    ),
+    "shared": (
+        "asset(gfx.sphere_geometry, radius=0.5)",
+        "asset(gfx.MeshPhongMaterial, color=[1, 0, 0])",
+    ),
+}
+
+
+def run(geometry, material, count):
+    source = SOURCE.format(geometry=geometry, material=material)
+    Spheres, _ = compiler.load_from_string(textwrap.dedent(source))
+    renderer = PygfxRenderer()
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    scene = gfx.Scene()
+
+    start = time.perf_counter()
+    gui.render(Spheres, scene, state=reactive({"count": count}))
+    duration = (time.perf_counter() - start) * 1000
+
+    geometries = {
+        id(mesh.geometry): mesh.geometry for mesh in scene.children[0].children
+    }
+    size = sum(resource_size(geometry) for geometry in geometries.values())
+    return duration, len(geometries), size, renderer.assets.stats()
+
+
+def main(count):
+    print(f"{count} spheres")
+    print(f"{'variant':>8} {'mount (ms)':>11} {'geometries':>11} {'bytes':>12}")
+    for name, (geometry, material) in VARIANTS.items():
+        duration, geometries, size, stats = run(geometry, material, count)
+        print(f"{name:>8} {duration:>11.1f} {geometries:>11} {size:>12}")
+    print(
+        f"cache hit rate: {stats['hit_rate']:.1%}, bytes saved: {stats['bytes_saved']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.count)
@@ -0,0 +1,96 @@
+"""
+Culling benchmark for the PygfxRenderer.
+
+Mounts a grid of meshes through a v-for in either a regular `group` or a
+`cull-group` and reports the time to mount, the time to cull and traverse
+the scene graph as the pygfx renderer does every frame, and the number of
+objects in the scene graph.
+
+Run with:
+
+    python benchmarks/pygfx_culling.py --count 10000
+"""
+
+import argparse
+import textwrap
+import time
+
+import pygfx as gfx
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers import PygfxRenderer
+from kolla.renderers.pygfx.culling import CullGroup
+from kolla.sfc import compiler
+
+SOURCE = """
+<{tag} :camera="camera">
+  <mesh
+    v-for="i in range(count)"
+    :geometry="geometry"
+    :material="material"
+    :local.position="(i % 1000, i // 1000, 0)"
+  />
+</{tag}>
+
+<script>
+import kolla
+import pygfx as gfx
+
+geometry = gfx.box_geometry()
+material = gfx.MeshBasicMaterial()
+
+class Grid(kolla.Component):
+    pass
+</script>
+"""
+
+
+def traverse(scene):
+    """
+    Visits the scene graph like the pygfx renderer does every frame, after
+    culling (which a cull-group does right before every render).
+    """
+    for group in scene.children:
+        if isinstance(group, CullGroup):
+            group.cull()
+    count = 0
+    for obj in scene.iter(skip_invisible=True):
+        obj._update_object()
+        count += 1
+    return count
+
+
+def run(tag, count, frames):
+    Grid, _ = compiler.load_from_string(textwrap.dedent(SOURCE.format(tag=tag)))
+    camera = gfx.PerspectiveCamera(50, 16 / 9)
+    camera.local.position = (20, 20, 30)
+    state = reactive({"count": count, "camera": camera})
+    gui = Kolla(renderer=PygfxRenderer(), event_loop_type=EventLoopType.SYNC)
+    scene = gfx.Scene()
+
+    start = time.perf_counter()
+    gui.render(Grid, scene, state=state)
+    mount = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        objects = traverse(scene)
+    frame = (time.perf_counter() - start) / frames
+    return mount * 1000, frame * 1000, objects
+
+
+def main(count, frames):
+    print(f"{count} meshes, {frames} frames")
+    print(f"{'container':>10} {'mount (ms)':>11} {'frame (ms)':>11} {'objects':>8}")
+    for tag in ("group", "cull-group"):
+        mount, frame, objects = run(tag, count, frames)
+        print(f"{tag:>10} {mount:>11.1f} {frame:>11.2f} {objects:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--frames", type=int, default=10)
+    args = parser.parse_args()
+    main(args.count, args.frames)
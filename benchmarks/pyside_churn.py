@@ -0,0 +1,84 @@
+"""
+Churn benchmark for the PySideRenderer.
+
+Repeatedly mounts and unmounts a list of widgets (with signal and event
+handlers) and reports the resident memory and the number of live QObjects
+after every cycle. Both should stay bounded.
+
+Run headless with:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/pyside_churn.py
+"""
+
+import argparse
+import gc
+import resource
+import textwrap
+import time
+
+from observ import reactive
+from PySide6 import QtCore, QtWidgets
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers import PySideRenderer
+from kolla.sfc import compiler
+
+SOURCE = """
+<widget>
+  <widget v-for="i in range(count)">
+    <label :text="f'Item {i}'" />
+    <button text="Click" @clicked="clicked" @mouse-press="pressed" />
+  </widget>
+</widget>
+
+<script>
+import kolla
+
+class Churn(kolla.Component):
+    def clicked(self):
+        pass
+
+    def pressed(self, event):
+        pass
+</script>
+"""
+
+
+def rss_in_mb():
+    """Returns the current resident set size (Linux), or the peak otherwise."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:  # pragma: no cover
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def main(count, cycles):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication()
+    Churn, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+
+    renderer = PySideRenderer(autoshow=False)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    container = renderer.create_element("widget")
+    state = reactive({"count": 0})
+    gui.render(Churn, container, state=state)
+
+    print(f"{'cycle':>5} {'time (ms)':>10} {'rss (MB)':>10} {'live objects':>13}")
+    for cycle in range(cycles):
+        start = time.perf_counter()
+        state["count"] = count
+        state["count"] = 0
+        app.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+        gc.collect()
+        duration = (time.perf_counter() - start) * 1000
+        live = sum(renderer.live_objects().values())
+        print(f"{cycle:>5} {duration:>10.1f} {rss_in_mb():>10.1f} {live:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+    main(args.count, args.cycles)
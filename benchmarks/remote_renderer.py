@@ -0,0 +1,128 @@
+"""
+Benchmark for running the component logic in a worker process.
+
+The components run in a worker process with a `RemoteRenderer` that streams
+the renderer operations to this process, where a `RemoteHost` applies them to
+a `DictRenderer` (standing in for the PySideRenderer). Reports the throughput
+of rendering a list of items and the round trip latency of an event that
+updates a single attribute, next to the time it takes to render the same list
+in-process.
+
+Run with:
+
+    python benchmarks/remote_renderer.py --count 10000
+"""
+
+import argparse
+import statistics
+import textwrap
+import time
+
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers import DictRenderer
+from kolla.renderers.remote_renderer import RemoteHost, start_worker
+from kolla.sfc import compiler
+
+SOURCE = """
+<app>
+  <control :value="value" @count="set_count" @value="set_value" />
+  <item
+    v-for="i in range(count)"
+    :label="f'Item {i}'"
+    :value="i * 0.5"
+    @click="set_value"
+  />
+</app>
+
+<script>
+import kolla
+
+class App(kolla.Component):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state["count"] = 0
+        self.state["value"] = 0
+
+    def set_count(self, count):
+        self.state["count"] = count
+
+    def set_value(self, value):
+        self.state["value"] = value
+</script>
+"""
+
+
+def create_app():
+    """Called in the worker process."""
+    App, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    return App, reactive({})
+
+
+def trigger(container, event, value):
+    control = container["children"][0]["children"][0]
+    for listener in list(control["handlers"][event]):
+        listener(value)
+
+
+def wait(host):
+    if not host.poll(timeout=10):
+        raise TimeoutError("No response from worker")
+
+
+def run_local(count):
+    App, state = create_app()
+    container = {"type": "root"}
+    gui = Kolla(renderer=DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(App, container, state=state)
+    start = time.perf_counter()
+    trigger(container, "count", count)
+    return time.perf_counter() - start
+
+
+def run_remote(count, events):
+    process, connection = start_worker(create_app)
+    container = {"type": "root"}
+    host = RemoteHost(DictRenderer(), container, connection)
+    wait(host)
+
+    start = time.perf_counter()
+    trigger(container, "count", count)
+    wait(host)
+    render = time.perf_counter() - start
+    assert len(container["children"][0]["children"]) == count + 1
+    operations = host.operations
+
+    latencies = []
+    for i in range(events):
+        start = time.perf_counter()
+        trigger(container, "value", i + 1)
+        wait(host)
+        latencies.append(time.perf_counter() - start)
+    assert container["children"][0]["children"][0]["attrs"]["value"] == events
+
+    connection.close()
+    process.join()
+    return render, operations, latencies
+
+
+def main(count, events):
+    local = run_local(count)
+    render, operations, latencies = run_remote(count, events)
+    latencies.sort()
+    print(f"render {count} items")
+    print(f"  in-process:  {local * 1000:>10.2f} ms")
+    print(f"  remote:      {render * 1000:>10.2f} ms")
+    print(f"  operations:  {operations:>10} ({operations / render:,.0f} ops/s)")
+    print(f"event round trip ({events} events)")
+    print(f"  median:      {statistics.median(latencies) * 1e6:>10.0f} us")
+    print(f"  p99:         {latencies[int(len(latencies) * 0.99)] * 1e6:>10.0f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.count, args.events)
@@ -0,0 +1,146 @@
+"""
+Benchmark for updating state from other threads through a `StateChannel`.
+
+Producer threads push updates for a number of sensors at a fixed total rate
+(100k updates per second by default) into a component that renders a label
+for every sensor. The updates are coalesced per key and applied on the main
+thread, either on the asyncio event loop (default) or by polling
+`Kolla.process_pending` at 60 Hz (sync). Reports the rate at which updates
+are accepted and applied, the number of batches and the age of the newest
+value at the time it is applied.
+
+Run with:
+
+    python benchmarks/state_channel.py --rate 100000 --loop asyncio
+"""
+
+import argparse
+import asyncio
+import statistics
+import textwrap
+import threading
+import time
+
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.renderers import DictRenderer
+from kolla.sfc import compiler
+
+SOURCE = """
+<sensors>
+  <label
+    v-for="i in range(len(values))"
+    :text="str(values[i])"
+  />
+</sensors>
+
+<script>
+import kolla
+
+class Sensors(kolla.Component):
+    pass
+</script>
+"""
+
+
+def produce(channel, keys, rate, duration, offset, stop):
+    """Push `rate` updates per second for `duration` seconds."""
+    chunk = max(1, rate // 100)
+    start = time.perf_counter()
+    sent = 0
+    i = offset
+    while not stop.is_set():
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            break
+        for _ in range(chunk):
+            channel.put(("values", i % keys), i)
+            i += 1
+        channel.put("sent_at", time.perf_counter())
+        sent += chunk
+        # Sleep until the next chunk is due
+        delay = sent / rate - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+    return sent
+
+
+def run(loop, keys, rate, duration, producers):
+    Sensors, _ = compiler.load_from_string(textwrap.dedent(SOURCE))
+    event_loop_type = EventLoopType.DEFAULT if loop == "asyncio" else EventLoopType.SYNC
+
+    ages = []
+    drain_times = []
+
+    async def main():
+        gui = Kolla(renderer=DictRenderer(), event_loop_type=event_loop_type)
+        state = reactive({"values": [0] * keys, "sent_at": 0.0})
+        container = {"type": "root"}
+        gui.render(Sensors, container, state=state)
+
+        channel = gui.channel(state)
+        apply = channel._apply
+
+        def timed_apply():
+            start = time.perf_counter()
+            apply()
+            end = time.perf_counter()
+            drain_times.append(end - start)
+            ages.append(end - state["sent_at"])
+
+        channel._apply = timed_apply
+
+        stop = threading.Event()
+        threads = [
+            threading.Thread(
+                target=produce,
+                args=(channel, keys, rate // producers, duration, n * keys, stop),
+            )
+            for n in range(producers)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            if event_loop_type is EventLoopType.SYNC:
+                gui.process_pending()
+            await asyncio.sleep(1 / 60)
+        gui.process_pending()
+        elapsed = time.perf_counter() - start
+        # Let the last flush run before the app is garbage collected
+        await asyncio.sleep(0)
+        return channel, elapsed
+
+    channel, elapsed = asyncio.run(main())
+    return {
+        "received": channel.received / elapsed,
+        "applied": channel.applied / elapsed,
+        "batches": channel.batches / elapsed,
+        "age": statistics.median(ages) * 1000 if ages else 0.0,
+        "drain": statistics.median(drain_times) * 1000 if drain_times else 0.0,
+    }
+
+
+def main(loop, keys, rate, duration, producers):
+    print(
+        f"{producers} producers, {rate} updates/s to {keys} keys"
+        f" for {duration}s ({loop})"
+    )
+    result = run(loop, keys, rate, duration, producers)
+    print(f"received:  {result['received']:>10.0f} updates/s")
+    print(f"applied:   {result['applied']:>10.0f} updates/s (after coalescing)")
+    print(f"batches:   {result['batches']:>10.1f} per second")
+    print(f"apply:     {result['drain']:>10.2f} ms (median per batch)")
+    print(f"age:       {result['age']:>10.2f} ms (median, newest value)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--loop", choices=["asyncio", "sync"], default="asyncio")
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--rate", type=int, default=100_000)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--producers", type=int, default=4)
+    args = parser.parse_args()
+    main(args.loop, args.keys, args.rate, args.duration, args.producers)
@@ -1,9 +1,25 @@
-from importlib.metadata import version
-
+from . import renderers
+from .arrays import Columns, RawArray  # noqa: F401
 from .component import Component  # noqa: F401
 from .kolla import Kolla  # noqa: F401
-from .renderers import *  # noqa: F403
+from .markers import Raw, Shallow, raw, shallow  # noqa: F401
+from .renderers import DictRenderer, Renderer  # noqa: F401
 from .sfc import importer  # noqa: F401
 from .types import EventLoopType  # noqa: F401
 
-__version__ = version("kolla")
+
+def __getattr__(name):
+    # Look up the version and the renderers for optional
+    # dependencies only when they are actually requested
+    if name == "__version__":
+        from importlib.metadata import version
+
+        globals()[name] = version("kolla")
+        return globals()[name]
+    if name in renderers.LAZY_RENDERERS:
+        return getattr(renderers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(renderers.LAZY_RENDERERS) | {"__version__"})
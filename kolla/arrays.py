@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+from numbers import Integral
+from typing import Any
+
+from observ import reactive
+from observ.dep import Dep
+
+# Maximum number of dirty ranges that a RawArray keeps track of, before they
+# are merged into a single range
+MAX_DIRTY_RANGES = 32
+
+
+class RawArray:
+    """
+    Wrapper around an array (for instance a NumPy array) that is passed around by
+    reference: it is never wrapped in (observ) proxies when used as prop or in
+    state. Instead of replacing the array, modify it in place and mark the
+    modified rows as dirty. Renderers that support it (such as the
+    PygfxRenderer) will bind the array directly to their (GPU) buffers and only
+    upload the dirty ranges.
+
+    Example:
+
+        positions = RawArray(np.zeros((1_000_000, 3), dtype=np.float32))
+        positions.array[:1000] += 1
+        positions.mark_dirty(0, 1000)
+
+    Reading `version` from within a watcher or template expression will make
+    that expression re-evaluate on every change.
+    """
+
+    def __init__(self, array: Any):
+        self.array = array
+        # Sorted, disjoint ranges of rows (start, stop) that have changed since
+        # the last call to `take_dirty`
+        self.dirty: list[tuple[int, int]] = []
+        self._version = reactive({"value": 0})
+        self._subscribers: list[Callable[[int, int], None]] = []
+
+    def __repr__(self):
+        return f"<RawArray(version={self._version['value']}, {self.array!r})>"
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, key):
+        return self.array[key]
+
+    def __setitem__(self, key, value):
+        self.array[key] = value
+        if isinstance(key, tuple):
+            key = key[0] if key else slice(None)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self.array))
+            if step < 0:
+                # The rows from stop (exclusive) down to start (inclusive)
+                start, stop = stop + 1, start + 1
+            self.mark_dirty(start, stop)
+        elif isinstance(key, Integral):
+            # Indexing the array already checked the bounds
+            index = int(key)
+            if index < 0:
+                index += len(self.array)
+            self.mark_dirty(index, index + 1)
+        else:
+            # Fancy indexing: mark the whole array as dirty
+            self.mark_dirty()
+
+    @property
+    def version(self) -> int:
+        """Counter that increments for every change."""
+        return self._version["value"]
+
+    def mark_dirty(self, start: int = 0, stop: int | None = None):
+        """Mark the rows from `start` up to `stop` as changed."""
+        if stop is None:
+            stop = len(self.array)
+        if stop <= start:
+            return
+        self._add_dirty(start, stop)
+        for callback in self._subscribers.copy():
+            callback(start, stop)
+        self._version["value"] += 1
+
+    def _add_dirty(self, start: int, stop: int):
+        """
+        Merges the range into the dirty ranges. When there are more than
+        MAX_DIRTY_RANGES ranges, they are merged into a single range, so
+        that the dirty ranges don't grow when nobody takes them.
+        """
+        dirty = self.dirty
+        index = bisect_left(dirty, (start, start))
+        if index and dirty[index - 1][1] >= start:
+            index -= 1
+            start = dirty[index][0]
+        end = index
+        while end < len(dirty) and dirty[end][0] <= stop:
+            stop = max(stop, dirty[end][1])
+            end += 1
+        dirty[index:end] = [(start, stop)]
+        if len(dirty) > MAX_DIRTY_RANGES:
+            dirty[:] = [(dirty[0][0], dirty[-1][1])]
+
+    def take_dirty(self) -> list[tuple[int, int]]:
+        """Returns the merged dirty ranges and clears them."""
+        merged = self.dirty.copy()
+        self.dirty.clear()
+        return merged
+
+    def subscribe(self, callback: Callable[[int, int], None]):
+        """Call `callback(start, stop)` for every range that is marked dirty."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[int, int], None]):
+        self._subscribers.remove(callback)
+
+
+class Columns:
+    """
+    Columnar source for `v-for` that is backed by a mapping of (NumPy) arrays,
+    one array per column. Iterating over it in a `v-for` yields light-weight
+    `Row` views that read their cells by index:
+
+        <label v-for="row in table" :text="str(row['temperature'])" />
+
+    Use `update` to replace (some of) the columns. The old and new arrays are
+    compared vectorized and only the bindings of the rows that actually changed
+    are re-evaluated. The length of the source is tracked separately, so
+    updates that keep the number of rows the same leave the list alone.
+    """
+
+    def __init__(self, columns: Mapping[str, Any]):
+        self._columns = dict(columns)
+        self._length = self._check_length(self._columns)
+        self._length_dep = Dep()
+        # Deps are created lazily, only for rows that are actually read
+        self._row_deps: dict[int, Dep] = {}
+
+    def __repr__(self):
+        return f"<Columns({', '.join(self._columns)}; {self._length} rows)>"
+
+    @staticmethod
+    def _check_length(columns: Mapping[str, Any]) -> int:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        return lengths.pop() if lengths else 0
+
+    def __len__(self):
+        self._length_dep.depend()
+        return self._length
+
+    def __getitem__(self, index: int) -> Row:
+        if not -self._length <= index < self._length:
+            raise IndexError(index)
+        return Row(self, index % self._length)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Row(self, index)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._columns)
+
+    def column(self, name: str):
+        """Returns the array of the given column (without tracking dependencies)."""
+        return self._columns[name]
+
+    def cell(self, index: int, name: str):
+        """Returns the value of the given cell and tracks the row as dependency."""
+        if Dep.stack:
+            if (dep := self._row_deps.get(index)) is None:
+                dep = self._row_deps[index] = Dep()
+            dep.depend()
+        return self._columns[name][index]
+
+    def update(self, columns: Mapping[str, Any] | None = None, **kwargs):
+        """
+        Replace (some of) the columns with new arrays. Returns the indices of the
+        rows that changed. When the number of rows changes, all rows are
+        considered to be changed.
+        """
+        import numpy as np
+
+        new_columns = {**self._columns, **(columns or {}), **kwargs}
+        length = self._check_length(new_columns)
+
+        mask = np.zeros(length, dtype=bool)
+        length_changed = length != self._length
+        if length_changed:
+            mask[:] = True
+        else:
+            for name, column in new_columns.items():
+                old = self._columns.get(name)
+                if column is old:
+                    continue
+                if old is None:
+                    mask[:] = True
+                    break
+                diff = np.asarray(old) != np.asarray(column)
+                if diff.ndim > 1:
+                    diff = diff.reshape(length, -1).any(axis=1)
+                mask |= diff
+        # Drop the deps of the rows that no longer exist: `v-for` removes the
+        # items that read them
+        if length < self._length:
+            self._row_deps = {
+                index: dep for index, dep in self._row_deps.items() if index < length
+            }
+        self._columns = new_columns
+        self._length = length
+        changed = np.flatnonzero(mask)
+        if length_changed:
+            self._length_dep.notify()
+
+        # Only notify the rows that have been read by any watcher
+        deps = self._row_deps
+        if len(changed) > len(deps):
+            indices = [index for index in deps if index < length and mask[index]]
+        else:
+            indices = [index for index in changed.tolist() if index in deps]
+        for index in indices:
+            deps[index].notify()
+        return changed
+
+
+class Row:
+    """View on a single row of a `Columns` source."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Columns, index: int):
+        self._columns = columns
+        self._index = index
+
+    def __repr__(self):
+        return f"<Row({self._index})>"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Row)
+            and other._columns is self._columns
+            and other._index == self._index
+        )
+
+    def __hash__(self):
+        return hash((id(self._columns), self._index))
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def __getitem__(self, name: str):
+        return self._columns.cell(self._index, name)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._columns.cell(self._index, name)
+        except KeyError:
+            raise AttributeError(name) from None
@@ -1,15 +1,23 @@
+from __future__ import annotations
+
 from abc import abstractmethod
 from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
 from typing import ClassVar
 from weakref import ref
 
 from observ import reactive, readonly
 
+from .concurrency import MainThreadQueue, get_default_executor
+
 
 class Component:
     """Abstract base class for components"""
 
     __lookup_cache__: ClassVar = defaultdict(dict)
+    # Executor for `run_in_executor`, uses the default executor when None
+    executor: ClassVar[Executor | None] = None
 
     def __init__(self, props=None, parent=None):
         self._props = readonly({} if props is None else props)
@@ -20,6 +28,12 @@ class Component:
         self._lookup_cache = Component.__lookup_cache__[type(self)]
         self._parent = ref(parent) if parent else None
         self._provided = {}
+        # Pending jobs of `run_in_executor` by key (or by future without key)
+        self._jobs = {}
+        # Queue of the Kolla instance for committing the results of the jobs
+        self._main_thread: MainThreadQueue | None = (
+            parent._main_thread if parent else None
+        )
 
     @property
     def props(self):
@@ -124,6 +138,51 @@ class Component:
         """Removes an event handler for the given event."""
         self._event_handlers[event].remove(handler)
 
+    def run_in_executor(self, fn: Callable, *args, key: str | None = None) -> Future:
+        """Call `fn(*args)` in the executor of this component, so that heavy
+        computations don't block the event loop. Returns a future.
+
+        When a key is given, the result is stored in `self.state[key]` on the main
+        thread, after which the next flush of the scheduler updates the DOM. Calling
+        this method again with the same key cancels the previous job or discards its
+        result when it is already running. All pending jobs are cancelled when the
+        component is unmounted. Exceptions are not stored, use the returned future
+        to retrieve them."""
+        main_thread = self._main_thread
+        if main_thread is None:
+            raise RuntimeError("Component is not rendered by a Kolla instance")
+        executor = self.executor or get_default_executor()
+        if key is not None and (previous := self._jobs.pop(key, None)):
+            previous.cancel()
+
+        main_thread.prepare()
+        future = executor.submit(fn, *args)
+        slot = future if key is None else key
+        self._jobs[slot] = future
+
+        def done(future):
+            # Called on the thread of the executor
+            if not future.cancelled():
+                main_thread.call_soon(self._commit_job, slot, future)
+
+        future.add_done_callback(done)
+        return future
+
+    def _commit_job(self, slot, future: Future):
+        """Called on the main thread when a job of `run_in_executor` is done."""
+        if self._jobs.get(slot) is not future:
+            # Superseded or cancelled
+            return
+        del self._jobs[slot]
+        if slot is not future and future.exception() is None:
+            self.state[slot] = future.result()
+
+    def _cancel_jobs(self):
+        """Cancel all pending jobs of `run_in_executor`."""
+        for future in self._jobs.values():
+            future.cancel()
+        self._jobs.clear()
+
     def _lookup(self, name, context):
         """
         Helper method that is used in the template.
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Hashable, Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from queue import Full
+from typing import Any
+
+from observ import scheduler
+from observ.proxy import Proxy
+
+
+class MainThreadQueue:
+    """
+    Thread-safe queue of callbacks that are to be called on the main (UI) thread.
+    Every `Kolla` instance has its own queue, which is available to its
+    components.
+
+    Other threads add callbacks with `call_soon`. The callbacks are called in
+    order by `drain`, which runs on the main thread: either scheduled on the
+    asyncio event loop (see `register_asyncio`) or called explicitly, for
+    instance from `Kolla.process_pending` when using the SYNC event loop type.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks: deque[tuple[Callable, tuple]] = deque()
+        self._waiting = False
+        self._asyncio = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.request_drain: Callable[[], None] | None = None
+
+    def __len__(self):
+        return len(self._callbacks)
+
+    def register_request_drain(self, callback: Callable[[], None] | None):
+        """
+        Register a (thread-safe) callback that requests a call to `drain` on
+        the main thread. Without a callback, `drain` has to be called manually.
+        """
+        self._asyncio = False
+        self.request_drain = callback
+
+    def register_asyncio(self):
+        """Drain the queue on the asyncio event loop of the main thread."""
+        self._asyncio = True
+        self.request_drain = self._request_drain_asyncio
+
+    def prepare(self):
+        """
+        Called from the main thread before handing out work to other threads,
+        to look up the event loop that `drain` should be scheduled on.
+        """
+        if self._asyncio:
+            self._loop = asyncio.get_event_loop_policy().get_event_loop()
+
+    def _request_drain_asyncio(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.drain)
+
+    def call_soon(self, callback: Callable, *args):
+        """Schedule the callback to be called on the main thread. Thread-safe."""
+        with self._lock:
+            self._callbacks.append((callback, args))
+            if self._waiting or self.request_drain is None:
+                return
+            self._waiting = True
+        self.request_drain()
+
+    def drain(self) -> int:
+        """
+        Call all queued callbacks. The changes that the callbacks make to the
+        state are flushed together, once all callbacks have been called.
+        Returns the number of called callbacks.
+        """
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, deque()
+            self._waiting = False
+        if not callbacks:
+            return 0
+
+        # Collect the requests of the scheduler to flush, which happen immediately
+        # for the SYNC event loop type, so that it is flushed only once
+        request_flush = scheduler.request_flush
+        requested = []
+        scheduler.register_request_flush(lambda: requested.append(True))
+        try:
+            for callback, args in callbacks:
+                callback(*args)
+        finally:
+            scheduler.register_request_flush(request_flush)
+            if requested:
+                request_flush()
+        return len(callbacks)
+
+
+class StateChannel:
+    """
+    Thread-safe channel for updating (reactive) state from other threads, such
+    as threads that read from sockets or serial devices.
+
+    Producers call `put` or `update` from any thread. The updates are merged
+    per key, so that only the latest value of each key is applied, and are
+    applied all at once on the main thread, where they trigger a single flush
+    of the scheduler. A key is either a key of the target or a tuple with the
+    path to a nested value, for instance `("sensors", 3, "value")`.
+
+    When `maxsize` keys are pending, producers block until the main thread has
+    caught up (or raise `queue.Full` when not blocking or after the timeout).
+    Updates for keys that are already pending are always accepted.
+    """
+
+    def __init__(self, target: Any, queue: MainThreadQueue, maxsize: int = 10_000):
+        self.target = target
+        self.maxsize = maxsize
+        self._queue = queue
+        # Channels are created on the main thread
+        self._queue.prepare()
+        self._pending: dict[Hashable, Any] = {}
+        self._scheduled = False
+        self._condition = threading.Condition()
+        # Number of received and applied updates and the number of batches in
+        # which they were applied
+        self.received = 0
+        self.applied = 0
+        self.batches = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, key: Hashable, value: Any, block=True, timeout=None):
+        """Set the value for the given key (or path). Thread-safe."""
+        self.update({key: value}, block=block, timeout=timeout)
+
+    def update(self, patch: Mapping[Hashable, Any], block=True, timeout=None):
+        """Set the values of all keys (or paths) in the patch. Thread-safe."""
+        with self._condition:
+            pending = self._pending
+            if len(pending) >= self.maxsize and not all(
+                key in pending for key in patch
+            ):
+                if not block:
+                    raise Full
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while len(self._pending) >= self.maxsize:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise Full
+                    self._condition.wait(remaining)
+                pending = self._pending
+            pending.update(patch)
+            self.received += len(patch)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        # The main thread queue is called outside of the lock to prevent
+        # deadlocks when it drains synchronously
+        self._queue.call_soon(self._apply)
+
+    def _apply(self):
+        """Apply the pending updates to the target, on the main thread."""
+        with self._condition:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+            self._condition.notify_all()
+
+        # Group the updates by the object that they apply to, so that they can
+        # be written together: observ copies and compares the whole list or
+        # dict and notifies its watchers for every write
+        groups: dict[int, tuple[Any, dict]] = {}
+        for key, value in pending.items():
+            obj = self.target
+            if isinstance(key, tuple):
+                *path, key = key
+                for item in path:
+                    obj = obj[item]
+            groups.setdefault(id(obj), (obj, {}))[1][key] = value
+
+        for obj, values in groups.values():
+            _write(obj, values)
+        self.applied += len(pending)
+        self.batches += 1
+
+
+def _write(obj: Any, values: dict):
+    """Set the given keys (or indices) of the (proxied) dict or list."""
+    raw = obj.target if isinstance(obj, Proxy) else obj
+    if isinstance(raw, dict):
+        obj.update(values)
+    elif isinstance(raw, list) and all(
+        isinstance(index, int) and index >= 0 for index in values
+    ):
+        # Write runs of consecutive indices with a single slice assignment
+        indices = sorted(values)
+        start = 0
+        for end in range(1, len(indices) + 1):
+            if end < len(indices) and indices[end] == indices[end - 1] + 1:
+                continue
+            run = indices[start:end]
+            if len(run) == 1:
+                obj[run[0]] = values[run[0]]
+            else:
+                obj[run[0] : run[-1] + 1] = [values[index] for index in run]
+            start = end
+    else:
+        for key, value in values.items():
+            obj[key] = value
+
+
+_default_executor: Executor | None = None
+
+
+def get_default_executor() -> Executor:
+    """
+    Returns the executor that is used by `Component.run_in_executor` when
+    the component does not specify one. A thread pool is created on first use.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(thread_name_prefix="kolla")
+    return _default_executor
+
+
+def set_default_executor(executor: Executor | None):
+    """
+    Set the default executor, for instance a `ProcessPoolExecutor` for pure
+    Python computations that hold the GIL. The previous executor is not shut
+    down. Pass None to go back to a (new) thread pool.
+    """
+    global _default_executor
+    _default_executor = executor
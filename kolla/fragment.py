@@ -8,13 +8,31 @@ from observ import computed, reactive, watch_effect
 from observ.proxy import Proxy
 from observ.watcher import Watcher, watch  # type: ignore
 
+from . import profiling, tracing
 from .component import Component
+from .markers import Raw
 from .renderers import Renderer
 from .weak import weak
 
 DomElement = TypeVar("DomElement")
 
 
+class StaticValue:
+    """
+    Stand-in for the watchers of fragments for static renderers: the expression
+    is evaluated whenever the value is needed and nothing is tracked.
+    """
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    @property
+    def value(self):
+        return self.fn()
+
+
 class Fragment:
     """
     A fragment is something that describes an element as a kind of function.
@@ -58,6 +76,8 @@ class Fragment:
         self._condition: Callable | None = None
 
         self._mounted = False
+        # Whether the watchers have been paused (see `pause`)
+        self._paused = False
 
         # TODO: maybe this next line is a bit nasty, but
         # on the other hand, it makes sure that the
@@ -144,10 +164,16 @@ class Fragment:
         `immediate` is True.
         """
 
+        if self.renderer.static:
+            self._watchers[f"bind:{attr}"] = StaticValue(expression)
+            return
+
         @weak(self)
         def update(self, new):
             self._set_attr(attr, new)
 
+        expression, update = self._instrument(f"bind:{attr}", expression, update)
+
         self._watchers[f"bind:{attr}"] = watch(
             expression,
             update,
@@ -165,6 +191,10 @@ class Fragment:
         key. When a key is removed, then the specific watcher is removed and some
         cleanup performed.
         """
+        if self.renderer.static:
+            for attr in expression():
+                self.set_bind(attr, lambda attr=attr: expression()[attr])
+            return
 
         @weak(self)
         def update(self, new: set[str], old: set[str] | None):
@@ -182,9 +212,15 @@ class Fragment:
                 # Perform cleanup
                 self._rem_attr(attr)
 
-        self._watchers[f"bind_dict:{name}"] = watch(
+        keys, update = self._instrument(
+            f"bind_dict:{name}",
             lambda: set(expression().keys()),
             update,
+            source=expression,
+        )
+        self._watchers[f"bind_dict:{name}"] = watch(
+            keys,
+            update,
             immediate=True,
             deep=True,
         )
@@ -205,6 +241,9 @@ class Fragment:
         # TODO: In case of a component tag, do we maybe want to wait???
         # So that we can build up a reactive props object or something?
         self.tag = expression()
+        if self.renderer.static:
+            return
+        expression, update_type = self._instrument("type", expression, update_type)
         self._watchers["type"] = watch(
             expression,
             update_type,
@@ -264,24 +303,129 @@ class Fragment:
 
         if self.element:
             self.renderer.insert(self.element, parent=target, anchor=anchor)
-        for child in self.children:
-            child.mount(self.element or target)
+
+        # Plain closures over a weak ref instead of `weak`, which inspects the
+        # signature of the function: this runs for every element
+        fragment = ref(self)
+
+        def mount_children():
+            if this := fragment():
+                for child in this.children:
+                    child.mount(this.element or target)
+
+        def unmount_children():
+            # Keep the children from updating (or mounting new children) while
+            # unmounted: they catch up when they are mounted again
+            if this := fragment():
+                for child in this.children:
+                    child.unmount(destroy=False)
+                    child.pause()
+
+        if not self.element or not self.renderer.defer_children(
+            self.element, mount_children, unmount_children
+        ):
+            mount_children()
 
         self._mounted = True
+        if self._paused:
+            self._resume_watchers()
+
+        if self.element and not self.renderer.static:
+
+            def pause(keep: Callable[[str], bool] | None = None):
+                if this := fragment():
+                    this.pause(keep)
+
+            def resume():
+                if this := fragment():
+                    this.resume()
+
+            self.renderer.register_pause(self.element, pause, resume)
+
+    def pause(self, keep: Callable[[str], bool] | None = None):
+        """
+        Pause the watchers of this fragment and its descendants: changes are
+        only tracked, not applied, until the fragment is resumed (or mounted
+        again). The watchers of this fragment for which `keep` returns True
+        (given the name of the watcher, for instance 'bind:title') stay active.
+        """
+        for name, watcher in (self._watchers or {}).items():
+            if isinstance(watcher, Watcher) and (keep is None or not keep(name)):
+                watcher.lazy = True
+                self._paused = True
+
+        for child in self._child_fragments():
+            child.pause()
+
+    def resume(self):
+        """
+        Resume the watchers that were paused by `pause` and apply the changes
+        that were missed. Fragments that are not mounted stay paused until they
+        are mounted again.
+        """
+        if self._paused and self._mounted:
+            self._resume_watchers()
+        for child in self._child_fragments():
+            child.resume()
+
+    def _resume_watchers(self):
+        self._paused = False
+        for watcher in list((self._watchers or {}).values()):
+            if isinstance(watcher, Watcher) and watcher.lazy:
+                watcher.lazy = False
+                if watcher.dirty:
+                    watcher.dirty = False
+                    watcher.update()
+
+    def _child_fragments(self) -> list[Fragment]:
+        """The fragments that are (un)mounted along with this fragment."""
+        return list(self.children)
+
+    def _instrument(
+        self,
+        name: str,
+        expression: Callable,
+        callback: Callable | None = None,
+        source: Callable | None = None,
+    ) -> tuple[Callable, Callable | None]:
+        """
+        Returns the expression and callback for a watcher, wrapped for tracing
+        and profiling when enabled. The location of the watcher for the profiler
+        is taken from `source` (or the expression).
+        """
+        if tracing.tracer is not None:
+            if callback is not None:
+                callback = self._traced(callback, name)
+            else:
+                expression = self._traced(expression, name)
+        return profiling.instrument(self, name, expression, callback, source)
+
+    def _traced(self, fn: Callable, name: str) -> Callable:
+        """Returns `fn` wrapped in a span for tracing."""
+        label = f"{self.tag}[{name}]" if isinstance(self.tag, str) else name
+        fragment = ref(self)
+
+        def get_component():
+            if this := fragment():
+                return this._component_parent()
+
+        return tracing.traced(fn, label, "watcher", get_component)
 
     def _set_attr(self, attr, value):
         if self.element:
             self.renderer.set_attribute(self.element, attr, value)
             if self._mounted:
                 if component := self._component_parent():
-                    component.updated()
+                    with tracing.span("updated", "hook", component):
+                        component.updated()
 
     def _rem_attr(self, attr):
         if self.element:
             self.renderer.remove_attribute(self.element, attr, None)
             if self._mounted:
                 if component := self._component_parent():
-                    component.updated()
+                    with tracing.span("updated", "hook", component):
+                        component.updated()
 
     def _remove(self):
         if self.element:
@@ -339,9 +483,20 @@ class ControlFlowFragment(Fragment):
                     anch = self.anchor()
                 new.mount(self.target, anch)
 
-        self._watchers["control_flow"] = watch(
+        if self.renderer.static:
+            update_fragment(self._active_child(), None)
+            return
+
+        conditions = (child._condition for child in self.children)
+        active_child, update_fragment = self._instrument(
+            "control_flow",
             self._active_child,
             update_fragment,
+            source=next(filter(None, conditions), None),
+        )
+        self._watchers["control_flow"] = watch(
+            active_child,
+            update_fragment,
             deep=True,
             immediate=True,
         )
@@ -389,6 +544,13 @@ class ListFragment(Fragment):
     def set_expression(self, expression: Callable[[], list[Any]] | None):
         self.expression = expression
 
+    def evaluate(self) -> Any:
+        """Returns the value of the expression as a sized collection."""
+        value = self.expression()
+        if isinstance(value, Raw):
+            value = value.value
+        return value if hasattr(value, "__len__") else list(value)
+
     def mount(self, target: Any, anchor: Any | None = None):
         if self._mounted:
             return
@@ -398,11 +560,22 @@ class ListFragment(Fragment):
         # First create a computed value that captures the expression
         # as a list. We use a computed value so that the list is
         # evaluated lazy and is only re-evaluated when needed.
-        @computed
-        @weak(self)
-        def expression(self):
-            value = self.expression()
-            return value if hasattr(value, "__len__") else list(value)
+        # The computed value does not need to be deep: the child fragments track
+        # the items that they use themselves. A deep computed would traverse
+        # (and thus proxy) every item of the list on every change.
+        if self.renderer.static:
+            # Static renderers evaluate the expression only once
+            value = self.evaluate()
+
+            def expression():
+                return value
+
+        else:
+
+            @computed(deep=False)
+            @weak(self)
+            def expression(self):
+                return self.evaluate()
 
         @weak(self)
         def update_children(self):
@@ -410,41 +583,53 @@ class ListFragment(Fragment):
                 fragment = self.children.pop(index)
                 fragment.unmount()
 
-            for i, item in enumerate(expression()):
-                if i >= len(self.children):
+            # Only the length of the value is needed here: the fragments look
+            # up their item by index (so no items are materialized here)
+            for i in range(len(self.children), len(expression())):
 
-                    def index_in_value(i=i):
-                        if i < len(expression()):
-                            return expression()[i]
+                def index_in_value(i=i):
+                    if i < len(expression()):
+                        return expression()[i]
 
-                    # NOTE: I could try and figure out the lambda names
-                    # in the expression / self.expression
+                # NOTE: I could try and figure out the lambda names
+                # in the expression / self.expression
 
-                    # TODO: create_fragment should contain a reactive object
-                    # probably with all the required props. Then within the
-                    # 'create_node' method, the binds can be picked from the
-                    # reactive object. And we'll need a watcher to update that
-                    # reactive object from the 'outside' (so here in this function)
+                # TODO: create_fragment should contain a reactive object
+                # probably with all the required props. Then within the
+                # 'create_node' method, the binds can be picked from the
+                # reactive object. And we'll need a watcher to update that
+                # reactive object from the 'outside' (so here in this function)
 
-                    fragment = self.create_fragment(index_in_value)
-                    self.children.append(fragment)
-                    fragment.parent = self
-                    fragment.mount(target, anchor=self.anchor())
-
-        # Then we add a watch_effect for the children
-        # which adds/removes/updates all the child fragments
-        self._watchers["list"] = watch_effect(update_children)
+                fragment = self.create_fragment(index_in_value)
+                self.children.append(fragment)
+                fragment.parent = self
+                fragment.mount(target, anchor=self.anchor())
+                if self.renderer.static:
+                    # Static output is never updated, so the fragments of the
+                    # items are not needed anymore once they are mounted
+                    self.children.pop()
 
         # FIXME
         # When re-mounting a list (so a v-for within a v-if), the fragments
-        # might still exist so they need to be mounted again.
+        # might still exist so they need to be mounted again (before the new
+        # fragments are added after them).
         # But the actual problem is that the control flow fragment should
         # maybe really destroy the underlying tree? But then how to build it
         # up again? :/ I guess that information should already be available, right???
-        for child in self.children:
+        for child in self.children[: len(expression())]:
             if not child.element:
                 child.mount(target, anchor=self.anchor())
 
+        # Then we add a watch_effect for the children
+        # which adds/removes/updates all the child fragments
+        if self.renderer.static:
+            update_children()
+        else:
+            update_children, _ = self._instrument(
+                "list", update_children, source=self.expression
+            )
+            self._watchers["list"] = watch_effect(update_children)
+
         self._mounted = True
         # TODO: detect whether a keyed list is used?
         # TODO: for keyed lists: watch a list of keys instead of indices
@@ -483,7 +668,8 @@ class ComponentFragment(Fragment):
 
         parent = self._component_parent()
         self.component = self.tag(props=self.props, parent=parent)
-        self.fragment = self.component.render(self.renderer)
+        with tracing.span("render", "component", self.component):
+            self.fragment = self.component.render(self.renderer)
         self.fragment.parent = self
         self.children.append(self.fragment)
 
@@ -498,6 +684,17 @@ class ComponentFragment(Fragment):
         self.target = target
         self.create()
 
+        if self.component:
+            with tracing.span("mount", "component", self.component):
+                self._mount_children(target, anchor)
+        else:
+            self._mount_children(target, anchor)
+
+        self._mounted = True
+        if self._paused:
+            self._resume_watchers()
+
+    def _mount_children(self, target: DomElement, anchor: DomElement | None):
         if self.fragment:
             self.fragment.mount(target, anchor)
         else:
@@ -520,9 +717,8 @@ class ComponentFragment(Fragment):
             except IndexError:
                 pass
 
-            self.component.mounted()
-
-        self._mounted = True
+            with tracing.span("mounted", "hook", self.component):
+                self.component.mounted()
 
     def register_slot(self, name, fragment: SlotFragment):
         self.slots[name] = fragment
@@ -539,9 +735,14 @@ class ComponentFragment(Fragment):
     def _has_content(self):
         return bool(self.props)
 
+    def _child_fragments(self) -> list[Fragment]:
+        # The slot contents are mounted by the slots of the component
+        return [*self.children, *self.slot_contents]
+
     def unmount(self, destroy=True):
         if self.component:
             self.component.before_unmount()
+            self.component._cancel_jobs()
         super().unmount(destroy=destroy)
 
 
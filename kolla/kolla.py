@@ -3,8 +3,10 @@ from typing import Any
 
 from observ import scheduler
 
+from kolla import tracing
 from kolla.component import Component
-from kolla.renderers import Renderer
+from kolla.concurrency import MainThreadQueue, StateChannel
+from kolla.renderers import Renderer, sync_batch
 from kolla.types import EventLoopType
 
 
@@ -13,16 +15,40 @@ class Kolla:
         if not isinstance(renderer, Renderer):
             raise TypeError(f"Expected a Renderer but got a {type(renderer)}")
         self.renderer = renderer
+        tracing.register_renderer(renderer)
         if not event_loop_type:
             event_loop_type = (
                 renderer.preferred_event_loop_type() or EventLoopType.DEFAULT
             )
         self.event_loop_type = event_loop_type
+        # Callbacks of other threads for the components of this instance
+        self.main_thread = MainThreadQueue()
         if self.event_loop_type is EventLoopType.DEFAULT:
-            scheduler.register_asyncio()
+            # Flush through `tracing.flush`, so that flushes can be traced
+            scheduler.register_request_flush(tracing.request_flush_asyncio)
             renderer.register_asyncio()
+            self.main_thread.register_asyncio()
         else:
-            scheduler.register_request_flush(scheduler.flush)
+            scheduler.register_request_flush(flush_sync)
+            renderer.register_sync()
+            self.main_thread.register_request_drain(None)
+
+    def process_pending(self) -> int:
+        """
+        Commit the results of other threads (such as the jobs of
+        `Component.run_in_executor`) on the current (main) thread. Only needed for
+        the SYNC event loop type, otherwise this happens on the event loop.
+        Returns the number of processed results.
+        """
+        return self.main_thread.drain()
+
+    def channel(self, target, maxsize: int = 10_000) -> StateChannel:
+        """
+        Returns a thread-safe channel for updating the given (reactive) target,
+        such as the state that is passed to `render`, from other threads.
+        See `StateChannel`.
+        """
+        return StateChannel(target, self.main_thread, maxsize=maxsize)
 
     def render(
         self,
@@ -36,12 +62,22 @@ class Kolla:
         """
         # Here is the 'root' component which will carry the state
         component = component_class(state or {})
+        # Child components inherit the queue from their parent
+        component._main_thread = self.main_thread
 
         # component.render() returns a fragment which is then mounted
         # into the target (DOM) element
-        self.fragment = component.render(self.renderer)
+        with tracing.span("render", "component", component):
+            self.fragment = component.render(self.renderer)
         self.fragment.component = component
-        self.fragment.mount(target)
+        with sync_batch():
+            self.fragment.mount(target)
+
+
+def flush_sync():
+    """Flush the scheduler and then the batching renderers (SYNC event loop)."""
+    with sync_batch():
+        tracing.flush()
 
 
 def print_fragments(fragment, depth=0):
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Any, Generic, TypeVar
+from weakref import WeakValueDictionary
+
+from observ import shallow_readonly
+from observ.dep import Dep
+from observ.proxy import Proxy
+
+T = TypeVar("T")
+
+
+class _Tracker:
+    """Dependency and version of a boxed value, shared by all its boxes."""
+
+    __slots__ = ("__weakref__", "dep", "value", "version")
+
+    def __init__(self, value):
+        # Keeps the value alive, so that its id is not reused
+        self.value = value
+        self.version = 0
+        self.dep = Dep()
+
+
+# Trackers by the id of their value, for as long as there are boxes for it
+_trackers: WeakValueDictionary[int, _Tracker] = WeakValueDictionary()
+
+
+class Raw(Generic[T]):
+    """
+    Box for a value that should be passed around by reference. Observ only
+    proxies (and traverses) dicts, lists, sets and tuples, so a boxed value is
+    never wrapped in proxies when it is used in state or passed as prop, no
+    matter how big it is. Boxes are equal when they wrap the very same value
+    (by identity), so passing a box on to child components does not trigger
+    any updates, not even when an expression boxes the value again.
+
+    The value is available as `value`. Reading it from a watcher (or template
+    expression) tracks the value, so call `changed` (on any box of the value)
+    after modifying the value in place to re-evaluate those watchers.
+    """
+
+    __slots__ = ("_tracker",)
+
+    def __init__(self, value: T):
+        # Unwrap (only) the outer proxy, nested values are stored raw already
+        value = value.target if isinstance(value, Proxy) else value
+        tracker = _trackers.get(id(value))
+        if tracker is None:
+            tracker = _trackers[id(value)] = _Tracker(value)
+        self._tracker = tracker
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(version={self._version}, {self._value!r})>"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._tracker is other._tracker
+
+    def __hash__(self):
+        return hash((type(self), id(self._tracker)))
+
+    @property
+    def _value(self) -> T:
+        return self._tracker.value
+
+    @property
+    def _version(self) -> int:
+        return self._tracker.version
+
+    @property
+    def _dep(self) -> Dep:
+        return self._tracker.dep
+
+    @property
+    def value(self) -> T:
+        self._dep.depend()
+        return self._value
+
+    @property
+    def version(self) -> int:
+        """Counter that increments every time `changed` is called."""
+        self._dep.depend()
+        return self._version
+
+    def changed(self):
+        """Notify the watchers of the value that it was modified in place."""
+        self._tracker.version += 1
+        self._dep.notify()
+
+
+class Shallow(Raw[T]):
+    """
+    Box for a value of which only the top-level is reactive: `value` returns a
+    shallow readonly proxy, so changes to the keys/items of the value are
+    tracked, but nested values are returned as-is.
+    """
+
+    __slots__ = ()
+
+    @property
+    def value(self) -> T:
+        self._dep.depend()
+        return shallow_readonly(self._value)
+
+
+def raw(value: Any) -> Raw:
+    """Mark the value as raw: pass it by reference, without any proxies."""
+    if isinstance(value, Raw):
+        return value
+    return Raw(value)
+
+
+def shallow(value: Any) -> Shallow:
+    """Mark the value as shallow: only track changes to the top-level of value."""
+    if isinstance(value, Shallow):
+        return value
+    return Shallow(value._value if isinstance(value, Raw) else value)
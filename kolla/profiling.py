@@ -0,0 +1,269 @@
+"""
+Profiler for the reactive bindings of templates:
+
+    from kolla import profiling
+
+    with profiling.profile() as profiler:
+        gui.render(App, container)
+        ...
+    print(profiler.report())
+    profiler.dump_stats("kolla.prof")  # for pstats, snakeviz, ...
+
+Records for every watcher that the fragments create (binds, dynamic types,
+v-if and v-for) how often the expression is evaluated, how often the callback
+runs and the time spent in both, together with what triggered the evaluations.
+Each binding is labelled with its component, element tag, attribute and the
+location of its expression. Only watchers that are created while profiling is
+enabled are profiled: the profiler only wraps the expressions and callbacks of
+these watchers and leaves observ alone.
+
+The triggers of a binding are derived from its expression: the first
+evaluation is labelled `<initial>` and the re-evaluations with the names that
+the expression looks up in the component (for instance `['count']`).
+"""
+
+from __future__ import annotations
+
+import dis
+import marshal
+import os
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from inspect import unwrap
+from pathlib import Path
+from types import CodeType
+from weakref import ref
+
+from .tracing import wrap
+
+# The active profiler, None when profiling is disabled
+profiler: Profiler | None = None
+
+# Label of the first evaluation of a binding
+INITIAL = "<initial>"
+# Label of the re-evaluations of bindings that don't look up any names
+CHANGED = "<changed>"
+
+
+class Binding:
+    """Statistics of a single watcher of a fragment."""
+
+    __slots__ = (
+        "_fragment",
+        "attribute",
+        "callback_time",
+        "callbacks",
+        "component",
+        "evaluations",
+        "location",
+        "tag",
+        "time",
+        "trigger",
+        "triggers",
+    )
+
+    def __init__(self, fragment, attribute: str, source: Callable):
+        self._fragment = ref(fragment)
+        tag = fragment.tag
+        self.tag: str = tag if isinstance(tag, str) or tag is None else tag.__name__
+        self.attribute = attribute
+        self.component: str | None = None
+        code = getattr(unwrap(source), "__code__", None)
+        self.location = (
+            (code.co_filename, code.co_firstlineno) if code else ("<unknown>", 0)
+        )
+        # Label of the re-evaluations
+        self.trigger = trigger_label(code)
+        self.evaluations = 0
+        self.time = 0.0
+        self.callbacks = 0
+        self.callback_time = 0.0
+        # Number of evaluations per trigger
+        self.triggers: Counter[str] = Counter()
+
+    @property
+    def name(self) -> str:
+        self.resolve_component()
+        if self.tag is None:
+            return f"{self.component or '?'}.{self.attribute}"
+        return f"{self.component or '?'}.{self.tag}[{self.attribute}]"
+
+    def resolve_component(self):
+        if self.component is None and (fragment := self._fragment()):
+            if component := fragment._component_parent():
+                self.component = type(component).__qualname__
+
+    def evaluated(self, duration: float):
+        self.triggers[self.trigger if self.evaluations else INITIAL] += 1
+        self.evaluations += 1
+        self.time += duration
+        self.resolve_component()
+
+    def called(self, duration: float):
+        self.callbacks += 1
+        self.callback_time += duration
+
+
+class _CallbackTimer:
+    __slots__ = ("binding", "start")
+
+    def __init__(self, binding: Binding):
+        self.binding = binding
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.binding.called(time.perf_counter() - self.start)
+
+
+def trigger_label(code: CodeType | None) -> str:
+    """
+    Returns the label for the re-evaluations of the expression with the given
+    code: the names that it looks up with `Component._lookup`.
+    """
+    names: dict[str, None] = {}
+    codes = [code] if code else []
+    while codes:
+        code = codes.pop()
+        previous = None
+        for instruction in dis.get_instructions(code):
+            if previous == "_lookup" and instruction.opname == "LOAD_CONST":
+                names[f"[{instruction.argval!r}]"] = None
+            previous = instruction.argval
+        # Expressions with comprehensions or lambdas have nested code
+        codes.extend(const for const in code.co_consts if isinstance(const, CodeType))
+    return " ".join(names) or CHANGED
+
+
+class Profiler:
+    """Collects the statistics of the bindings of fragments."""
+
+    def __init__(self):
+        self.bindings: list[Binding] = []
+
+    def instrument(
+        self,
+        fragment,
+        attribute: str,
+        expression: Callable,
+        callback: Callable | None,
+        source: Callable | None = None,
+    ) -> tuple[Callable, Callable | None]:
+        """
+        Returns the profiled expression and callback for a watcher of the
+        fragment. The location is taken from `source` (or the expression).
+        """
+        binding = Binding(fragment, attribute, source or expression)
+        self.bindings.append(binding)
+
+        def profiled():
+            if profiler is not self:
+                return expression()
+            start = time.perf_counter()
+            try:
+                return expression()
+            finally:
+                binding.evaluated(time.perf_counter() - start)
+
+        def timer():
+            return _CallbackTimer(binding) if profiler is self else nullcontext()
+
+        if callback is not None:
+            callback = wrap(callback, timer)
+        return profiled, callback
+
+    def sorted_bindings(self, sort: str = "time") -> list[Binding]:
+        """Returns the bindings sorted by 'time', 'evaluations' or 'callbacks'."""
+        keys = {
+            "time": lambda b: b.time + b.callback_time,
+            "evaluations": lambda b: b.evaluations,
+            "callbacks": lambda b: b.callbacks,
+        }
+        return sorted(self.bindings, key=keys[sort], reverse=True)
+
+    def report(self, sort: str = "time", limit: int | None = 20) -> str:
+        """Returns a table with the statistics of the bindings."""
+        lines = [
+            f"{'evals':>8} {'eval ms':>9} {'calls':>8} {'call ms':>9}  "
+            "binding (location): triggers"
+        ]
+        for binding in self.sorted_bindings(sort)[:limit]:
+            filename, line = binding.location
+            triggers = ", ".join(
+                f"{label} x{count}" for label, count in binding.triggers.most_common(3)
+            )
+            lines.append(
+                f"{binding.evaluations:>8} {binding.time * 1000:>9.2f}"
+                f" {binding.callbacks:>8} {binding.callback_time * 1000:>9.2f}"
+                f"  {binding.name} ({filename}:{line}): {triggers}"
+            )
+        return "\n".join(lines)
+
+    def stats(self) -> dict[tuple[str, int, str], tuple]:
+        """
+        Returns the statistics in the format of `pstats`: the bindings are
+        the functions and their triggers are the callers.
+        """
+        stats = {}
+        for binding in self.bindings:
+            filename, line = binding.location
+            total = binding.time + binding.callback_time
+            key = (filename, line, binding.name)
+            # Bindings can share a location (for instance in a v-for)
+            cc, nc, tt, ct, callers = stats.get(key, (0, 0, 0.0, 0.0, {}))
+            for label, count in binding.triggers.items():
+                caller = ("<mutation>", 0, label)
+                previous = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (previous[0] + count, previous[1] + count, 0.0, 0.0)
+            stats[key] = (
+                cc + binding.evaluations,
+                nc + binding.evaluations,
+                tt + total,
+                ct + total,
+                callers,
+            )
+        return stats
+
+    def dump_stats(self, path: str | os.PathLike):
+        """Write the statistics to a file that can be loaded with `pstats`."""
+        Path(path).write_bytes(marshal.dumps(self.stats()))
+
+
+def enable(new_profiler: Profiler | None = None) -> Profiler:
+    """Start profiling with the given (or a new) profiler."""
+    global profiler
+    disable()
+    profiler = new_profiler or Profiler()
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """Stop profiling, returns the profiler that was active."""
+    global profiler
+    previous, profiler = profiler, None
+    return previous
+
+
+@contextmanager
+def profile(new_profiler: Profiler | None = None) -> Iterator[Profiler]:
+    """Context manager that profiles its body."""
+    try:
+        yield enable(new_profiler)
+    finally:
+        disable()
+
+
+def instrument(
+    fragment,
+    attribute: str,
+    expression: Callable,
+    callback: Callable | None,
+    source: Callable | None = None,
+) -> tuple[Callable, Callable | None]:
+    """Profile the watcher of a fragment when profiling is enabled."""
+    if profiler is None:
+        return expression, callback
+    return profiler.instrument(fragment, attribute, expression, callback, source)
@@ -1,12 +1,49 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, Callable, Optional
+from contextlib import contextmanager
+from importlib import import_module
+from typing import Any, Callable, Iterator, List, Optional
 
 from kolla.types import EventLoopType
 
+# Batching renderers that requested a flush within a `sync_batch`
+_sync_requests: List["Renderer"] = []
+_sync_depth = 0
+
+
+@contextmanager
+def sync_batch() -> Iterator[None]:
+    """
+    Used by kolla around mounting and, with the SYNC event loop type, around
+    every flush of the scheduler: the batching renderers that request a flush
+    within the block (SYNC event loop type) are flushed once, after the
+    (outermost) block.
+    """
+    global _sync_depth
+    _sync_depth += 1
+    try:
+        yield
+    finally:
+        _sync_depth -= 1
+        if not _sync_depth:
+            while _sync_requests:
+                _sync_requests.pop(0).flush_batch()
+
 
 class Renderer(metaclass=ABCMeta):  # pragma: no cover
     """Abstract base class for renderers"""
 
+    # Whether the renderer produces static output, in which case the fragments
+    # evaluate their expressions only once and don't install any watchers
+    static: bool = False
+
+    # Name of the method that applies the changes of a renderer that collects
+    # its changes in batches (for instance "send"), None for renderers that
+    # apply every change immediately. Batching renderers call `request_flush`
+    # for every change and reset `_flush_requested` in that method.
+    flush_method: Optional[str] = None
+    _flush_requested: bool = False
+    _request_flush: Optional[Callable[[], None]] = None
+
     def preferred_event_loop_type(self) -> Optional[EventLoopType]:
         """Indicate the preferred default event loop type"""
         return None
@@ -15,6 +52,78 @@ class Renderer(metaclass=ABCMeta):  # pragma: no cover
         """
         Called by kolla instance when registering the scheduler with
         asyncio so that the renderer can perform any additional setup.
+        Batching renderers are flushed once per flush of the scheduler.
+        """
+        if self.flush_method is not None:
+            self.register_request_flush(self._request_flush_asyncio)
+
+    def register_sync(self) -> None:
+        """
+        Called by kolla instance for the SYNC event loop type. Batching
+        renderers are flushed after every flush of the scheduler and after
+        mounting (see `sync_batch`).
+        """
+        if self.flush_method is not None:
+            self.register_request_flush(self._request_flush_sync)
+
+    def register_request_flush(self, callback: Optional[Callable[[], None]]):
+        """
+        Register callback that is called by batching renderers on the first
+        change after a flush. The callback is responsible for (eventually)
+        calling `flush_batch`. Without a callback, the method named by
+        `flush_method` has to be called manually.
+        """
+        self._request_flush = callback
+
+    def request_flush(self):
+        """Called by batching renderers for every change."""
+        if not self._flush_requested:
+            self._flush_requested = True
+            if self._request_flush is not None:
+                self._request_flush()
+
+    def flush_batch(self):
+        """Apply the changes that were collected so far (batching renderers)."""
+        getattr(self, self.flush_method)()
+
+    def _request_flush_asyncio(self):
+        import asyncio
+
+        loop = asyncio.get_event_loop_policy().get_event_loop()
+        # Called after any running scheduler flush has finished
+        loop.call_soon(self.flush_batch)
+
+    def _request_flush_sync(self):
+        if _sync_depth:
+            _sync_requests.append(self)
+        else:
+            self.flush_batch()
+
+    def defer_children(
+        self, el: Any, mount: Callable[[], None], unmount: Callable[[], None]
+    ) -> bool:
+        """
+        Called after `el` has been inserted, right before its children are mounted.
+        Return True to take over the mounting of the children: the renderer is then
+        responsible for calling `mount` (and optionally `unmount`) whenever the
+        children of `el` should be (un)mounted, for instance when a tree item is
+        expanded or collapsed.
+        """
+        return False
+
+    def register_pause(
+        self,
+        el: Any,
+        pause: Callable[[Optional[Callable[[str], bool]]], None],
+        resume: Callable[[], None],
+    ) -> None:
+        """
+        Called after `el` and its children have been mounted. Renderers that hide
+        elements without removing them (for instance when culling) can call
+        `pause` to stop updating `el` and its descendants while hidden, and
+        `resume` to apply the changes that were missed. `pause` optionally takes
+        a predicate for the names of the watchers of `el` that should stay
+        active (for instance 'bind:local.position').
         """
         pass
 
@@ -68,25 +177,34 @@ class Renderer(metaclass=ABCMeta):  # pragma: no cover
         pass
 
 
-from .dict_renderer import DictRenderer  # noqa: I202
-
-try:
-    import js
-except ImportError:  # pragma: no cover
-    pass
-else:
-    from .dom_renderer import DomRenderer
-
-try:
-    import pygfx
-except ImportError:  # pragma: no cover
-    pass
-else:
-    from .pygfx_renderer import PygfxRenderer
-
-try:
-    import PySide6
-except ImportError:  # pragma: no cover
-    pass
-else:
-    from .pyside_renderer import PySideRenderer
+from .dict_renderer import DictRenderer  # noqa: E402, F401
+
+# Renderers for optional dependencies are only imported when they are
+# accessed for the first time, so that `import kolla` does not have to
+# pay for importing (for instance) PySide6 or pygfx when they are not used.
+LAZY_RENDERERS = {
+    "BatchedDomRenderer": ".dom_renderer",
+    "DomRenderer": ".dom_renderer",
+    "PygfxRenderer": ".pygfx_renderer",
+    "PySideRenderer": ".pyside_renderer",
+}
+
+
+def __getattr__(name):
+    if name not in LAZY_RENDERERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        module = import_module(LAZY_RENDERERS[name], __name__)
+    except ImportError as e:
+        # Raise an AttributeError so that `hasattr` keeps working for
+        # renderers of which the dependencies are not installed
+        raise AttributeError(f"{name} is not available: {e}") from e
+
+    renderer = getattr(module, name)
+    globals()[name] = renderer
+    return renderer
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_RENDERERS))
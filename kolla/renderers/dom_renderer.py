@@ -1,7 +1,20 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
 import js
 
 from . import Renderer
 
+try:
+    from pyodide.ffi import create_proxy
+except ImportError:  # pragma: no cover
+
+    def create_proxy(fn: Callable) -> Callable:
+        """Outside of pyodide, a callable can be passed as is."""
+        return fn
+
 
 class DomRenderer(Renderer):
     """Renderer that renders to a pyodide dom"""
@@ -25,7 +38,13 @@ class DomRenderer(Renderer):
         el.textContent = value
 
     def set_attribute(self, el, attr: str, value):
-        el.setAttribute(attr, value)
+        # Boolean attributes are present or absent, just like in the appliers
+        if value is True:
+            el.setAttribute(attr, "")
+        elif value is False or value is None:
+            el.removeAttribute(attr)
+        else:
+            el.setAttribute(attr, value)
 
     def remove_attribute(self, el, attr: str, value):
         el.removeAttribute(attr)
@@ -35,3 +54,206 @@ class DomRenderer(Renderer):
 
     def remove_event_listener(self, el, event_type, value):
         el.removeEventListener(event_type, value)
+
+
+# Operations of the BatchedDomRenderer, each followed by a fixed number of
+# arguments in the flat operation array
+OP_CREATE = 0  # id, type
+OP_CREATE_TEXT = 1  # id
+OP_INSERT = 2  # id, parent, anchor (-1 to append)
+OP_REMOVE = 3  # id, parent
+OP_SET_TEXT = 4  # id, text
+OP_SET_ATTRIBUTE = 5  # id, name, value
+OP_REMOVE_ATTRIBUTE = 6  # id, name
+OP_ADD_LISTENER = 7  # id, event type, handler
+OP_REMOVE_LISTENER = 8  # id, event type, handler
+
+# Id of the container element that is rendered into
+ROOT = 0
+
+# Creates the function that applies the (JSON encoded) flat operation arrays
+APPLIER_SOURCE = """
+(container, dispatch) => {
+  const document = window.document;
+  const nodes = new Map([[0, container]]);
+  const listeners = new Map();
+  // Handler ids of the listeners per node id
+  const nodeListeners = new Map();
+  function apply(data) {
+    const ops = JSON.parse(data);
+    let i = 0;
+    while (i < ops.length) {
+      const node = nodes.get(ops[i + 1]);
+      switch (ops[i]) {
+        case 0:
+          nodes.set(ops[i + 1], document.createElement(ops[i + 2]));
+          i += 3;
+          break;
+        case 1:
+          nodes.set(ops[i + 1], document.createTextNode(""));
+          i += 2;
+          break;
+        case 2: {
+          const anchor = ops[i + 3] === -1 ? null : nodes.get(ops[i + 3]);
+          nodes.get(ops[i + 2]).insertBefore(node, anchor);
+          i += 4;
+          break;
+        }
+        case 3:
+          nodes.get(ops[i + 2]).removeChild(node);
+          nodes.delete(ops[i + 1]);
+          // The renderer has forgotten the handlers of removed nodes
+          for (const handler of nodeListeners.get(ops[i + 1]) || []) {
+            listeners.delete(handler);
+          }
+          nodeListeners.delete(ops[i + 1]);
+          i += 3;
+          break;
+        case 4: node.textContent = ops[i + 2]; i += 3; break;
+        case 5: {
+          const value = ops[i + 3];
+          if (value === true) node.setAttribute(ops[i + 2], "");
+          else if (value === false || value === null) node.removeAttribute(ops[i + 2]);
+          else node.setAttribute(ops[i + 2], value);
+          i += 4;
+          break;
+        }
+        case 6: node.removeAttribute(ops[i + 2]); i += 3; break;
+        case 7: {
+          const handler = ops[i + 3];
+          const listener = (event) => dispatch(handler, event);
+          listeners.set(handler, listener);
+          if (!nodeListeners.has(ops[i + 1])) nodeListeners.set(ops[i + 1], new Set());
+          nodeListeners.get(ops[i + 1]).add(handler);
+          node.addEventListener(ops[i + 2], listener);
+          i += 4;
+          break;
+        }
+        case 8:
+          node.removeEventListener(ops[i + 2], listeners.get(ops[i + 3]));
+          listeners.delete(ops[i + 3]);
+          nodeListeners.get(ops[i + 1]).delete(ops[i + 3]);
+          i += 4;
+          break;
+        default: throw new Error(`Unknown operation: ${ops[i]}`);
+      }
+    }
+  }
+  return { apply, node: (id) => nodes.get(id) };
+}
+"""
+
+
+class DomNode:
+    """Handle of a DOM node of the BatchedDomRenderer."""
+
+    __slots__ = ("__weakref__", "id", "listeners")
+
+    def __init__(self, id: int):
+        self.id = id
+        # Handler ids of the event listeners of this node
+        self.listeners: dict[tuple[str, Callable], int] = {}
+
+    def __repr__(self):
+        return f"<DomNode({self.id})>"
+
+
+class BatchedDomRenderer(Renderer):
+    """
+    Renderer that renders to a pyodide dom, like the DomRenderer, but records
+    the operations and applies them with a single call into JavaScript per
+    batch, instead of one (or more) per operation. The nodes are handles with
+    an integer id. Render into `root`, which refers to `container`.
+
+    The operations are applied once per flush of the scheduler (see
+    `Renderer.flush_method`). A different strategy can be configured with
+    `register_request_flush`.
+    """
+
+    flush_method = "flush"
+
+    def __init__(self, container):
+        super().__init__()
+        self.root = DomNode(ROOT)
+        self._next_id = ROOT + 1
+        self._operations: list = []
+        # Event handlers by handler id
+        self._handlers: dict[int, Callable] = {}
+        self._next_handler_id = 1
+        # The proxy of `_dispatch` has to outlive the call that creates the
+        # applier, otherwise pyodide destroys it right after the call
+        self._dispatch_proxy = create_proxy(self._dispatch)
+        applier = js.eval(APPLIER_SOURCE)(container, self._dispatch_proxy)
+        self._apply = applier.apply
+        self._node = applier.node
+        # Number of batches and operations that were applied
+        self.batches = 0
+        self.operations = 0
+
+    def flush(self):
+        """Apply the operations that were recorded so far."""
+        self._flush_requested = False
+        if not self._operations:
+            return
+        operations, self._operations = self._operations, []
+        self.batches += 1
+        self._apply(json.dumps(operations, separators=(",", ":"), default=str))
+
+    def element(self, node: DomNode):
+        """Returns the DOM node for the given handle (after a flush)."""
+        return self._node(node.id)
+
+    def _dispatch(self, handler_id: int, event):
+        if handler := self._handlers.get(handler_id):
+            handler(event)
+
+    def _add(self, *operation):
+        self._operations.extend(operation)
+        self.operations += 1
+        self.request_flush()
+
+    def _create_node(self) -> DomNode:
+        node = DomNode(self._next_id)
+        self._next_id += 1
+        return node
+
+    def create_element(self, type: str) -> DomNode:
+        node = self._create_node()
+        self._add(OP_CREATE, node.id, type)
+        return node
+
+    def create_text_element(self) -> DomNode:
+        node = self._create_node()
+        self._add(OP_CREATE_TEXT, node.id)
+        return node
+
+    def insert(self, el: DomNode, parent: DomNode, anchor=None):
+        anchor_id = anchor.id if anchor is not None else -1
+        self._add(OP_INSERT, el.id, parent.id, anchor_id)
+
+    def remove(self, el: DomNode, parent: DomNode):
+        for handler_id in el.listeners.values():
+            del self._handlers[handler_id]
+        el.listeners.clear()
+        self._add(OP_REMOVE, el.id, parent.id)
+
+    def set_element_text(self, el: DomNode, value: str):
+        self._add(OP_SET_TEXT, el.id, value)
+
+    def set_attribute(self, el: DomNode, attr: str, value):
+        self._add(OP_SET_ATTRIBUTE, el.id, attr, value)
+
+    def remove_attribute(self, el: DomNode, attr: str, value):
+        self._add(OP_REMOVE_ATTRIBUTE, el.id, attr)
+
+    def add_event_listener(self, el: DomNode, event_type: str, value: Callable):
+        handler_id = self._next_handler_id
+        self._next_handler_id += 1
+        self._handlers[handler_id] = value
+        el.listeners[(event_type, value)] = handler_id
+        self._add(OP_ADD_LISTENER, el.id, event_type, handler_id)
+
+    def remove_event_listener(self, el: DomNode, event_type: str, value: Callable):
+        handler_id = el.listeners.pop((event_type, value))
+        del self._handlers[handler_id]
+        self._add(OP_REMOVE_LISTENER, el.id, event_type, handler_id)
@@ -0,0 +1,121 @@
+"""
+Render many static HTML documents in parallel over a pool of processes.
+
+    with BatchRenderer("reports/report.cgx", processes=8) as batch:
+        for html in batch.render(props for props in all_reports()):
+            ...
+
+Every worker process loads (and compiles) the component once, after which it
+renders the documents with `write_html`. The documents are returned in the
+order of the props.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Union
+
+from ..component import Component
+from ..sfc import compiler
+from .html_renderer import write_html
+
+# A component class, a path to a .cgx file or a 'module:Class' reference
+ComponentReference = Union[type[Component], str, os.PathLike]
+
+# The component of the worker process
+_component: type[Component] | None = None
+
+
+def resolve_component(component: ComponentReference) -> type[Component]:
+    """Returns the component class for the given reference."""
+    if isinstance(component, type):
+        return component
+    if str(component).endswith(f".{compiler.SUFFIX}"):
+        return compiler.load(Path(component))[0]
+    module, _, name = str(component).partition(":")
+    if not name:
+        raise ValueError(f"Expected 'module:Class' but got {component!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def _init_worker(component: ComponentReference):
+    global _component
+    _component = resolve_component(component)
+
+
+def _render(props: dict) -> str:
+    chunks: list[str] = []
+    write_html(_component, chunks.append, props)
+    return "".join(chunks)
+
+
+class BatchRenderer:
+    """
+    Pool of worker processes that render a component to static HTML.
+
+    The component is passed to the workers by reference, so it should be a
+    class that can be imported (which includes components from .cgx files
+    that are imported as module), a path to a .cgx file or a 'module:Class'
+    string. The props of the documents are pickled and should not be reactive.
+    Documents are sent to the workers in chunks of `chunksize` documents.
+    """
+
+    def __init__(
+        self,
+        component: ComponentReference,
+        processes: int | None = None,
+        chunksize: int = 4,
+        context: str | None = None,
+    ):
+        import multiprocessing
+
+        ctx = multiprocessing.get_context(context)
+        self.processes = processes or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._pool = ctx.Pool(
+            self.processes, initializer=_init_worker, initargs=(component,)
+        )
+        # Number of rendered documents and the time spent in `render`
+        self.documents = 0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def throughput(self) -> float:
+        """Number of rendered documents per second."""
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    def render(self, props: Iterable[dict[str, Any]]) -> Iterator[str]:
+        """Yields the HTML of the documents for the given props, in order."""
+        start = time.perf_counter()
+        try:
+            for html in self._pool.imap(_render, props, chunksize=self.chunksize):
+                self.documents += 1
+                yield html
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def close(self):
+        """Stop the worker processes."""
+        self._pool.close()
+        self._pool.join()
+
+
+def render_html_batch(
+    component: ComponentReference,
+    props: Iterable[dict[str, Any]],
+    processes: int | None = None,
+    chunksize: int = 4,
+) -> Iterator[str]:
+    """Yields the HTML for each of the props, rendered by a `BatchRenderer`."""
+    with BatchRenderer(component, processes=processes, chunksize=chunksize) as batch:
+        yield from batch.render(props)
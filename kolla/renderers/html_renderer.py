@@ -1,6 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+import threading
 from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import suppress
+from html import escape
+from queue import Empty, Queue
+from typing import Any
+
+from . import Renderer
 
-from .renderer import Renderer
+# Elements that have no content and no closing tag
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
 
 
 def format_element(element, indent=0):
@@ -66,3 +94,217 @@ class HTMLRenderer(Renderer):
 
     def remove_event_listener(self, el: Element, event_type, value):
         el.handlers[event_type].remove(value)
+
+
+class StreamElement:
+    """Element of the StreamingHTMLRenderer, which only lives until it is written."""
+
+    __slots__ = ("attributes", "text", "type", "written")
+
+    def __init__(self, type: str | None):
+        # None for text elements
+        self.type = type
+        self.attributes: dict[str, Any] = {}
+        self.text = ""
+        self.written = False
+
+    def __repr__(self):
+        return f"<StreamElement({self.type})>"
+
+
+def format_open_tag(el: StreamElement) -> str:
+    """Returns the escaped opening tag (or text) of the element."""
+    if el.type is None:
+        return escape(el.text, quote=False)
+    parts = [f"<{el.type}"]
+    for name, value in el.attributes.items():
+        if value is None or value is False:
+            continue
+        if value is True:
+            parts.append(f" {name}")
+        else:
+            parts.append(f' {name}="{escape(str(value))}"')
+    parts.append(">")
+    return "".join(parts)
+
+
+class StreamingHTMLRenderer(Renderer):
+    """
+    Renderer that writes HTML as soon as an element is inserted, without
+    keeping the element tree around. Since the output is static, the fragments
+    don't install any watchers (nor keep the fragments of list items) and event
+    listeners are ignored.
+
+    Elements have to be inserted in document order, after their attributes
+    have been set (which is the order in which fragments are mounted). Mount
+    into `root` and collect the output with `take`, or pass an `output`
+    callable that receives the output in chunks of (about) `chunk_size`
+    characters, while mounting and on `close`. Also see `render_html`.
+    """
+
+    static = True
+
+    def __init__(
+        self,
+        output: Callable[[str], Any] | None = None,
+        chunk_size: int = 64 * 1024,
+    ):
+        super().__init__()
+        self.output = output
+        self.chunk_size = chunk_size
+        # The render target
+        self.root = StreamElement("root")
+        # The elements that are still open, starting with the root
+        self._open = [self.root]
+        self._chunks: list[str] = []
+        # Number of characters that are written but not taken yet
+        self.size = 0
+
+    def write(self, text: str):
+        self._chunks.append(text)
+        self.size += len(text)
+        if self.output is not None and self.size >= self.chunk_size:
+            self.output(self.take())
+
+    def take(self) -> str:
+        """Returns the HTML that was written since the last call."""
+        result = "".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return result
+
+    def close(self):
+        """Close all open elements and pass the rest of the output on."""
+        while len(self._open) > 1:
+            self.write(f"</{self._open.pop().type}>")
+        if self.output is not None and self.size:
+            self.output(self.take())
+
+    def create_element(self, type: str) -> StreamElement:
+        return StreamElement(type)
+
+    def create_text_element(self) -> StreamElement:
+        return StreamElement(None)
+
+    def insert(self, el: StreamElement, parent: StreamElement, anchor=None):
+        if anchor is not None or el.written:
+            raise RuntimeError("Elements can only be appended, in document order")
+        # Close the elements up to the parent, which come before this element
+        open_elements = self._open
+        while open_elements[-1] is not parent:
+            if len(open_elements) == 1:
+                raise RuntimeError(f"Parent {parent} is already closed")
+            self.write(f"</{open_elements.pop().type}>")
+
+        self.write(format_open_tag(el))
+        el.written = True
+        if el.type is not None and el.type not in VOID_ELEMENTS:
+            open_elements.append(el)
+
+    def remove(self, el: StreamElement, parent: StreamElement):
+        raise RuntimeError("Can't remove elements from streamed output")
+
+    def set_element_text(self, el: StreamElement, value: str):
+        self._check_not_written(el)
+        el.text = value
+
+    def set_attribute(self, el: StreamElement, attr: str, value):
+        self._check_not_written(el)
+        el.attributes[attr] = value
+
+    def remove_attribute(self, el: StreamElement, attr: str, value):
+        self._check_not_written(el)
+        el.attributes.pop(attr, None)
+
+    def add_event_listener(self, el: StreamElement, event_type, value):
+        pass
+
+    def remove_event_listener(self, el: StreamElement, event_type, value):
+        pass
+
+    def _check_not_written(self, el: StreamElement):
+        if el.written:
+            raise RuntimeError(f"{el} has already been written")
+
+
+def write_html(
+    component_class: Callable[[dict], Any],
+    output: Callable[[str], Any],
+    props: dict | None = None,
+    chunk_size: int = 64 * 1024,
+):
+    """
+    Render the component to HTML and pass the output in chunks of (about)
+    `chunk_size` characters to `output`, while the component is mounted.
+    """
+    renderer = StreamingHTMLRenderer(output, chunk_size=chunk_size)
+    component = component_class(props or {})
+    fragment = component.render(renderer)
+    fragment.component = component
+    fragment.mount(renderer.root)
+    renderer.close()
+
+
+class _CancelledError(Exception):
+    """Stops the rendering of `render_html` when the output is not consumed."""
+
+
+def render_html(
+    component_class: Callable[[dict], Any],
+    props: dict | None = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[str]:
+    """
+    Render the component to HTML and yield the output in chunks of (about)
+    `chunk_size` characters, while the component is rendered. Items of lists
+    are rendered one after the other and are dropped once written, so memory
+    use does not grow with the size of the output.
+
+    The component is mounted (see `write_html`) on a separate thread, which
+    waits for every chunk to be consumed before it continues.
+    """
+    chunks: Queue[tuple[str | None, BaseException | None]] = Queue(maxsize=1)
+    cancelled = threading.Event()
+
+    def output(chunk: str):
+        if cancelled.is_set():
+            raise _CancelledError
+        chunks.put((chunk, None))
+
+    def run():
+        try:
+            write_html(component_class, output, props, chunk_size=chunk_size)
+        except _CancelledError:
+            return
+        except BaseException as e:
+            chunks.put((None, e))
+        else:
+            chunks.put((None, None))
+
+    thread = threading.Thread(target=run, name="kolla-html", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk, error = chunks.get()
+            if error is not None:
+                raise error
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        # Let the thread run into the cancellation, when not done yet
+        cancelled.set()
+        while thread.is_alive():
+            with suppress(Empty):
+                chunks.get(timeout=0.01)
+
+
+async def render_html_async(
+    component_class: Callable[[dict], Any],
+    props: dict | None = None,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[str]:
+    """Async version of `render_html`, which yields to the event loop per chunk."""
+    for chunk in render_html(component_class, props, chunk_size=chunk_size):
+        yield chunk
+        await asyncio.sleep(0)
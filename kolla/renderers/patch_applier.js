@@ -0,0 +1,67 @@
+// Applies the patches of kolla's PatchRenderer to the DOM.
+//
+//     const apply = createApplier(document.getElementById("app"), (message) => socket.send(message));
+//     socket.onmessage = (event) => apply(event.data);
+//
+// Events are sent back as JSON: the handler id followed by the event details.
+export function createApplier(root, send) {
+  const nodes = new Map([[0, root]]);
+  const listeners = new Map();
+  // Handler ids of the listeners per node id
+  const nodeListeners = new Map();
+
+  function eventDetails(event) {
+    const target = event.target || {};
+    return { type: event.type, value: target.value, checked: target.checked, key: event.key };
+  }
+
+  return function apply(patch) {
+    for (const op of JSON.parse(patch)) {
+      const node = nodes.get(op[1]);
+      switch (op[0]) {
+        case "a":
+          if (op[3] === true) node.setAttribute(op[2], "");
+          else if (op[3] === false || op[3] === null) node.removeAttribute(op[2]);
+          else node.setAttribute(op[2], op[3]);
+          break;
+        case "c":
+          nodes.set(op[1], document.createElement(op[2]));
+          break;
+        case "t":
+          nodes.set(op[1], document.createTextNode(""));
+          break;
+        case "i":
+          nodes.get(op[2]).insertBefore(node, op[3] === null ? null : nodes.get(op[3]));
+          break;
+        case "r":
+          nodes.get(op[2]).removeChild(node);
+          nodes.delete(op[1]);
+          // The renderer has forgotten the handlers of removed nodes
+          for (const handler of nodeListeners.get(op[1]) || []) listeners.delete(handler);
+          nodeListeners.delete(op[1]);
+          break;
+        case "x":
+          node.textContent = op[2];
+          break;
+        case "d":
+          node.removeAttribute(op[2]);
+          break;
+        case "l": {
+          const listener = (event) => send(JSON.stringify([op[3], eventDetails(event)]));
+          listeners.set(op[3], listener);
+          if (!nodeListeners.has(op[1])) nodeListeners.set(op[1], new Set());
+          nodeListeners.get(op[1]).add(op[3]);
+          node.addEventListener(op[2], listener);
+          break;
+        }
+        case "u":
+          node.removeEventListener(op[2], listeners.get(op[3]));
+          listeners.delete(op[3]);
+          nodeListeners.get(op[1]).delete(op[3]);
+          break;
+        default:
+          throw new Error(`Unknown operation: ${op[0]}`);
+      }
+    }
+  };
+}
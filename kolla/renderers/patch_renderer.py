@@ -0,0 +1,217 @@
+"""
+Renderer that drives a DOM in another process (typically a browser) by sending
+patches: JSON arrays of operations on nodes with stable integer ids. The
+patches are applied by `patch_applier.js` (see `APPLIER_PATH`) in the browser,
+or by a `PatchClient` in Python.
+
+Operations:
+
+    ["c", id, type]                 create element
+    ["t", id]                       create text node
+    ["i", id, parent, anchor|null]  insert node before anchor (or append)
+    ["r", id, parent]               remove node
+    ["x", id, text]                 set text
+    ["a", id, name, value]          set attribute
+    ["d", id, name]                 remove attribute
+    ["l", id, event, handler]       add event listener
+    ["u", id, event, handler]       remove event listener
+
+The node with id 0 is the element that is rendered into. Events are sent
+back as JSON arrays of the handler id followed by the arguments.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from . import Renderer
+
+APPLIER_PATH = Path(__file__).with_name("patch_applier.js")
+
+# Id of the element that is rendered into
+ROOT = 0
+
+
+def dumps(value: Any) -> str:
+    """Compact JSON encoding, falls back to `str` for unsupported values."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class PatchNode:
+    """Handle of a node on the client."""
+
+    __slots__ = ("__weakref__", "id", "listeners")
+
+    def __init__(self, id: int):
+        self.id = id
+        # Handler ids of the event listeners of this node
+        self.listeners: dict[tuple[str, Callable], int] = {}
+
+    def __repr__(self):
+        return f"<PatchNode({self.id})>"
+
+
+class PatchRenderer(Renderer):
+    """
+    Renderer that turns its calls into patch operations and sends them as one
+    JSON patch per batch with `send`. Render into `root`.
+
+    A patch is sent once per flush of the scheduler (see `Renderer.flush_method`).
+    A different strategy can be configured with `register_request_flush`.
+    Within a patch, only the last value of an attribute is sent.
+    """
+
+    flush_method = "flush"
+
+    def __init__(self, send: Callable[[str], Any]):
+        super().__init__()
+        self.send = send
+        self.root = PatchNode(ROOT)
+        self._next_id = ROOT + 1
+        self._operations: list[list] = []
+        # Index of the pending set attribute operations by node id and name
+        self._set_attributes: dict[tuple[int, str], int] = {}
+        # Event handlers by handler id
+        self._handlers: dict[int, Callable] = {}
+        self._next_handler_id = 1
+        # Number of sent patches, operations and bytes
+        self.patches = 0
+        self.operations = 0
+        self.bytes = 0
+
+    def flush(self):
+        """Send the operations that were collected so far as one patch."""
+        self._flush_requested = False
+        if not self._operations:
+            return
+        operations, self._operations = self._operations, []
+        self._set_attributes.clear()
+        patch = dumps(operations)
+        self.patches += 1
+        self.operations += len(operations)
+        self.bytes += len(patch.encode())
+        self.send(patch)
+
+    def dispatch(self, message: str):
+        """Call the event handler for an event message of the client."""
+        handler_id, *args = json.loads(message)
+        if handler := self._handlers.get(handler_id):
+            handler(*args)
+
+    def _add(self, operation: list):
+        self._operations.append(operation)
+        self.request_flush()
+
+    def _node(self) -> PatchNode:
+        node = PatchNode(self._next_id)
+        self._next_id += 1
+        return node
+
+    def create_element(self, type: str) -> PatchNode:
+        node = self._node()
+        self._add(["c", node.id, type])
+        return node
+
+    def create_text_element(self) -> PatchNode:
+        node = self._node()
+        self._add(["t", node.id])
+        return node
+
+    def insert(self, el: PatchNode, parent: PatchNode, anchor=None):
+        anchor_id = anchor.id if anchor is not None else None
+        self._add(["i", el.id, parent.id, anchor_id])
+
+    def remove(self, el: PatchNode, parent: PatchNode):
+        for handler_id in el.listeners.values():
+            del self._handlers[handler_id]
+        el.listeners.clear()
+        self._add(["r", el.id, parent.id])
+
+    def set_element_text(self, el: PatchNode, value: str):
+        self._add(["x", el.id, value])
+
+    def set_attribute(self, el: PatchNode, attr: str, value: Any):
+        key = (el.id, attr)
+        if (index := self._set_attributes.get(key)) is not None:
+            self._operations[index][3] = value
+            return
+        self._set_attributes[key] = len(self._operations)
+        self._add(["a", el.id, attr, value])
+
+    def remove_attribute(self, el: PatchNode, attr: str, value: Any):
+        self._set_attributes.pop((el.id, attr), None)
+        self._add(["d", el.id, attr])
+
+    def add_event_listener(self, el: PatchNode, event_type: str, value: Callable):
+        handler_id = self._next_handler_id
+        self._next_handler_id += 1
+        self._handlers[handler_id] = value
+        el.listeners[(event_type, value)] = handler_id
+        self._add(["l", el.id, event_type, handler_id])
+
+    def remove_event_listener(self, el: PatchNode, event_type: str, value: Callable):
+        handler_id = el.listeners.pop((event_type, value))
+        del self._handlers[handler_id]
+        self._add(["u", el.id, event_type, handler_id])
+
+
+class PatchClient:
+    """
+    Applies patches of a `PatchRenderer` to the given renderer, rendering
+    into `target`, just like `patch_applier.js` does in the browser. Events
+    are sent back with `send`.
+    """
+
+    def __init__(self, renderer: Renderer, target: Any, send: Callable[[str], Any]):
+        self.renderer = renderer
+        self.send = send
+        self.nodes: dict[int, Any] = {ROOT: target}
+        self._listeners: dict[int, Callable] = {}
+        # Handler ids of the listeners per node id
+        self._node_listeners: dict[int, list[int]] = {}
+
+    def apply(self, patch: str):
+        renderer = self.renderer
+        nodes = self.nodes
+        for op, node_id, *args in json.loads(patch):
+            if op == "a":
+                renderer.set_attribute(nodes[node_id], args[0], args[1])
+            elif op == "c":
+                nodes[node_id] = renderer.create_element(args[0])
+            elif op == "t":
+                nodes[node_id] = renderer.create_text_element()
+            elif op == "i":
+                parent, anchor = args
+                anchor = nodes[anchor] if anchor is not None else None
+                renderer.insert(nodes[node_id], nodes[parent], anchor)
+            elif op == "r":
+                renderer.remove(nodes.pop(node_id), nodes[args[0]])
+                # The renderer has forgotten the handlers of removed nodes
+                for handler_id in self._node_listeners.pop(node_id, ()):
+                    del self._listeners[handler_id]
+            elif op == "x":
+                renderer.set_element_text(nodes[node_id], args[0])
+            elif op == "d":
+                renderer.remove_attribute(nodes[node_id], args[0], None)
+            elif op == "l":
+                event, handler_id = args
+                listener = self._listener(handler_id)
+                self._listeners[handler_id] = listener
+                self._node_listeners.setdefault(node_id, []).append(handler_id)
+                renderer.add_event_listener(nodes[node_id], event, listener)
+            elif op == "u":
+                event, handler_id = args
+                listener = self._listeners.pop(handler_id)
+                self._node_listeners[node_id].remove(handler_id)
+                renderer.remove_event_listener(nodes[node_id], event, listener)
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+
+    def _listener(self, handler_id: int) -> Callable:
+        def listener(*args):
+            self.send(dumps([handler_id, *args]))
+
+        return listener
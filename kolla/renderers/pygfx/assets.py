@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from typing import Any
+from weakref import ref
+
+import numpy as np
+import pygfx as gfx
+
+# Content keys of the arrays that have been hashed, by id (see `array_key`)
+_array_keys: dict[int, tuple[ref, tuple]] = {}
+
+
+def content_key(value: Any):
+    """
+    Returns a hashable key that describes the content of the given value.
+    Lists, tuples, dicts, sets and arrays are compared by content and all other
+    values by type and value, so that for instance 1, 1.0 and True differ.
+    Raises TypeError for unhashable values of other types.
+    """
+    if isinstance(value, np.ndarray):
+        return array_key(value)
+    if isinstance(value, (list, tuple)):
+        return (type(value), *(content_key(item) for item in value))
+    if isinstance(value, dict):
+        items = frozenset(
+            (content_key(key), content_key(val)) for key, val in value.items()
+        )
+        return (dict, items)
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(content_key(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        raise TypeError(
+            f"Can't use a value of type {type(value).__name__} in an asset"
+        ) from None
+    return (type(value), value)
+
+
+def array_key(value: np.ndarray) -> tuple:
+    """
+    Returns the content key of the array. Every array object is hashed only
+    once, so arrays must not be modified after they have been used in an asset.
+    """
+    ident = id(value)
+    if (entry := _array_keys.get(ident)) and entry[0]() is value:
+        return entry[1]
+
+    digest = hashlib.blake2b(np.ascontiguousarray(value).data).hexdigest()
+    key = (np.ndarray, value.shape, value.dtype.str, digest)
+
+    def forget(weak_value):
+        if (entry := _array_keys.get(ident)) and entry[0] is weak_value:
+            del _array_keys[ident]
+
+    _array_keys[ident] = (ref(value, forget), key)
+    return key
+
+
+class Asset:
+    """
+    Description of a geometry, material or texture by the callable that creates
+    it and its arguments. When used as value of an attribute, the PygfxRenderer
+    replaces it with a shared object from its asset cache, so that all elements
+    that use an asset with the same arguments share the same (GPU) resources:
+
+        <mesh :geometry="asset(gfx.sphere_geometry, radius=0.5)" />
+
+    Assets with the same factory and arguments compare equal, so evaluating
+    the same expression again does not cause an update. The arguments are
+    compared by content (see `content_key`).
+
+    Note that the shared objects are mutable: changing a shared material (for
+    instance its color in an event handler) changes it for all elements that
+    use the asset. Bind a separate material to elements that change it.
+    """
+
+    __slots__ = ("args", "factory", "key", "kwargs")
+
+    def __init__(self, factory: Callable, *args, **kwargs):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+        self.key = (factory, content_key(args), content_key(kwargs))
+
+    def __repr__(self):
+        arguments = [repr(arg) for arg in self.args]
+        arguments.extend(f"{key}={val!r}" for key, val in self.kwargs.items())
+        return f"<Asset {self.factory.__name__}({', '.join(arguments)})>"
+
+    def __eq__(self, other):
+        return isinstance(other, Asset) and other.key == self.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def create(self):
+        return self.factory(*self.args, **self.kwargs)
+
+
+def asset(factory: Callable, *args, **kwargs) -> Asset:
+    """Describe a shared asset, see `Asset`."""
+    return Asset(factory, *args, **kwargs)
+
+
+def resource_size(obj: Any) -> int:
+    """Returns the number of bytes of the buffers and textures of the object."""
+    if isinstance(obj, (gfx.Buffer, gfx.Texture)):
+        return obj.nbytes
+    if isinstance(obj, gfx.Geometry):
+        values = obj.values()
+    elif isinstance(obj, gfx.Material):
+        values = (getattr(obj, name, None) for name in ("map", "env_map"))
+    else:
+        return 0
+    return sum(resource_size(value) for value in values if value is not None)
+
+
+class AssetCache:
+    """
+    Content-addressed cache of shared assets, which are reference counted.
+    Assets are released as soon as the last element that uses them lets go.
+    """
+
+    def __init__(self):
+        # Maps the asset key to the object, its number of references and its size
+        self._objects: dict[Any, list] = {}
+        self.hits = 0
+        self.misses = 0
+        # Total number of bytes that did not have to be allocated (and uploaded)
+        self.bytes_saved = 0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def acquire(self, asset: Asset) -> Any:
+        """Returns the (shared) object for the asset and adds a reference."""
+        if entry := self._objects.get(asset.key):
+            self.hits += 1
+            self.bytes_saved += entry[2]
+            entry[1] += 1
+            return entry[0]
+
+        self.misses += 1
+        obj = asset.create()
+        self._objects[asset.key] = [obj, 1, resource_size(obj)]
+        return obj
+
+    def release(self, asset: Asset):
+        """Removes a reference to the asset, which is dropped at zero references."""
+        entry = self._objects[asset.key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._objects[asset.key]
+
+    def stats(self) -> dict[str, int | float]:
+        """Returns statistics about the use of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "assets": len(self._objects),
+            "references": sum(entry[1] for entry in self._objects.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": sum(entry[2] for entry in self._objects.values()),
+            "bytes_saved": self.bytes_saved,
+        }
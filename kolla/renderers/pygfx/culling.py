@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from typing import Callable
+from weakref import WeakKeyDictionary, ref
+
+import numpy as np
+import pygfx as gfx
+
+
+def frustum_planes(matrix: np.ndarray) -> np.ndarray:
+    """
+    Returns the 6 planes (a, b, c, d) of the frustum that is described by the
+    given (projection @ view) matrix. The normals point inwards and are
+    normalized, so that `n . p + d` is the distance of point p to the plane.
+    Note that the depth range of wgpu is [0, 1].
+    """
+    rows = np.asarray(matrix, dtype=np.float64)
+    planes = np.array(
+        [
+            rows[3] + rows[0],  # left
+            rows[3] - rows[0],  # right
+            rows[3] + rows[1],  # bottom
+            rows[3] - rows[1],  # top
+            rows[2],  # near
+            rows[3] - rows[2],  # far
+        ]
+    )
+    norms = np.linalg.norm(planes[:, :3], axis=1)
+    return planes / norms[:, None]
+
+
+def sphere_from_aabb(aabb: np.ndarray | None):
+    """Returns the center and radius of the sphere around the bounding box."""
+    if aabb is None or not np.isfinite(aabb).all():
+        return None
+    return (aabb[0] + aabb[1]) / 2, np.linalg.norm(aabb[1] - aabb[0]) / 2
+
+
+def keep_bounds(name: str) -> bool:
+    """Whether the watcher with the given name (might) affect the bounds."""
+    return name.startswith(("bind:local.", "bind:geometry", "bind_dict:"))
+
+
+class CullGroup(gfx.Group):
+    """
+    Group that only adds the children that are within the view frustum of a
+    camera to the scene graph.
+
+    All objects that are added to this group are kept as (logical) members,
+    but only the members whose bounding box intersects the frustum of the
+    camera (expanded by `margin`) are actually attached as children. Members
+    are only detached again once they are more than `margin` plus
+    `hysteresis` (relative to the size of the member) outside of the frustum,
+    so that objects near the edges don't flip on every frame.
+
+    When `camera` is set, new members are only attached once they are found
+    to be visible by `cull`. When `renderer` is set as well, the members are
+    culled right before every render of that renderer. Members without a
+    bounding box are always attached.
+
+    Culled members stay mounted (and in memory): kolla only pauses their
+    watchers, except for the bindings that determine their bounds, and applies
+    the changes that were missed once they are attached again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.camera: gfx.Camera | None = None
+        self.margin = 0.0
+        self.hysteresis = 0.5
+        self._renderer: gfx.WgpuRenderer | None = None
+        self._before_render = None
+        # The logical members, in order of their index in the arrays below
+        self._members: list[gfx.WorldObject] = []
+        self._indices: dict[gfx.WorldObject, int] = {}
+        # Bounding spheres (center and radius) in the space of this group
+        self._centers = np.zeros((0, 3), dtype=np.float64)
+        self._radii = np.zeros(0, dtype=np.float64)
+        self._attached = np.zeros(0, dtype=bool)
+        self._spheres: WeakKeyDictionary[gfx.Buffer, tuple] = WeakKeyDictionary()
+        # Functions that pause and resume the watchers of the members
+        self._pausers: dict[gfx.WorldObject, tuple[Callable, Callable]] = {}
+
+    @property
+    def renderer(self) -> gfx.WgpuRenderer | None:
+        """The renderer before whose renders the members are culled."""
+        return self._renderer
+
+    @renderer.setter
+    def renderer(self, renderer: gfx.WgpuRenderer | None):
+        if self._renderer is not None:
+            self._renderer.remove_event_handler(self._before_render, "before_render")
+            self._renderer = self._before_render = None
+        if renderer is None:
+            return
+
+        # Don't let the renderer keep the group alive
+        group = ref(self)
+
+        def before_render(event):
+            if this := group():
+                this.cull()
+
+        renderer.add_event_handler(before_render, "before_render")
+        self._renderer, self._before_render = renderer, before_render
+
+    @property
+    def members(self) -> list[gfx.WorldObject]:
+        """All the (logical) members of this group, including culled ones."""
+        return list(self._members)
+
+    def add(self, *objects, before=None, keep_world_matrix=False):
+        for obj in objects:
+            if obj in self._indices:
+                continue
+            index = len(self._members)
+            if index >= len(self._radii):
+                self._grow(max(16, 2 * len(self._radii)))
+            self._members.append(obj)
+            self._indices[obj] = index
+            obj._cull_group = self
+            self.update_bounds(obj)
+            # When there is a camera, new members are attached by the next `cull`
+            if self.camera is None:
+                self._attach(index)
+        return self
+
+    def remove(self, *objects, keep_world_matrix=False):
+        for obj in objects:
+            index = self._indices.pop(obj, None)
+            if index is None:
+                super().remove(obj, keep_world_matrix=keep_world_matrix)
+                continue
+            self._detach(index)
+            self._pausers.pop(obj, None)
+            del obj._cull_group
+
+            # Move the last member into the place of the removed member
+            last = self._members.pop()
+            if last is not obj:
+                self._members[index] = last
+                self._indices[last] = index
+                size = len(self._members)
+                self._centers[index] = self._centers[size]
+                self._radii[index] = self._radii[size]
+                self._attached[index] = self._attached[size]
+            self._attached[len(self._members)] = False
+
+    def register_pause(self, obj: gfx.WorldObject, pause: Callable, resume: Callable):
+        """
+        Register the functions that pause and resume the watchers of a member
+        (see `Renderer.register_pause`). Members are paused while culled.
+        """
+        self._pausers[obj] = (pause, resume)
+        if not self._attached[self._indices[obj]]:
+            pause(keep_bounds)
+
+    def update_bounds(self, obj: gfx.WorldObject):
+        """Update the bounds of the member after one of its attributes changed."""
+        index = self._indices[obj]
+        if (sphere := self._local_sphere(obj)) is None:
+            # Members without bounds are always visible
+            self._centers[index] = 0
+            self._radii[index] = np.inf
+            return
+        center, radius = sphere
+        matrix = obj.local.matrix
+        self._centers[index] = matrix[:3, :3] @ center + matrix[:3, 3]
+        self._radii[index] = radius * np.linalg.norm(matrix[:3, :3], axis=0).max()
+
+    def _local_sphere(self, obj: gfx.WorldObject):
+        """
+        Returns the bounding sphere of the object in its own space. The sphere
+        is cached per positions buffer, since many members share geometry.
+        """
+        positions = getattr(obj.geometry, "positions", None)
+        if obj.children or not isinstance(positions, gfx.Buffer):
+            return sphere_from_aabb(obj.get_bounding_box())
+
+        cached = self._spheres.get(positions)
+        if cached is None or cached[0] != positions.rev:
+            cached = (positions.rev, sphere_from_aabb(obj.get_bounding_box()))
+            self._spheres[positions] = cached
+        return cached[1]
+
+    def cull(self, camera: gfx.Camera | None = None) -> tuple[int, int]:
+        """
+        Attach the members that are within the frustum of the camera and detach
+        the ones that are outside. Returns the number of attached and detached
+        members.
+        """
+        camera = camera or self.camera
+        size = len(self._members)
+        if camera is None or not size:
+            return 0, 0
+
+        enter, leave = self._classify(camera, slice(0, size))
+        attached = self._attached[:size]
+        to_attach = np.flatnonzero(enter & ~attached)
+        to_detach = np.flatnonzero(leave & attached)
+        for index in to_attach.tolist():
+            self._attach(index)
+        for index in to_detach.tolist():
+            self._detach(index)
+        return len(to_attach), len(to_detach)
+
+    def _classify(self, camera: gfx.Camera, members: slice):
+        """
+        Returns masks for the given members that tell which ones should be
+        attached and which ones should be detached.
+        """
+        planes = frustum_planes(camera.camera_matrix @ self.world.matrix)
+        centers, radii = self._centers[members], self._radii[members]
+        # Signed distance of the bounding spheres to each of the planes
+        distances = centers @ planes[:, :3].T + planes[:, 3]
+        outside = -distances.min(axis=1)
+        enter = (outside <= radii + self.margin) | np.isinf(radii)
+        leave = outside > radii * (1 + self.hysteresis) + self.margin
+        return enter, leave
+
+    def _grow(self, capacity: int):
+        size = len(self._radii)
+        self._centers = np.resize(self._centers, (capacity, 3))
+        self._radii = np.resize(self._radii, capacity)
+        self._attached = np.resize(self._attached, capacity)
+        self._attached[size:] = False
+
+    def _attach(self, index: int):
+        if not self._attached[index]:
+            self._attached[index] = True
+            obj = self._members[index]
+            super().add(obj)
+            if pausers := self._pausers.get(obj):
+                pausers[1]()
+
+    def _detach(self, index: int):
+        if self._attached[index]:
+            self._attached[index] = False
+            obj = self._members[index]
+            super().remove(obj)
+            if pausers := self._pausers.get(obj):
+                pausers[0](keep_bounds)
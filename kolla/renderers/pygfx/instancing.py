@@ -0,0 +1,173 @@
+import numpy as np
+import pygfx as gfx
+
+# Matrix that collapses an instance into a single point, used for
+# unused (or invisible) instances
+HIDDEN = np.zeros((4, 4), dtype=np.float32)
+
+
+def is_instanceable(obj) -> bool:
+    """Only plain meshes with geometry and material can be instanced."""
+    return (
+        type(obj) is gfx.Mesh and obj.geometry is not None and obj.material is not None
+    )
+
+
+class InstanceBatch:
+    """
+    Collection of meshes that share the same geometry and material, which are
+    rendered as instances of a single InstancedMesh.
+    """
+
+    def __init__(self, geometry: gfx.Geometry, material: gfx.Material):
+        self.geometry = geometry
+        self.material = material
+        # The logical meshes, in order of their instance index
+        self.members: list[gfx.Mesh] = []
+        self.indices: dict[gfx.Mesh, int] = {}
+        self.event_types: set[str] = set()
+        self.mesh: gfx.InstancedMesh | None = None
+
+    def __len__(self):
+        return len(self.members)
+
+    def capacity(self) -> int:
+        return self.mesh.instance_buffer.nitems if self.mesh else 0
+
+    def allocate(self, capacity: int) -> gfx.InstancedMesh:
+        """Creates a new InstancedMesh with room for `capacity` instances."""
+        mesh = gfx.InstancedMesh(self.geometry, self.material, capacity)
+        matrices = mesh.instance_buffer.data["matrix"]
+        matrices[:] = HIDDEN
+        if self.mesh:
+            size = self.capacity()
+            matrices[:size] = self.mesh.instance_buffer.data["matrix"]
+        mesh.instance_buffer.update_range(0, capacity)
+        if self.event_types:
+            mesh.add_event_handler(self.dispatch, *self.event_types)
+        self.mesh = mesh
+        return mesh
+
+    def add(self, member: gfx.Mesh):
+        self.indices[member] = len(self.members)
+        self.members.append(member)
+
+        event_types = {key for key, val in member._event_handlers.items() if val}
+        if new_types := event_types - self.event_types:
+            self.event_types.update(new_types)
+            if self.mesh:
+                self.mesh.add_event_handler(self.dispatch, *new_types)
+
+    def remove(self, member: gfx.Mesh):
+        """Removes the member and moves the last member into its place."""
+        index = self.indices.pop(member)
+        last = self.members.pop()
+        if last is not member:
+            self.members[index] = last
+            self.indices[last] = index
+            self.update(last)
+        self.mesh.set_matrix_at(len(self.members), HIDDEN)
+
+    def update(self, member: gfx.Mesh):
+        """Writes the transform of the member into the instance buffer."""
+        matrix = member.local.matrix if member.visible else HIDDEN
+        self.mesh.set_matrix_at(self.indices[member], matrix)
+
+    def dispatch(self, event):
+        """Forward (pointer) events to the logical mesh that was picked."""
+        pick_info = getattr(event, "pick_info", None) or {}
+        index = pick_info.get("instance_index")
+        if index is not None and index < len(self.members):
+            self.members[index].handle_event(event)
+
+
+class InstanceGroup(gfx.Group):
+    """
+    Group that automatically renders its child meshes as instances.
+
+    Meshes that are added to this group and share the same geometry and
+    material are not added to the scene graph themselves, but are rendered as
+    a single InstancedMesh, which reduces the number of draw calls and
+    GPU-side objects. Events on instances are forwarded to the event handlers
+    of the (logical) mesh. Note that children of instanced meshes are not
+    rendered.
+
+    Other objects are added as regular children.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._batches: dict[tuple[int, int], InstanceBatch] = {}
+        self._instances: dict[gfx.Mesh, InstanceBatch] = {}
+
+    @property
+    def instances(self) -> list[gfx.Mesh]:
+        """The logical meshes that are rendered as instances."""
+        return list(self._instances)
+
+    def add(self, *objects, before=None, keep_world_matrix=False):
+        others = []
+        for obj in objects:
+            if is_instanceable(obj):
+                self._add_instance(obj)
+            else:
+                others.append(obj)
+
+        if others:
+            if before is not None and before not in self.children:
+                before = None
+            super().add(*others, before=before, keep_world_matrix=keep_world_matrix)
+        return self
+
+    def remove(self, *objects, keep_world_matrix=False):
+        others = []
+        for obj in objects:
+            if obj in self._instances:
+                self._remove_instance(obj)
+            else:
+                others.append(obj)
+
+        if others:
+            super().remove(*others, keep_world_matrix=keep_world_matrix)
+
+    def update_instance(self, obj: gfx.Mesh):
+        """
+        Update the instance of the given mesh after one of its attributes changed.
+        When the geometry or material changed, the mesh moves to another batch.
+        """
+        batch = self._instances[obj]
+        if batch.geometry is obj.geometry and batch.material is obj.material:
+            batch.update(obj)
+            return
+
+        self._remove_instance(obj)
+        if is_instanceable(obj):
+            self._add_instance(obj)
+        else:
+            super().add(obj)
+
+    def _add_instance(self, obj: gfx.Mesh):
+        key = (id(obj.geometry), id(obj.material))
+        if not (batch := self._batches.get(key)):
+            batch = InstanceBatch(obj.geometry, obj.material)
+            self._batches[key] = batch
+
+        batch.add(obj)
+        if len(batch) > batch.capacity():
+            previous = batch.mesh
+            mesh = batch.allocate(max(16, 2 * batch.capacity()))
+            if previous:
+                super().remove(previous)
+            super().add(mesh)
+
+        self._instances[obj] = batch
+        obj._instance_group = self
+        batch.update(obj)
+
+    def _remove_instance(self, obj: gfx.Mesh):
+        batch = self._instances.pop(obj)
+        del obj._instance_group
+        batch.remove(obj)
+        if not batch:
+            super().remove(batch.mesh)
+            del self._batches[(id(batch.geometry), id(batch.material))]
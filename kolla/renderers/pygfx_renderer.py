@@ -1,53 +1,131 @@
+import asyncio
 from typing import Callable
+from weakref import ref
 
 import pygfx as gfx
 
+from ..arrays import RawArray
 from . import Renderer
+from .pygfx.assets import Asset, AssetCache
+from .pygfx.culling import CullGroup
+from .pygfx.instancing import InstanceGroup
 
-ELEMENT_TYPE_CACHE = {}
+# Pre-populated with custom types that are provided by kolla
+ELEMENT_TYPE_CACHE = {
+    "cullgroup": CullGroup,
+    "instancegroup": InstanceGroup,
+}
 DEFAULT_ATTR_CACHE = {}
 
 
+class Changes:
+    """Summary of the changes that the renderer made to the pygfx objects."""
+
+    def __init__(self):
+        # Objects that were created, inserted into or removed from a parent
+        self.created: list[gfx.WorldObject] = []
+        self.inserted: list[gfx.WorldObject] = []
+        self.removed: list[gfx.WorldObject] = []
+        # Names of the attributes that were set (or removed) per object
+        self.attributes: dict[gfx.WorldObject, set[str]] = {}
+
+    def __repr__(self):
+        return (
+            f"<Changes(created={len(self.created)}, inserted={len(self.inserted)}, "
+            f"removed={len(self.removed)}, attributes={len(self.attributes)})>"
+        )
+
+    @property
+    def structural(self) -> bool:
+        """Whether the structure of the scene graph changed."""
+        return bool(self.created or self.inserted or self.removed)
+
+    @property
+    def objects(self) -> set[gfx.WorldObject]:
+        """All the objects that were touched."""
+        return {*self.created, *self.inserted, *self.removed, *self.attributes}
+
+
 class PygfxRenderer(Renderer):
-    """Renderer for Pygfx objects"""
+    """Renderer for Pygfx objects
+
+    Changes to the pygfx objects are collected and the on-change handlers are
+    notified only once for a whole batch of changes: once per flush of the
+    scheduler (see `Renderer.flush_method`). A different strategy (for
+    instance once per display frame) can be configured with
+    `register_request_flush`.
+    """
+
+    flush_method = "notify"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._on_change_handlers = set()
+        # Handlers, mapped to whether they want to receive the changes
+        self._on_change_handlers: dict[Callable, bool] = {}
+        self._changes = Changes()
+        # Geometries, materials and textures that are shared between elements
+        self.assets = AssetCache()
 
-    def add_on_change_handler(self, handler: Callable):
-        self._on_change_handlers.add(handler)
+    def add_on_change_handler(self, handler: Callable, *, with_changes=False):
+        """
+        Add a handler that is called after the renderer changed the pygfx objects.
+        When `with_changes` is True, the handler will be called with a `Changes`
+        object that summarizes the changes since the last notification.
+        """
+        self._on_change_handlers[handler] = with_changes
 
     def remove_on_change_handler(self, handler: Callable):
-        self._on_change_handlers.remove(handler)
+        del self._on_change_handlers[handler]
 
-    def _trigger(self):
-        for handler in self._on_change_handlers:
-            handler()
+    def notify(self):
+        """Call all the on-change handlers for the changes collected so far."""
+        if not self._flush_requested:
+            return
 
-    def register_asyncio(self):
-        import asyncio
+        changes, self._changes = self._changes, Changes()
+        self._flush_requested = False
+        for handler, with_changes in list(self._on_change_handlers.items()):
+            if with_changes:
+                handler(changes)
+            else:
+                handler()
+
+    def _trigger(self, changes: list, obj: gfx.WorldObject):
+        changes.append(obj)
+        self.request_flush()
+
+    def _trigger_attribute(self, obj: gfx.WorldObject, attr: str):
+        self._changes.attributes.setdefault(obj, set()).add(attr)
+        self.request_flush()
 
+    def register_asyncio(self):
         from PySide6.QtAsyncio import QAsyncioEventLoopPolicy
 
         policy = asyncio.get_event_loop_policy()
         if not isinstance(policy, QAsyncioEventLoopPolicy):
             asyncio.set_event_loop_policy(QAsyncioEventLoopPolicy())
 
+        super().register_asyncio()
+
+    def register_pause(self, el, pause, resume):
+        # Culled members of cull groups are paused
+        if group := getattr(el, "_cull_group", None):
+            group.register_pause(el, pause, resume)
+
     def create_element(self, type: str) -> gfx.WorldObject:
         """Create pygfx element for the given type"""
         type = type.lower().replace("-", "")
-        if element_type := ELEMENT_TYPE_CACHE.get(type):
-            self._trigger()
-            return element_type()
-
-        attrs = dir(gfx)
-        for attr in attrs:
-            if attr.lower() == type:
-                element_type = getattr(gfx, attr)
-                ELEMENT_TYPE_CACHE[type] = element_type
-                self._trigger()
-                return element_type()
+        if not (element_type := ELEMENT_TYPE_CACHE.get(type)):
+            for attr in dir(gfx):
+                if attr.lower() == type:
+                    element_type = getattr(gfx, attr)
+                    ELEMENT_TYPE_CACHE[type] = element_type
+                    break
+
+        if element_type:
+            element = element_type()
+            self._trigger(self._changes.created, element)
+            return element
 
         raise ValueError(f"Can't create element of type: {type}")
 
@@ -61,16 +139,27 @@ class PygfxRenderer(Renderer):
         anchor: gfx.WorldObject = None,
     ):
         parent.add(el, before=anchor)
-        self._trigger()
+        self._trigger(self._changes.inserted, el)
 
     def remove(self, el: gfx.WorldObject, parent: gfx.WorldObject):
         parent.remove(el)
-        self._trigger()
+        for obj in el.iter():
+            # Let go of the shared assets, so that they can be released
+            if assets := getattr(obj, "_assets", None):
+                for value in assets.values():
+                    self.assets.release(value)
+                assets.clear()
+            # Stop receiving the changes of bound arrays
+            if bindings := getattr(obj, "_array_bindings", None):
+                for name in list(bindings):
+                    self._unbind_array(obj, name)
+        self._trigger(self._changes.removed, el)
 
     def set_element_text(self, el, value: str):
         raise NotImplementedError
 
     def set_attribute(self, obj, attr, value):
+        el, name = obj, attr
         key = f"{type(obj).__name__}.{attr}"
 
         # Split the given attr on dots to allow for
@@ -87,10 +176,70 @@ class PygfxRenderer(Renderer):
                 else:
                     DEFAULT_ATTR_CACHE[key] = default_value
 
+        self._unbind_array(el, name)
+        # Acquire the new asset before releasing the previous one, so that an
+        # equal asset is not dropped from the cache and created again
+        previous = getattr(el, "_assets", {}).pop(name, None)
+        if isinstance(value, RawArray):
+            value = self._bind_array(el, name, value)
+        elif isinstance(value, Asset):
+            value = self._acquire_asset(el, name, value)
+        if previous is not None:
+            self.assets.release(previous)
+
         setattr(obj, attr, value)
-        self._trigger()
+        self._update_groups(el)
+        self._trigger_attribute(el, name)
+
+    def _update_groups(self, el: gfx.WorldObject):
+        """Let the kolla groups that manage `el` know that it has changed."""
+        if group := getattr(el, "_instance_group", None):
+            group.update_instance(el)
+        if group := getattr(el, "_cull_group", None):
+            group.update_bounds(el)
+
+    def _acquire_asset(self, el: gfx.WorldObject, name: str, value: Asset):
+        if not hasattr(el, "_assets"):
+            el._assets = {}
+        el._assets[name] = value
+        return self.assets.acquire(value)
+
+    def _release_asset(self, el: gfx.WorldObject, name: str):
+        if assets := getattr(el, "_assets", None):
+            if value := assets.pop(name, None):
+                self.assets.release(value)
+
+    def _bind_array(self, el: gfx.WorldObject, name: str, value: RawArray):
+        """
+        Wraps the array of the given RawArray in a buffer without copying it
+        and makes sure that only the dirty ranges are uploaded when the array
+        is marked as dirty.
+        """
+        buffer = gfx.Buffer(value.array)
+        weak_buffer, weak_el, weak_self = ref(buffer), ref(el), ref(self)
+
+        def update_range(start, stop):
+            buffer, el, renderer = weak_buffer(), weak_el(), weak_self()
+            if buffer is None or el is None or renderer is None:
+                value.unsubscribe(update_range)
+                return
+            buffer.update_range(start, stop - start)
+            renderer._trigger_attribute(el, name)
+
+        value.subscribe(update_range)
+        if not hasattr(el, "_array_bindings"):
+            el._array_bindings = {}
+        el._array_bindings[name] = (value, update_range)
+        return buffer
+
+    def _unbind_array(self, el: gfx.WorldObject, name: str):
+        if bindings := getattr(el, "_array_bindings", None):
+            if binding := bindings.pop(name, None):
+                value, update_range = binding
+                value.unsubscribe(update_range)
 
     def remove_attribute(self, obj, attr, value):
+        el, name = obj, attr
         key = f"{type(obj).__name__}.{attr}"
 
         # Split the given attr on dots to allow for
@@ -108,7 +257,10 @@ class PygfxRenderer(Renderer):
             setattr(obj, attr, val)
         else:
             delattr(obj, attr)
-        self._trigger()
+        self._unbind_array(el, name)
+        self._release_asset(el, name)
+        self._update_groups(el)
+        self._trigger_attribute(el, name)
 
     def add_event_listener(self, el, event_type, value):
         el.add_event_handler(value, event_type)
@@ -1,12 +1,24 @@
 from PySide6.QtWidgets import QTreeWidgetItem
 
-from .treewidgetitem import insert as item_insert, remove as item_remove
+from .treewidgetitem import (
+    insert as item_insert,
+    item_collapsed,
+    item_expanded,
+    remove as item_remove,
+)
 
 
 def insert(self, el: QTreeWidgetItem, anchor=None):
     if not isinstance(el, QTreeWidgetItem):
         raise NotImplementedError(f"No insert defined for: {type(el).__name__}")
 
+    # Connect (once) to the expand/collapse signals in order to
+    # (un)mount the children of items that are marked as `lazy`
+    if not getattr(self, "_lazy_connected", False):
+        self.itemExpanded.connect(item_expanded)
+        self.itemCollapsed.connect(item_collapsed)
+        self._lazy_connected = True
+
     root = self.invisibleRootItem()
     item_insert(root, el, anchor)
 
@@ -1,7 +1,12 @@
+from weakref import ref
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QTreeWidgetItem
 
 from .qobject import set_attribute as qobject_set_attribute
 
+ChildIndicatorPolicy = QTreeWidgetItem.ChildIndicatorPolicy
+
 
 def insert(self, el: QTreeWidgetItem, anchor=None):
     if not isinstance(el, QTreeWidgetItem):
@@ -49,3 +54,66 @@ def set_attribute(self, attr, value):
         return
 
     qobject_set_attribute(self, attr, value)
+
+
+def defer_children(self, mount, unmount):
+    """
+    Postpone mounting the children of items that have the `lazy` attribute set
+    until the item is expanded for the first time. The item will show an expand
+    indicator, even though it does not have any children yet.
+    When the item also has an `unload_timeout` attribute (in ms), the children
+    will be unmounted again when the item stays collapsed for that long.
+    """
+    if not getattr(self, "lazy", False) or self.isExpanded():
+        return False
+
+    self._mount_children = mount
+    self._unmount_children = unmount
+    self._children_mounted = False
+    self.setChildIndicatorPolicy(ChildIndicatorPolicy.ShowIndicator)
+    return True
+
+
+def item_expanded(item):
+    """Mounts the deferred children of `item` (if any)."""
+    if timer := getattr(item, "_unload_timer", None):
+        timer.stop()
+
+    if not hasattr(item, "_mount_children") or item._children_mounted:
+        return
+
+    item._children_mounted = True
+    item._mount_children()
+    item.setChildIndicatorPolicy(ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+
+
+def item_collapsed(item):
+    """Schedules the unmounting of the deferred children of `item` (if any)."""
+    timeout = getattr(item, "unload_timeout", None)
+    if timeout is None or not getattr(item, "_children_mounted", False):
+        return
+
+    if not (timer := getattr(item, "_unload_timer", None)):
+        # Use a weak ref to prevent a cycle between the item and the timer
+        weak_item = ref(item)
+
+        def timeout_reached():
+            if item := weak_item():
+                unload_children(item)
+
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(timeout_reached)
+        item._unload_timer = timer
+
+    timer.start(timeout)
+
+
+def unload_children(item):
+    """Unmounts the deferred children of `item` if it is (still) collapsed."""
+    if item.isExpanded() or not getattr(item, "_children_mounted", False):
+        return
+
+    item._children_mounted = False
+    item._unmount_children()
+    item.setChildIndicatorPolicy(ChildIndicatorPolicy.ShowIndicator)
@@ -1,8 +1,10 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
 import logging
 from typing import Any, Callable
+from weakref import WeakSet
 
 from PySide6 import QtCore, QtGui, QtWidgets
+import shiboken6
 
 from kolla.types import EventLoopType
 from . import Renderer
@@ -142,6 +144,8 @@ class PySideRenderer(Renderer):
     def __init__(self, autoshow=True):
         super().__init__()
         self.autoshow = autoshow
+        # Weak set of all QObject elements created by this renderer
+        self._objects = WeakSet()
 
     def preferred_event_loop_type(self):
         return EventLoopType.DEFAULT
@@ -176,7 +180,7 @@ class PySideRenderer(Renderer):
         # The generated types are cached in WRAPPED_TYPES so they only have
         # to be generated once and can be used in equality comparisons
         if type_name in WRAPPED_TYPES:
-            return create_instance(WRAPPED_TYPES[type_name])
+            return self._track(create_instance(WRAPPED_TYPES[type_name]))
 
         original_type = name_to_type(type_name)
 
@@ -200,11 +204,34 @@ class PySideRenderer(Renderer):
         # Update the default arguments map with the new wrapped type
         DEFAULT_ARGS[wrapped_type] = DEFAULT_ARGS.get(original_type, ((), {}))
 
-        return create_instance(WRAPPED_TYPES[type_name])
+        return self._track(create_instance(WRAPPED_TYPES[type_name]))
+
+    def _track(self, el: Any) -> Any:
+        if isinstance(el, QtCore.QObject):
+            self._objects.add(el)
+        return el
+
+    def live_objects(self) -> Counter:
+        """
+        Returns the number of QObject elements, created by this renderer, for
+        which the underlying C++ object still exists, counted per element type.
+        """
+        return Counter(
+            type(el).__name__ for el in list(self._objects) if shiboken6.isValid(el)
+        )
 
     def create_text_element(self):
         raise NotImplementedError
 
+    def defer_children(self, el: Any, mount: Callable, unmount: Callable) -> bool:
+        """
+        Tree widget items with the `lazy` attribute only get their children
+        mounted when they are expanded.
+        """
+        if isinstance(el, QtWidgets.QTreeWidgetItem):
+            return treewidgetitem.defer_children(el, mount, unmount)
+        return False
+
     def insert(self, el: Any, parent: Any, anchor: Any = None):
         """
         Add element `el` as a child to the element `parent`.
@@ -234,17 +261,43 @@ class PySideRenderer(Renderer):
         """Remove the element `el` from the children of the element `parent`."""
         if isinstance(parent, QtWidgets.QApplication):
             el.close()
-            return
-
-        if isinstance(el, QtWidgets.QDialog):
+        elif isinstance(el, QtWidgets.QDialog):
             # Hide the dialog to make sure it's not visible anymore
             el.hide()
-            # Then mark the element for deletion, so that it won't trigger
-            # any of 'finished', 'done', 'rejected', 'accepted' signals.
-            el.deleteLater()
-            return
+        else:
+            parent.remove(el)
 
-        parent.remove(el)
+        # Removed elements are never inserted again, so destroy the element
+        # right away instead of waiting for the Python wrapper to be collected.
+        # For dialogs this also makes sure that it won't trigger any of the
+        # 'finished', 'done', 'rejected', 'accepted' signals.
+        self.destroy(el)
+
+    def destroy(self, el: Any):
+        """
+        Disconnects all slots and event filters that were added to the element
+        `el` and schedules the element for deletion (when it is a QObject).
+        """
+        # The element might already be deleted, for instance when removing
+        # a row from a QFormLayout
+        valid = shiboken6.isValid(el)
+
+        if slots := getattr(el, "slots", None):
+            if valid:
+                for event_type, event_slots in slots.items():
+                    signal = getattr(el, camel_case(event_type, "_"))
+                    for slot in event_slots:
+                        signal.disconnect(slot)
+            del el.slots
+
+        if event_filter := getattr(el, "_event_filter", None):
+            if valid:
+                el.removeEventFilter(event_filter)
+            event_filter.deleteLater()
+            del el._event_filter
+
+        if valid and isinstance(el, QtCore.QObject):
+            el.deleteLater()
 
     def set_element_text(self, el: Any, value: str):
         raise NotImplementedError
@@ -0,0 +1,436 @@
+"""
+Renderer that runs in a worker process and streams its operations to a host
+process, which applies them to a real renderer (for instance a
+PySideRenderer). This moves the component logic off the GIL of the UI process.
+
+The operations are encoded in a compact binary format and sent in batches
+over a connection (such as one end of a `multiprocessing.Pipe`), using
+`send_bytes` and `recv_bytes`. Events are sent back from the host to the
+worker over the same connection.
+
+Worker process:
+
+    async def main():
+        renderer = RemoteRenderer(connection)
+        gui = Kolla(renderer)
+        gui.render(App, renderer.root, state=state)
+        await renderer.serve_async()
+
+    asyncio.run(main())
+
+Host process:
+
+    host = RemoteHost(PySideRenderer(), window, connection)
+    # Call regularly, for instance from a timer
+    host.poll()
+
+Use `start_worker` to do all of the above for the worker in a new process.
+"""
+
+from __future__ import annotations
+
+import pickle
+import struct
+from collections.abc import Callable
+from typing import Any
+
+from . import Renderer
+
+# Operations from the worker to the host
+OP_STRING = 0  # index, string: add a string to the string table
+OP_CREATE = 1  # id, type (string index)
+OP_CREATE_TEXT = 2  # id
+OP_INSERT = 3  # id, parent id, anchor id (0 for no anchor)
+OP_REMOVE = 4  # id, parent id
+OP_SET_TEXT = 5  # id, value
+OP_SET_ATTRIBUTE = 6  # id, attr (string index), value
+OP_REMOVE_ATTRIBUTE = 7  # id, attr (string index)
+OP_ADD_LISTENER = 8  # id, event type (string index), handler id
+OP_REMOVE_LISTENER = 9  # id, event type (string index), handler id
+
+# Tags of encoded values
+VALUE_NONE = 0
+VALUE_FALSE = 1
+VALUE_TRUE = 2
+VALUE_INT = 3
+VALUE_FLOAT = 4
+VALUE_STR = 5
+VALUE_PICKLE = 6
+
+OP = struct.Struct("<B")
+OP_1 = struct.Struct("<BI")
+OP_2 = struct.Struct("<BII")
+OP_3 = struct.Struct("<BIII")
+INT = struct.Struct("<Bq")
+FLOAT = struct.Struct("<Bd")
+SIZED = struct.Struct("<BI")
+SIZE = struct.Struct("<I")
+EVENT = struct.Struct("<I")
+
+# Id of the element that represents the render target on the host
+ROOT = 0
+
+
+def encode_value(buffer: bytearray, value: Any):
+    """Append the encoded value to the buffer."""
+    if value is None:
+        buffer += OP.pack(VALUE_NONE)
+    elif value is True:
+        buffer += OP.pack(VALUE_TRUE)
+    elif value is False:
+        buffer += OP.pack(VALUE_FALSE)
+    elif type(value) is int and -(2**63) <= value < 2**63:
+        buffer += INT.pack(VALUE_INT, value)
+    elif type(value) is float:
+        buffer += FLOAT.pack(VALUE_FLOAT, value)
+    elif type(value) is str:
+        data = value.encode()
+        buffer += SIZED.pack(VALUE_STR, len(data))
+        buffer += data
+    else:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        buffer += SIZED.pack(VALUE_PICKLE, len(data))
+        buffer += data
+
+
+def decode_value(data: memoryview, offset: int) -> tuple[Any, int]:
+    """Returns the value that is encoded at the offset and the next offset."""
+    tag = data[offset]
+    if tag == VALUE_NONE:
+        return None, offset + 1
+    if tag == VALUE_TRUE:
+        return True, offset + 1
+    if tag == VALUE_FALSE:
+        return False, offset + 1
+    if tag == VALUE_INT:
+        return INT.unpack_from(data, offset)[1], offset + INT.size
+    if tag == VALUE_FLOAT:
+        return FLOAT.unpack_from(data, offset)[1], offset + FLOAT.size
+    size = SIZED.unpack_from(data, offset)[1]
+    start = offset + SIZED.size
+    end = start + size
+    if tag == VALUE_STR:
+        return str(data[start:end], "utf-8"), end
+    if tag == VALUE_PICKLE:
+        return pickle.loads(data[start:end]), end
+    raise ValueError(f"Unknown value tag: {tag}")
+
+
+class RemoteElement:
+    """Handle of an element in the host process."""
+
+    __slots__ = ("__weakref__", "id", "listeners", "type")
+
+    def __init__(self, id: int, type: str | None):
+        self.id = id
+        self.type = type
+        # Handler ids of the event listeners of this element
+        self.listeners: dict[tuple[str, Callable], int] = {}
+
+    def __repr__(self):
+        return f"<RemoteElement({self.id}, {self.type})>"
+
+
+class RemoteRenderer(Renderer):
+    """
+    Renderer that encodes all operations and sends them in batches over the
+    connection to a `RemoteHost`. Render into `root`, which represents the
+    target that the host renders into.
+
+    The operations are collected until `send` is called, which happens once
+    per flush of the scheduler (see `Renderer.flush_method`). A different
+    strategy can be configured with `register_request_flush`.
+    """
+
+    flush_method = "send"
+
+    def __init__(self, connection):
+        super().__init__()
+        self.connection = connection
+        self.root = RemoteElement(ROOT, None)
+        self._next_id = ROOT + 1
+        self._strings: dict[str, int] = {}
+        self._buffer = bytearray()
+        # Event handlers by handler id
+        self._handlers: dict[int, Callable] = {}
+        self._next_handler_id = 1
+        # Number of sent batches and bytes
+        self.batches = 0
+        self.bytes = 0
+
+    def send(self):
+        """Send all the operations that were collected so far as one batch."""
+        self._flush_requested = False
+        if not self._buffer:
+            return
+        data, self._buffer = self._buffer, bytearray()
+        self.connection.send_bytes(data)
+        self.batches += 1
+        self.bytes += len(data)
+
+    def dispatch(self, data: bytes):
+        """Call the event handler for an event message of the host."""
+        handler_id = EVENT.unpack_from(data)[0]
+        if handler := self._handlers.get(handler_id):
+            handler(*pickle.loads(memoryview(data)[EVENT.size :]))
+
+    async def serve_async(self):
+        """
+        Handle the events of the host on the asyncio event loop until the
+        connection is closed. The connection is read in a thread, so that the
+        event loop keeps running: changes that don't result from an event
+        (such as timers, the jobs of `Component.run_in_executor` and the
+        updates of a `StateChannel`) are sent after every flush of the
+        scheduler as well.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                data = await loop.run_in_executor(None, self.connection.recv_bytes)
+            except EOFError:
+                return
+            self.dispatch(data)
+
+    def serve(self):
+        """
+        Send the pending operations and handle the events of the host until
+        the connection is closed, for the SYNC event loop type. Sends the
+        resulting operations after every event. Only changes that result from
+        events are sent while waiting for the next event, see `serve_async`.
+        """
+        self.send()
+        while True:
+            try:
+                data = self.connection.recv_bytes()
+            except EOFError:
+                return
+            self.dispatch(data)
+            self.send()
+
+    def _write(self, data: bytes):
+        self._buffer += data
+        self.request_flush()
+
+    def _string(self, value: str) -> int:
+        if (index := self._strings.get(value)) is None:
+            index = self._strings[value] = len(self._strings)
+            data = value.encode()
+            self._write(OP_2.pack(OP_STRING, index, len(data)) + data)
+        return index
+
+    def _element(self, type: str | None) -> RemoteElement:
+        el = RemoteElement(self._next_id, type)
+        self._next_id += 1
+        return el
+
+    def create_element(self, type: str) -> RemoteElement:
+        el = self._element(type)
+        self._write(OP_2.pack(OP_CREATE, el.id, self._string(type)))
+        return el
+
+    def create_text_element(self) -> RemoteElement:
+        el = self._element(None)
+        self._write(OP_1.pack(OP_CREATE_TEXT, el.id))
+        return el
+
+    def insert(self, el: RemoteElement, parent: RemoteElement, anchor=None):
+        anchor_id = anchor.id if anchor is not None else ROOT
+        self._write(OP_3.pack(OP_INSERT, el.id, parent.id, anchor_id))
+
+    def remove(self, el: RemoteElement, parent: RemoteElement):
+        # Removed elements are not used anymore, so the host can forget them
+        for handler_id in el.listeners.values():
+            del self._handlers[handler_id]
+        el.listeners.clear()
+        self._write(OP_2.pack(OP_REMOVE, el.id, parent.id))
+
+    def set_element_text(self, el: RemoteElement, value: str):
+        buffer = bytearray(OP_1.pack(OP_SET_TEXT, el.id))
+        encode_value(buffer, value)
+        self._write(buffer)
+
+    def set_attribute(self, el: RemoteElement, attr: str, value: Any):
+        buffer = bytearray(OP_2.pack(OP_SET_ATTRIBUTE, el.id, self._string(attr)))
+        encode_value(buffer, value)
+        self._write(buffer)
+
+    def remove_attribute(self, el: RemoteElement, attr: str, value: Any):
+        self._write(OP_2.pack(OP_REMOVE_ATTRIBUTE, el.id, self._string(attr)))
+
+    def add_event_listener(self, el: RemoteElement, event_type: str, value: Callable):
+        handler_id = self._next_handler_id
+        self._next_handler_id += 1
+        self._handlers[handler_id] = value
+        el.listeners[(event_type, value)] = handler_id
+        event = self._string(event_type)
+        self._write(OP_3.pack(OP_ADD_LISTENER, el.id, event, handler_id))
+
+    def remove_event_listener(
+        self, el: RemoteElement, event_type: str, value: Callable
+    ):
+        handler_id = el.listeners.pop((event_type, value))
+        del self._handlers[handler_id]
+        event = self._string(event_type)
+        self._write(OP_3.pack(OP_REMOVE_LISTENER, el.id, event, handler_id))
+
+
+def portable(value: Any) -> Any:
+    """
+    Returns the value if it can be sent to another process, otherwise None.
+    Event arguments such as Qt events can't be sent.
+    """
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return None
+    return value
+
+
+class RemoteHost:
+    """
+    Applies the operations of a `RemoteRenderer` to the given renderer,
+    rendering into `target`, and sends the events of the elements back.
+    """
+
+    def __init__(self, renderer: Renderer, target: Any, connection):
+        self.renderer = renderer
+        self.connection = connection
+        self.elements: dict[int, Any] = {ROOT: target}
+        self._strings: list[str] = []
+        self._listeners: dict[int, Callable] = {}
+        # Handler ids of the listeners per element id
+        self._element_listeners: dict[int, list[int]] = {}
+        # Number of applied batches and operations
+        self.batches = 0
+        self.operations = 0
+
+    def poll(self, timeout: float | None = 0) -> int:
+        """
+        Apply all batches that are available (waiting at most `timeout`
+        seconds for the first one). Returns the number of applied batches.
+        Raises EOFError when the worker has closed the connection.
+        """
+        count = 0
+        while self.connection.poll(timeout if count == 0 else 0):
+            self.apply(self.connection.recv_bytes())
+            count += 1
+        return count
+
+    def apply(self, data: bytes):
+        """Apply a batch of operations."""
+        data = memoryview(data)
+        renderer = self.renderer
+        elements = self.elements
+        strings = self._strings
+        offset = 0
+        end = len(data)
+        operations = 0
+        while offset < end:
+            op = data[offset]
+            operations += 1
+            if op == OP_SET_ATTRIBUTE:
+                _, el_id, attr = OP_2.unpack_from(data, offset)
+                value, offset = decode_value(data, offset + OP_2.size)
+                renderer.set_attribute(elements[el_id], strings[attr], value)
+            elif op == OP_SET_TEXT:
+                _, el_id = OP_1.unpack_from(data, offset)
+                value, offset = decode_value(data, offset + OP_1.size)
+                renderer.set_element_text(elements[el_id], value)
+            elif op == OP_CREATE:
+                _, el_id, type = OP_2.unpack_from(data, offset)
+                offset += OP_2.size
+                elements[el_id] = renderer.create_element(strings[type])
+            elif op == OP_CREATE_TEXT:
+                _, el_id = OP_1.unpack_from(data, offset)
+                offset += OP_1.size
+                elements[el_id] = renderer.create_text_element()
+            elif op == OP_INSERT:
+                _, el_id, parent_id, anchor_id = OP_3.unpack_from(data, offset)
+                offset += OP_3.size
+                anchor = elements[anchor_id] if anchor_id != ROOT else None
+                renderer.insert(elements[el_id], elements[parent_id], anchor)
+            elif op == OP_REMOVE:
+                _, el_id, parent_id = OP_2.unpack_from(data, offset)
+                offset += OP_2.size
+                el = elements.pop(el_id)
+                renderer.remove(el, elements[parent_id])
+                # The worker has forgotten the handlers of removed elements
+                for handler_id in self._element_listeners.pop(el_id, ()):
+                    del self._listeners[handler_id]
+            elif op == OP_REMOVE_ATTRIBUTE:
+                _, el_id, attr = OP_2.unpack_from(data, offset)
+                offset += OP_2.size
+                renderer.remove_attribute(elements[el_id], strings[attr], None)
+            elif op == OP_ADD_LISTENER:
+                _, el_id, event, handler_id = OP_3.unpack_from(data, offset)
+                offset += OP_3.size
+                listener = self._listener(handler_id)
+                self._listeners[handler_id] = listener
+                self._element_listeners.setdefault(el_id, []).append(handler_id)
+                renderer.add_event_listener(elements[el_id], strings[event], listener)
+            elif op == OP_REMOVE_LISTENER:
+                _, el_id, event, handler_id = OP_3.unpack_from(data, offset)
+                offset += OP_3.size
+                listener = self._listeners.pop(handler_id)
+                self._element_listeners[el_id].remove(handler_id)
+                renderer.remove_event_listener(
+                    elements[el_id], strings[event], listener
+                )
+            elif op == OP_STRING:
+                _, index, size = OP_2.unpack_from(data, offset)
+                offset += OP_2.size
+                strings.append(str(data[offset : offset + size], "utf-8"))
+                assert len(strings) == index + 1
+                offset += size
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+        self.batches += 1
+        self.operations += operations
+
+    def _listener(self, handler_id: int) -> Callable:
+        def listener(*args):
+            args = tuple(portable(arg) for arg in args)
+            self.connection.send_bytes(EVENT.pack(handler_id) + pickle.dumps(args))
+
+        return listener
+
+
+def _run_worker(connection, factory: Callable[[], tuple[type, Any]]):
+    import asyncio
+
+    from kolla import Kolla
+
+    async def main():
+        renderer = RemoteRenderer(connection)
+        gui = Kolla(renderer)
+        component, state = factory()
+        gui.render(component, renderer.root, state=state)
+        await renderer.serve_async()
+
+    try:
+        asyncio.run(main())
+    finally:
+        connection.close()
+
+
+def start_worker(factory: Callable[[], tuple[type, Any]], context: str = "spawn"):
+    """
+    Start a worker process that renders the component with a
+    `RemoteRenderer`. The factory is called in the worker process and should
+    return the component class and the state. It has to be picklable (for
+    instance a function at module level). Returns the process and the
+    connection to pass to a `RemoteHost`. Close the connection to stop the
+    worker.
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context(context)
+    host_connection, worker_connection = ctx.Pipe()
+    process = ctx.Process(
+        target=_run_worker, args=(worker_connection, factory), daemon=True
+    )
+    process.start()
+    worker_connection.close()
+    return process, host_connection
@@ -1,6 +1,8 @@
 import ast
+import builtins
 import logging
 from collections import defaultdict
+from itertools import count
 from os import environ
 from pathlib import Path
 
@@ -25,7 +27,7 @@ SUFFIX = "cgx"
 DEBUG = bool(environ.get("KOLLA_DEBUG", False))
 
 
-def load(path):
+def load(path, namespace=None):
     """
     Loads and returns a component from a .cgx file.
 
@@ -53,7 +55,7 @@ def load(path):
     """
     template = path.read_text()
 
-    return load_from_string(template, path)
+    return load_from_string(template, path, namespace=namespace)
 
 
 def load_from_string(template, path=None, namespace=None):
@@ -134,7 +136,7 @@ def construct_ast(path, template=None):
     render_tree = create_kolla_render_function(
         parser.root, names=imported_names.names | class_names
     )
-    ast.fix_missing_locations(render_tree)
+    eliminate_common_subexpressions(render_tree, imported_names.names | class_names)
 
     if DEBUG:
         try:
@@ -143,13 +145,15 @@ def construct_ast(path, template=None):
         except Exception as e:
             logger.warning("Could not unparse AST", exc_info=e)
 
-    # Put location of render function outside of the script tag
-    # This makes sure that the render function can be excluded
-    # from linting.
+    # The statements for the template nodes have the location of those nodes
+    # (see `located`). Put the location of the render function itself (and
+    # the statements that don't belong to a node) outside of the script tag.
+    # This makes sure that the render function can be excluded from linting.
     # Note that it's still possible to put code after the component
     # class at the end of the script node.
     line, _ = script_node.end
-    ast.increment_lineno(render_tree, n=line)
+    located(render_tree, (line, 0), recursive=False)
+    ast.fix_missing_locations(render_tree)
     component_def.body.append(render_tree)
 
     # Because we modified the AST significantly we need to call an AST
@@ -158,6 +162,38 @@ def construct_ast(path, template=None):
     return script_tree, component_def.name
 
 
+def dump_render_function(path, template=None) -> str:
+    """
+    Returns the code of the generated render function of the .cgx file, where
+    every line is prefixed with the line of the template that it was generated
+    from. Handy for debugging the compiler, and for reading tracebacks and
+    profiles of the render function.
+    """
+    tree, name = construct_ast(path, template=template)
+    component_def = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == name
+    )
+    render_tree = component_def.body[-1]
+
+    lines: list[tuple[int, str]] = []
+
+    def dump(statement: ast.stmt, indent: str):
+        if isinstance(statement, ast.FunctionDef):
+            header = ast.unparse(statement).splitlines()[0]
+            lines.append((statement.lineno, indent + header))
+            for child in statement.body:
+                dump(child, indent + "    ")
+        else:
+            for line in ast.unparse(statement).splitlines():
+                lines.append((statement.lineno, indent + line))
+
+    dump(render_tree, "")
+    width = len(str(max(lineno for lineno, _ in lines)))
+    return "\n".join(f"{lineno:>{width}} | {line}" for lineno, line in lines)
+
+
 def get_script_ast(parser: KollaParser, path: Path) -> ast.Module:
     """
     Returns the AST created from the script tag in the .cgx file.
@@ -391,6 +427,32 @@ def safe_tag(tag):
     return tag.replace("-", "_")
 
 
+def located(
+    node: ast.AST,
+    location: tuple[int, int] | None,
+    length: int = 0,
+    recursive: bool = True,
+) -> ast.AST:
+    """
+    Set the location of the node (and all its descendants) to the location
+    (line, column) in the template that spans `length` characters, so that
+    tracebacks and profilers point to the template.
+    """
+    if location is None:
+        return node
+    line, column = location
+    for child in ast.walk(node) if recursive else (node,):
+        if "lineno" in child._attributes:
+            child.lineno, child.col_offset = line, column
+            child.end_lineno, child.end_col_offset = line, column + length
+    return node
+
+
+def attribute_location(node: Node, key: str) -> tuple[int, int] | None:
+    """Returns the location of the attribute of the node in the template."""
+    return node.attr_locations.get(key.lower(), node.location)
+
+
 def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef:
     body: list[ast.stmt] = []
     body.append(
@@ -440,6 +502,7 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
         targets: ast.Name | ast.Tuple,
         names: set,
         list_names: list[dict[str, set[str]]],
+        location: tuple[int, int] | None,
     ):
         tag = safe_tag(node.tag)
         fragment_name = f"{tag}{counter[tag]}"
@@ -515,6 +578,10 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
             decorator_list=[],
             returns=None,
         )
+        # The statements of the children are located already
+        located(function, location, recursive=False)
+        located(computed_unpacked_dict, location)
+        located(return_stmt, location)
 
         return function_name, function
 
@@ -555,11 +622,16 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
                     node_with_list_expression = True
                     # Special v-for node!
                     expression = child.attrs[key]
+                    location = attribute_location(child, key)
                     name = f"list{counter['list']}"
                     counter["list"] += 1
                     # Reset any control flow that came before
                     control_flow_parent = None
-                    result.append(ast_create_list_fragment(name, parent))
+                    result.append(
+                        located(
+                            ast_create_list_fragment(name, parent), location, len(key)
+                        )
+                    )
                     expr = f"[None for {expression}]"
                     expression_ast = ast.parse(expr).body[0].value
                     targets: ast.Name | ast.Tuple = expression_ast.generators[0].target
@@ -578,28 +650,25 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
                     (
                         create_frag_func_name,
                         create_frag_function,
-                    ) = create_fragments_function(child, targets, names, list_names)
+                    ) = create_fragments_function(
+                        child, targets, names, list_names, location
+                    )
                     is_keyed = ":key" in child.attrs
                     result.append(create_frag_function)
-                    result.append(
-                        ast.Expr(
-                            value=ast.Call(
-                                func=ast.Attribute(
-                                    value=ast.Name(id=name, ctx=ast.Load()),
-                                    attr="set_create_fragment",
-                                    ctx=ast.Load(),
-                                ),
-                                args=[
-                                    ast.Name(id=create_frag_func_name, ctx=ast.Load())
-                                ],
-                                keywords=[
-                                    ast.keyword(
-                                        "is_keyed", ast.Constant(value=is_keyed)
-                                    )
-                                ],
-                            )
+                    set_create_fragment = ast.Expr(
+                        value=ast.Call(
+                            func=ast.Attribute(
+                                value=ast.Name(id=name, ctx=ast.Load()),
+                                attr="set_create_fragment",
+                                ctx=ast.Load(),
+                            ),
+                            args=[ast.Name(id=create_frag_func_name, ctx=ast.Load())],
+                            keywords=[
+                                ast.keyword("is_keyed", ast.Constant(value=is_keyed))
+                            ],
                         )
                     )
+                    result.append(located(set_create_fragment, location, len(key)))
 
                     iterator_fn = ast.Lambda(
                         args=ast.arguments(
@@ -612,19 +681,18 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
                         body=iterator,
                     )
 
-                    result.append(
-                        ast.Expr(
-                            value=ast.Call(
-                                func=ast.Attribute(
-                                    value=ast.Name(id=name, ctx=ast.Load()),
-                                    attr="set_expression",
-                                    ctx=ast.Load(),
-                                ),
-                                args=[iterator_fn],
-                                keywords=[],
-                            )
+                    set_expression = ast.Expr(
+                        value=ast.Call(
+                            func=ast.Attribute(
+                                value=ast.Name(id=name, ctx=ast.Load()),
+                                attr="set_expression",
+                                ctx=ast.Load(),
+                            ),
+                            args=[iterator_fn],
+                            keywords=[],
                         )
                     )
+                    result.append(located(set_expression, location, len(key)))
                     break
 
             if node_with_list_expression:
@@ -640,24 +708,32 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
 
             added_slot_name = False
             for key, value in child.attrs.items():
+                # Statements for the attribute point to the attribute
+                location = attribute_location(child, key)
                 if not is_directive(key):
-                    attributes.append(ast_set_attribute(el, key, value))
+                    statement = ast_set_attribute(el, key, value)
+                    attributes.append(located(statement, location, len(key)))
                 elif key.startswith((DIRECTIVE_BIND, ":")):
                     if key == DIRECTIVE_BIND:
-                        binds.append(ast_set_bind_dict(el, value, names, list_names))
+                        statement = ast_set_bind_dict(el, value, names, list_names)
                     elif key == ":is" and el.startswith("component"):
-                        binds.append(ast_set_dynamic_type(el, value, names, list_names))
+                        statement = ast_set_dynamic_type(el, value, names, list_names)
                     else:
-                        binds.append(ast_set_bind(el, key, value, names, list_names))
+                        statement = ast_set_bind(el, key, value, names, list_names)
+                    binds.append(located(statement, location, len(key)))
                 elif key.startswith((DIRECTIVE_ON, "@")):
-                    events.append(ast_set_event(el, key, value, names, list_names))
+                    statement = ast_set_event(el, key, value, names, list_names)
+                    events.append(located(statement, location, len(key)))
                 elif key == DIRECTIVE_IF:
                     assert control_flow_parent is not None
                     assert target is not None
-                    result.append(ast_create_control_flow(control_flow_parent, target))
+                    statement = ast_create_control_flow(control_flow_parent, target)
+                    result.append(located(statement, location, len(key)))
                     condition = ast_set_condition(el, value, names, list_names)
+                    located(condition, location, len(key))
                 elif key == DIRECTIVE_ELSE_IF:
                     condition = ast_set_condition(el, value, names, list_names)
+                    located(condition, location, len(key))
                 elif key == DIRECTIVE_ELSE:
                     pass
                 elif key.startswith((DIRECTIVE_SLOT, "#")):
@@ -668,7 +744,8 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
                         _, slot_name = key.split(":")
                     elif key.startswith("#"):
                         _, slot_name = key.split("#")
-                    attributes.append(ast_set_slot_name(el, slot_name))
+                    statement = ast_set_slot_name(el, slot_name)
+                    attributes.append(located(statement, location, len(key)))
                     added_slot_name = True
                 elif key == DIRECTIVE_FOR:
                     pass
@@ -683,15 +760,20 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
                     # TODO: come up with a more solid solution for figuring out
                     # whether the parent is a component
                     if parent_node.tag and parent_node.tag[0].isupper():
-                        attributes.append(ast_set_slot_name(el, "default"))
+                        statement = ast_set_slot_name(el, "default")
+                        attributes.append(located(statement, child.location))
 
             result.append(
-                ast_create_fragment(
-                    el,
-                    child.tag,
-                    is_component=child.tag in names,
-                    parent=control_flow_parent or parent,
-                    node=child,
+                located(
+                    ast_create_fragment(
+                        el,
+                        child.tag,
+                        is_component=child.tag in names,
+                        parent=control_flow_parent or parent,
+                        node=child,
+                    ),
+                    child.location,
+                    len(child.tag) + 1,
                 )
             )
             if condition:
@@ -722,6 +804,346 @@ def create_kolla_render_function(node: Node, names: set[str]) -> ast.FunctionDef
     )
 
 
+# Methods of fragments that take the expression of a binding
+BINDING_METHODS = {
+    "set_bind",
+    "set_bind_dict",
+    "set_condition",
+    "set_expression",
+    "set_type",
+}
+# Prefix of the names of the computed values that are shared between bindings
+SHARED_PREFIX = "_shared"
+# Minimal cost (see `collect_subexpressions`) of an expression to be shared
+SHARED_MIN_COST = 2
+# Expressions that cost something to evaluate, apart from calls and f-strings
+COSTLY_EXPRESSIONS = (
+    ast.Subscript,
+    ast.Attribute,
+    ast.BinOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.UnaryOp,
+    ast.IfExp,
+)
+# Expressions that introduce their own scope (or otherwise can't be moved)
+UNMOVABLE_EXPRESSIONS = (
+    ast.Lambda,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.NamedExpr,
+    ast.Await,
+    ast.Yield,
+    ast.YieldFrom,
+    ast.Starred,
+)
+# Builtins without side effects that return a new (immutable) value every
+# time, calls to other functions and methods are never shared since they
+# might not be pure (e.g. `random()`) or depend on state that is not reactive
+PURE_BUILTINS = {
+    "abs",
+    "bool",
+    "chr",
+    "divmod",
+    "float",
+    "format",
+    "frozenset",
+    "int",
+    "len",
+    "max",
+    "min",
+    "ord",
+    "pow",
+    "repr",
+    "round",
+    "str",
+    "sum",
+    "tuple",
+}
+BUILTIN_NAMES = set(vars(builtins))
+
+
+def eliminate_common_subexpressions(render_tree: ast.FunctionDef, names: set[str]):
+    """
+    Moves pure sub-expressions that occur in multiple bindings of the
+    template into shared computed values, so that they are evaluated once
+    per change instead of once per binding. Sub-expressions within v-for
+    items that don't depend on the item are shared between all items as well,
+    as long as they occur in multiple bindings.
+
+    Only sub-expressions that are more expensive than looking up a variable
+    and that only call pure builtins are shared (see `collect_subexpressions`).
+    Expressions are moved to the outermost function (the render function or
+    the function that creates the fragment of a v-for item) in which all
+    their names are defined.
+    """
+    shared_names = count()
+    allowed = {"self", "globals"} | BUILTIN_NAMES | names
+    # Builtins can be shadowed by imports
+    pure = PURE_BUILTINS - names
+    # The sub-expressions per binding, which are collected again only when
+    # the binding has changed
+    collected: dict[ast.Lambda, list[tuple[tuple, int, ast.expr]]] = {}
+
+    def subexpressions(lambda_: ast.Lambda):
+        if (found := collected.get(lambda_)) is None:
+            found = collected[lambda_] = []
+            collect_subexpressions(lambda_.body, found, pure)
+        return found
+
+    # The names that are used by each sub-expression
+    used_names: dict[tuple, set[str]] = {}
+
+    def eliminate(function: ast.FunctionDef, allowed: set[str]):
+        body = function.body
+        # Statements that should precede the shared values
+        index = 0
+        while index < len(body) and (
+            isinstance(body[index], (ast.Import, ast.ImportFrom))
+            or (
+                isinstance(body[index], ast.FunctionDef)
+                and body[index].name.startswith("unpacked")
+            )
+        ):
+            allowed = allowed | {getattr(body[index], "name", "")}
+            index += 1
+        functions = [
+            statement
+            for statement in body[index:]
+            if isinstance(statement, ast.FunctionDef)
+        ]
+        # Bindings of this function, and those of the functions that create
+        # the fragments of v-for items (which are evaluated for every item)
+        own_bindings = [
+            binding for statement in body[index:] for binding in bindings(statement)
+        ]
+        items_bindings = [
+            binding
+            for item_function in functions
+            for binding in item_bindings(item_function)
+        ]
+        lambdas = [lambda_ for _, lambda_ in (*own_bindings, *items_bindings)]
+        # The values of v-for expressions are iterated, which exhausts iterators
+        iterated = {
+            lambda_
+            for method, lambda_ in (*own_bindings, *items_bindings)
+            if method == "set_expression"
+        }
+
+        definitions: list[ast.stmt] = []
+        while True:
+            # Number of bindings that use the sub-expressions, where repeats
+            # within a single binding don't count
+            occurrences: dict[tuple, list[tuple[ast.Lambda, ast.expr]]] = {}
+            users: dict[tuple, int] = defaultdict(int)
+            sizes: dict[tuple, int] = {}
+            for lambda_ in lambdas:
+                used: set[tuple] = set()
+                for key, size, node in subexpressions(lambda_):
+                    if lambda_ in iterated and node is lambda_.body:
+                        continue
+                    occurrences.setdefault(key, []).append((lambda_, node))
+                    if key not in used:
+                        used.add(key)
+                        users[key] += 1
+                    sizes[key] = size
+
+            candidates = []
+            for key, found_nodes in occurrences.items():
+                if users[key] < 2:
+                    continue
+                if (names := used_names.get(key)) is None:
+                    names = used_names[key] = {
+                        node.id
+                        for node in ast.walk(found_nodes[0][1])
+                        if isinstance(node, ast.Name)
+                    }
+                # Only names that are defined in this function can be used
+                if names <= allowed:
+                    candidates.append(key)
+            if not candidates:
+                break
+            # Share the largest expression first
+            key = max(candidates, key=sizes.__getitem__)
+            first = occurrences[key][0][1]
+            name = f"{SHARED_PREFIX}{next(shared_names)}"
+            replace = ReplaceExpressions({node for _, node in occurrences[key]}, name)
+            for lambda_ in {lambda_: None for lambda_, _ in occurrences[key]}:
+                lambda_.body = replace.visit(lambda_.body)
+                del collected[lambda_]
+
+            # name = computed(lambda: expression, deep=False)
+            definition = ast.Assign(
+                targets=[ast.Name(id=name, ctx=ast.Store())],
+                value=ast.Call(
+                    func=ast.Name(id="computed", ctx=ast.Load()),
+                    args=[
+                        ast.Lambda(
+                            args=ast.arguments(
+                                posonlyargs=[],
+                                args=[],
+                                kwonlyargs=[],
+                                kw_defaults=[],
+                                defaults=[],
+                            ),
+                            # Replaced by calls to the shared value
+                            body=first,
+                        )
+                    ],
+                    keywords=[ast.keyword("deep", ast.Constant(value=False))],
+                ),
+            )
+            definitions.append(located(definition, (first.lineno, first.col_offset)))
+            # The shared value can be shared again (in part)
+            lambdas.append(definition.value.args[0])
+            allowed = allowed | {name}
+
+        # Define the shared values before the shared values that use them
+        defined: list[ast.stmt] = []
+        while definitions:
+            for definition in definitions:
+                uses = {
+                    node.id
+                    for node in ast.walk(definition.value)
+                    if isinstance(node, ast.Name) and node.id.startswith(SHARED_PREFIX)
+                }
+                if not any(other.targets[0].id in uses for other in definitions):
+                    definitions.remove(definition)
+                    defined.append(definition)
+                    break
+        body[index:index] = defined
+        for item_function in functions:
+            eliminate(item_function, allowed)
+
+    eliminate(render_tree, allowed)
+
+
+def bindings(statement: ast.stmt) -> list[tuple[str, ast.Lambda]]:
+    """
+    Returns the method and lambdas of the statement if it sets a binding
+    of a fragment.
+    """
+    if (
+        isinstance(statement, ast.Expr)
+        and isinstance(call := statement.value, ast.Call)
+        and isinstance(call.func, ast.Attribute)
+        and call.func.attr in BINDING_METHODS
+    ):
+        return [
+            (call.func.attr, arg) for arg in call.args if isinstance(arg, ast.Lambda)
+        ]
+    return []
+
+
+def collect_subexpressions(
+    node: ast.AST, found: list[tuple[tuple, int, ast.expr]], pure: set[str]
+) -> tuple[int | None, int, tuple]:
+    """
+    Collects the sub-expressions of the node (including the node itself) that
+    can be moved and that are expensive enough to be shared, as tuples of the
+    key, size and node. Identical expressions have identical keys. Calls can
+    only be moved when they call one of the `pure` builtins.
+
+    Returns the cost, size and key of the node. The cost is a rough estimate
+    of the cost of evaluating the node, or None when the node can't be moved.
+    Looking up variables is free, calls and f-strings cost 2 and other
+    operations (subscripts, attributes, operators) cost 1.
+    """
+    if isinstance(node, UNMOVABLE_EXPRESSIONS):
+        return None, 1, ()
+
+    cost: int | None = 0
+    lookup = is_lookup(node)
+    if lookup:
+        # Nothing within a lookup is shared
+        found = []
+    elif isinstance(node, (ast.Call, ast.JoinedStr)):
+        cost = 2
+    elif isinstance(node, COSTLY_EXPRESSIONS):
+        cost = 1
+
+    size = 1
+    key: list = [type(node)]
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            items: list = []
+            for item in value:
+                if isinstance(item, ast.AST):
+                    item_cost, item_size, item = collect_subexpressions(
+                        item, found, pure
+                    )
+                    cost = (
+                        None if cost is None or item_cost is None else cost + item_cost
+                    )
+                    size += item_size
+                items.append(item)
+            key.append(tuple(items))
+        elif isinstance(value, ast.AST):
+            # The format spec of f-strings is a (constant) f-string itself
+            spec = field == "format_spec"
+            child_cost, child_size, child_key = collect_subexpressions(
+                value, [] if spec else found, pure
+            )
+            if spec:
+                child_cost = 0
+            cost = None if cost is None or child_cost is None else cost + child_cost
+            size += child_size
+            key.append(child_key)
+        else:
+            # Mind that True == 1 == 1.0
+            key.append((type(value), value))
+
+    if lookup:
+        cost = 0
+    elif isinstance(node, ast.Call) and not (
+        isinstance(node.func, ast.Name) and node.func.id in pure
+    ):
+        # The call can't be shared, but its arguments can
+        cost = None
+    elif isinstance(node, ast.FormattedValue):
+        # Parts of f-strings are no expressions by themselves
+        return cost, size, tuple(key)
+    key = tuple(key)
+    if cost is not None and cost >= SHARED_MIN_COST and isinstance(node, ast.expr):
+        found.append((key, size, node))
+    return cost, size, key
+
+
+def is_lookup(node: ast.AST) -> bool:
+    """
+    Whether the node looks up a variable: `self._lookup(...)`, `unpacked()`,
+    `unpacked()['name']` or a shared value.
+    """
+    if isinstance(node, ast.Subscript):
+        return is_lookup(node.value) and isinstance(node.slice, ast.Constant)
+    if not isinstance(node, ast.Call):
+        return False
+    if isinstance(node.func, ast.Name):
+        return not node.args and node.func.id.startswith(("unpacked", SHARED_PREFIX))
+    return (
+        isinstance(node.func, ast.Attribute)
+        and node.func.attr == "_lookup"
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "self"
+    )
+
+
+def item_bindings(function: ast.FunctionDef) -> list[tuple[str, ast.Lambda]]:
+    """
+    Returns the bindings of the function that creates the fragment of a v-for
+    item, including those of the v-for items within.
+    """
+    result = []
+    for statement in function.body:
+        if isinstance(statement, ast.FunctionDef):
+            result.extend(item_bindings(statement))
+        else:
+            result.extend(bindings(statement))
+    return result
+
+
 def is_directive(key):
     return key.startswith((DIRECTIVE_PREFIX, ":", "@", "#"))
 
@@ -823,6 +1245,25 @@ class RewriteName(ast.NodeTransformer):
         )
 
 
+class ReplaceExpressions(ast.NodeTransformer):
+    """AST node transformer that replaces the given expression nodes with
+    a call to the shared value `name`."""
+
+    def __init__(self, nodes: set[ast.expr], name: str):
+        self.nodes = nodes
+        self.name = name
+
+    def visit(self, node):
+        if isinstance(node, UNMOVABLE_EXPRESSIONS):
+            return node
+        if node in self.nodes:
+            call = ast.Call(
+                func=ast.Name(id=self.name, ctx=ast.Load()), args=[], keywords=[]
+            )
+            return ast.copy_location(call, node)
+        return self.generic_visit(node)
+
+
 class ImportsCollector(ast.NodeVisitor):
     def __init__(self):
         self.names = set()
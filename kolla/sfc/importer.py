@@ -34,13 +34,10 @@ class KollaImporter:
 
     def exec_module(self, module):
         """Executing the module means reading the kolla file"""
-        component, context = compiler.load(self.sfc_path)
-        # Add the default module keys to the context such that
-        # __file__, __name__ and such are available to the loaded module
-        context.update(module.__dict__)
-
-        module.__dict__.update(context)
-        module.__dict__[component.__name__] = component
+        # Execute the kolla file in the namespace of the module such that
+        # __file__, __name__ and such are available to the loaded module and
+        # classes refer to the right module (so that they can be pickled)
+        compiler.load(self.sfc_path, namespace=module.__dict__)
 
 
 # Add the Cgx importer at the end of the list of finders
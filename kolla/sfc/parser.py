@@ -1,6 +1,18 @@
-from html.parser import HTMLParser
+import re
+from html import unescape
 from weakref import ref
 
+# Tag name and attributes, with the same (tolerant) syntax as the HTMLParser
+TAG_NAME = re.compile(r"([a-zA-Z][^\t\n\r\f />\x00]*)(?:\s|/(?!>))*")
+ATTRIBUTE = re.compile(
+    r"""((?<=['"\s/])[^\s/>][^\s/=>]*)"""
+    r"""(\s*=+\s*('[^']*'|"[^"]*"|(?!['"])[^>\s]*))?(?:\s|/(?!>))*"""
+)
+# Elements of which the content is not parsed but taken as-is
+RAW_TEXT_ELEMENTS = {
+    name: re.compile(rf"</\s*{name}\s*>", re.IGNORECASE) for name in ("script", "style")
+}
+
 
 class Node:
     """Node that represents an element from a .cgx file."""
@@ -15,6 +27,8 @@ class Node:
         self.tag = tag
         self.attrs = attrs or {}
         self.location = location
+        # Location (line, column) of each attribute
+        self.attr_locations: dict[str, tuple[int, int]] = {}
         self.end: tuple[int, int] | None = None
         self.data: str | None = None
         self.children: list[Node] = []
@@ -26,53 +40,157 @@ class Node:
                 return child
 
 
-class KollaParser(HTMLParser):
+class KollaParser:
     """Parser for .cgx files.
 
     Creates a tree of Nodes with all encountered attributes and data.
+
+    Tags keep their original casing, attribute names are lower-cased and
+    entities in attribute values and text are unescaped, just like the
+    HTMLParser does. The content of script and style tags is taken as-is.
+    Comments, declarations and processing instructions are skipped.
+    Locations are (line, column) tuples, with lines starting at 1 and
+    columns at 0.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    def __init__(self):
         self.root = Node("root")
         self.stack = [self.root]
+        self.template = ""
+        # Line and offset of the start of the line of the last position
+        self._line = 1
+        self._line_start = 0
+        self._offset = 0
+
+    def feed(self, template: str):
+        """Parse the (complete) template."""
+        self.template = template
+        self._line, self._line_start, self._offset = 1, 0, 0
+        find = template.find
+        text_start = index = 0
+        while (start := find("<", index)) >= 0:
+            char = template[start + 1 : start + 2]
+            if char.isascii() and char.isalpha():
+                self.handle_text(text_start, start)
+                index = self.parse_starttag(start)
+            elif char == "/":
+                self.handle_text(text_start, start)
+                index = self.parse_endtag(start)
+            elif template.startswith("<!--", start):
+                self.handle_text(text_start, start)
+                index = find("-->", start + 4)
+                index = index + 3 if index >= 0 else -1
+            elif char in ("!", "?"):
+                self.handle_text(text_start, start)
+                index = find(">", start + 2)
+                index = index + 1 if index >= 0 else -1
+            else:
+                # Not markup, so the '<' is part of the text
+                index = start + 1
+                continue
+            if index < 0:
+                # Incomplete markup at the end of the template
+                return
+            text_start = index
+        self.handle_text(text_start, len(template))
+
+    def position(self, offset: int) -> tuple[int, int]:
+        """
+        Returns the location of the offset in the template. Offsets must be
+        passed in increasing order (which is the order of parsing).
+        """
+        template = self.template
+        if newlines := template.count("\n", self._offset, offset):
+            self._line += newlines
+            self._line_start = template.rindex("\n", self._offset, offset) + 1
+        self._offset = offset
+        return self._line, offset - self._line_start
+
+    def parse_starttag(self, start: int) -> int:
+        """Parse the start tag at `start`, returns the offset after the tag."""
+        template = self.template
+        match = TAG_NAME.match(template, start + 1)
+        tag = match.group(1)
+        node = Node(tag, location=self.position(start))
 
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
-        # The tag parameter is lower-cased by the HTMLParser.
-        # In order to figure out whether the tag indicates
-        # an imported class, we need the original casing for
-        # the tag.
-        # Using the original start tag, we can figure out where
-        # the tag is located using a lower-cased version. And then
-        # use the index to extract the original casing for the tag.
-        complete_tag = self.get_starttag_text()
-        index = complete_tag.lower().index(tag)
-        original_tag = complete_tag[index : index + len(tag)]
-        node = Node(original_tag, attrs=dict(attrs), location=self.getpos())
-
-        # Cast attributes that have no value to boolean (True)
-        # so that they function like flags
-        for key, value in node.attrs.items():
-            # TODO: check if the value should actually be an integer
-            if value is None:
-                node.attrs[key] = True
+        attrs = node.attrs
+        locations = node.attr_locations
+        match_attribute = ATTRIBUTE.match
+        count = template.count
+        # Keep track of the location inline, since this is the hot loop
+        line, line_start, offset = self._line, self._line_start, self._offset
+        index = match.end()
+        while match := match_attribute(template, index):
+            name, rest, value = match.group(1, 2, 3)
+            name = name.lower()
+            if not rest:
+                # Attributes without a value function like flags
+                value = True
+            else:
+                quote = value[:1]
+                if (quote == '"' or quote == "'") and value[-1:] == quote:
+                    value = value[1:-1]
+                if "&" in value:
+                    value = unescape(value)
+            attrs[name] = value
+            attribute_start = match.start(1)
+            if newlines := count("\n", offset, attribute_start):
+                line += newlines
+                line_start = template.rindex("\n", offset, attribute_start) + 1
+            offset = attribute_start
+            locations[name] = (line, offset - line_start)
+            index = match.end()
+        self._line, self._line_start, self._offset = line, line_start, offset
+
+        end = template.find(">", index)
+        if end < 0:
+            return -1
+        # Anything else between the attributes and the end is ignored
+        self_closing = template[end - 1] == "/" and end - 1 >= index
 
         # Add item as child to the last on the stack
         parent = self.stack[-1]
         parent.children.append(node)
         node.parent = ref(parent)
+        if self_closing:
+            node.end = node.location
+            return end + 1
+
         # Make the new node the last on the stack
         self.stack.append(node)
+        index = end + 1
+        if end_pattern := RAW_TEXT_ELEMENTS.get(tag.lower()):
+            if not (match := end_pattern.search(template, index)):
+                return -1
+            self.handle_data(template[index : match.start()])
+            return self.parse_endtag(match.start())
+        return index
 
-    def handle_endtag(self, tag: str):
-        # pop it till popping the same tag in order to
-        # work around unclosed tags?
-        # Pop the stack until  (but not the root!)
+    def parse_endtag(self, start: int) -> int:
+        """Parse the end tag at `start`, returns the offset after the tag."""
+        template = self.template
+        end = template.find(">", start + 2)
+        if end < 0:
+            return -1
+        if not (match := TAG_NAME.match(template, start + 2, end)):
+            # For instance '</>'
+            return end + 1
+
+        tag = match.group(1).lower()
+        location = self.position(start)
+        # Pop the stack until the node of the tag (but not the root!), in
+        # order to work around unclosed tags
         while len(self.stack) > 1:
             node = self.stack.pop()
-            node.end = self.getpos()
+            node.end = location
             if node.tag.lower() == tag:
                 break
+        return end + 1
+
+    def handle_text(self, start: int, end: int):
+        if start < end:
+            text = self.template[start:end]
+            self.handle_data(unescape(text) if "&" in text else text)
 
     def handle_data(self, data: str):
         if data.strip():
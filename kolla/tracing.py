@@ -0,0 +1,317 @@
+"""
+Opt-in tracing of the runtime, exported in the Chrome Trace Event format
+(open the file in https://ui.perfetto.dev or chrome://tracing):
+
+    from kolla import tracing
+
+    with tracing.trace() as tracer:
+        gui.render(App, container)
+        ...
+    tracer.save("kolla-trace.json")
+
+Records spans for the `render` and `mount` of components (with the location
+of their template), the `mounted` and `updated` hooks, the calls to the
+renderers of `Kolla` instances, the callbacks of the watchers of fragments
+and the flushes of the scheduler. Watchers are only traced when they are
+created while tracing is enabled. When tracing is disabled, the overhead is
+a single check per component hook and per flush.
+
+Independent of tracing, `log_slow_flushes` logs a warning for every flush of
+the scheduler that takes longer than a threshold.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps
+from inspect import signature
+from pathlib import Path
+from typing import Any
+from weakref import WeakSet
+
+from observ import scheduler
+
+logger = logging.getLogger(__name__)
+
+# The active tracer, None when tracing is disabled
+tracer: Tracer | None = None
+# Threshold in seconds for logging slow flushes, None when disabled
+slow_flush_threshold: float | None = None
+
+# Renderers of Kolla instances that are instrumented while tracing
+_renderers: WeakSet = WeakSet()
+# Renderer methods that are traced, with the name and index of the argument
+# that is recorded with the span (if any)
+RENDERER_METHODS = {
+    "create_element": ("type", 0),
+    "create_text_element": None,
+    "insert": None,
+    "remove": None,
+    "set_element_text": None,
+    "set_attribute": ("attr", 1),
+    "remove_attribute": ("attr", 1),
+    "add_event_listener": ("event", 1),
+    "remove_event_listener": ("event", 1),
+}
+
+_NULL_SPAN = nullcontext()
+# Component info by component class
+_component_info: dict[type, dict[str, str]] = {}
+
+
+def component_info(component) -> dict[str, str]:
+    """Returns the name and the template location of the component."""
+    cls = type(component)
+    if (info := _component_info.get(cls)) is None:
+        info = {"component": cls.__qualname__}
+        if code := getattr(cls.render, "__code__", None):
+            info["location"] = f"{code.co_filename}:{code.co_firstlineno}"
+        _component_info[cls] = info
+    return info
+
+
+class Span:
+    """Context manager that records a complete event on exit."""
+
+    __slots__ = ("args", "category", "name", "start", "tracer")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict | None):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.complete(
+            self.name, self.category, self.start, time.perf_counter_ns(), self.args
+        )
+
+
+class Tracer:
+    """Collects trace events in the Chrome Trace Event format."""
+
+    def __init__(self):
+        self.events: list[dict[str, Any]] = []
+        self.pid = os.getpid()
+
+    def span(self, name: str, category: str, args: dict | None = None) -> Span:
+        return Span(self, name, category, args)
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start: int,
+        end: int,
+        args: dict | None = None,
+    ):
+        """Add a complete event, `start` and `end` are in `perf_counter_ns`."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def to_json(self) -> dict[str, Any]:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str | os.PathLike):
+        """Write the events to a file in the Chrome Trace Event format."""
+        Path(path).write_text(json.dumps(self.to_json(), default=str))
+
+    def instrument(self, renderer):
+        """Trace the calls of the renderer (until `restore`)."""
+        for method_name, arg in RENDERER_METHODS.items():
+            method = getattr(renderer, method_name)
+            setattr(renderer, method_name, self._traced_method(method, arg))
+
+    def restore(self, renderer):
+        for method_name in RENDERER_METHODS:
+            vars(renderer).pop(method_name, None)
+
+    def _traced_method(self, method: Callable, arg: tuple[str, int] | None):
+        name = method.__name__
+
+        @wraps(method)
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.complete(
+                    name,
+                    "renderer",
+                    start,
+                    time.perf_counter_ns(),
+                    {arg[0]: args[arg[1]]} if arg else None,
+                )
+
+        return traced
+
+
+def enable(new_tracer: Tracer | None = None) -> Tracer:
+    """Start tracing with the given (or a new) tracer."""
+    global tracer
+    disable()
+    tracer = new_tracer or Tracer()
+    for renderer in _renderers:
+        tracer.instrument(renderer)
+    return tracer
+
+
+def disable() -> Tracer | None:
+    """Stop tracing, returns the tracer that was active."""
+    global tracer
+    previous, tracer = tracer, None
+    if previous is not None:
+        for renderer in _renderers:
+            previous.restore(renderer)
+    return previous
+
+
+@contextmanager
+def trace(new_tracer: Tracer | None = None) -> Iterator[Tracer]:
+    """Context manager that traces its body."""
+    try:
+        yield enable(new_tracer)
+    finally:
+        disable()
+
+
+def register_renderer(renderer):
+    """Trace the calls of the renderer whenever tracing is enabled."""
+    _renderers.add(renderer)
+    if tracer is not None:
+        tracer.instrument(renderer)
+
+
+def log_slow_flushes(threshold: float | None):
+    """
+    Log a warning for flushes that take longer than `threshold` milliseconds.
+    Pass None to disable.
+    """
+    global slow_flush_threshold
+    slow_flush_threshold = None if threshold is None else threshold / 1000
+
+
+def span(name: str, category: str, component=None):
+    """
+    Returns a context manager that records a span when tracing is enabled. When
+    a component is given, the name of the span is prefixed with the name of the
+    component class.
+    """
+    if tracer is None:
+        return _NULL_SPAN
+    if component is None:
+        return tracer.span(name, category)
+    info = component_info(component)
+    return tracer.span(f"{info['component']}.{name}", category, info)
+
+
+def traced(
+    fn: Callable,
+    name: str,
+    category: str,
+    get_component: Callable[[], Any] | None = None,
+) -> Callable:
+    """
+    Returns `fn` wrapped in a span when tracing is enabled, `fn` otherwise.
+    The component for the span is looked up with `get_component` on the first
+    call, since it might not be known yet when `fn` is wrapped.
+    """
+    if tracer is None:
+        return fn
+
+    info = None
+
+    def record():
+        nonlocal info
+        if tracer is None:
+            return _NULL_SPAN
+        if info is None and get_component and (component := get_component()):
+            info = component_info(component)
+        if info is None:
+            return tracer.span(name, category)
+        return tracer.span(f"{info['component']}.{name}", category, info)
+
+    return wrap(fn, record)
+
+
+def wrap(fn: Callable, context: Callable[[], AbstractContextManager]) -> Callable:
+    """
+    Returns a wrapper that calls `fn` within the context manager that is
+    returned by `context`. The wrapper takes the same number of arguments (up
+    to two) as `fn`, since watchers inspect the arguments of their callbacks.
+    """
+    parameters = len(signature(fn, follow_wrapped=False).parameters)
+    if parameters == 0:
+
+        @wraps(fn)
+        def wrapper():
+            with context():
+                return fn()
+
+    elif parameters == 1:
+
+        @wraps(fn)
+        def wrapper(new):
+            with context():
+                return fn(new)
+
+    else:
+
+        @wraps(fn)
+        def wrapper(new, old):
+            with context():
+                return fn(new, old)
+
+    return wrapper
+
+
+def flush():
+    """Flush the scheduler, traced and timed when enabled."""
+    if tracer is None and slow_flush_threshold is None:
+        scheduler.flush()
+        return
+    if not scheduler.has:
+        return
+
+    start = time.perf_counter_ns()
+    try:
+        scheduler.flush()
+    finally:
+        end = time.perf_counter_ns()
+        if tracer is not None:
+            tracer.complete("flush", "scheduler", start, end)
+        duration = (end - start) / 1e9
+        if slow_flush_threshold is not None and duration > slow_flush_threshold:
+            logger.warning(
+                "Slow flush: %.1f ms (threshold: %.1f ms)",
+                duration * 1000,
+                slow_flush_threshold * 1000,
+            )
+
+
+def request_flush_asyncio():
+    """Request a (traced) flush of the scheduler on the asyncio event loop."""
+    import asyncio
+
+    loop = asyncio.get_event_loop_policy().get_event_loop()
+    loop.call_soon(flush)
@@ -1,5 +1,9 @@
 import gc
+import json
+import shutil
+import subprocess
 import textwrap
+from pathlib import Path
 
 import pytest
 from observ import scheduler
@@ -27,3 +31,75 @@ def cleanup():
     yield
 
     scheduler.clear()
+
+
+class FakeDom:
+    """
+    Runs a JavaScript applier of kolla in node, against the minimal DOM of
+    `fake_dom.js`. The calls of the callback of the applier (dispatch or send)
+    are forwarded to `callback`.
+    """
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ["node", "--expose-gc", str(Path(__file__).with_name("fake_dom.js"))],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.callback = None
+        # Number of calls of `apply`
+        self.applied = 0
+
+    def command(self, *args):
+        self.process.stdin.write(json.dumps(args) + "\n")
+        self.process.stdin.flush()
+        response = json.loads(self.process.stdout.readline())
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        for call in response["calls"]:
+            self.callback(*call)
+        return response["result"]
+
+    def evaluate(self, source, callback):
+        """Create the applier by calling the function that `source` evaluates to."""
+        self.callback = callback
+        self.command("evaluate", source)
+
+    def load(self, path, callback):
+        """Create the applier with `createApplier` of the module at `path`."""
+        self.callback = callback
+        self.command("import", str(path))
+
+    def apply(self, data):
+        self.applied += 1
+        self.command("apply", data)
+
+    def node(self, id):
+        return self.command("node", id)
+
+    def root(self):
+        """Returns the rendered tree as nested lists."""
+        return self.command("root")
+
+    def fire(self, path, type, event):
+        """Call the listeners of the node at the path of child indices."""
+        self.command("fire", path, type, event)
+
+    def live_listeners(self):
+        """Number of event listeners that can not be garbage collected."""
+        return self.command("listeners")
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+@pytest.fixture
+def fake_dom():
+    if shutil.which("node") is None:
+        pytest.skip("node is not available")
+    dom = FakeDom()
+    yield dom
+    dom.close()
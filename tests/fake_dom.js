@@ -0,0 +1,127 @@
+// Minimal DOM for running the JavaScript appliers of kolla in node. It is
+// controlled by `FakeDom` (see conftest.py) with one JSON command per line on
+// stdin, each of which is answered with one JSON line on stdout.
+const readline = require("node:readline");
+const { pathToFileURL } = require("node:url");
+
+// Weak references to all event listeners that were ever added
+const listenerRefs = [];
+
+class Node {
+  constructor(type) {
+    this.type = type;
+    this.text = null;
+    this.attributes = {};
+    this.listeners = {};
+    this.children = [];
+    this.parent = null;
+  }
+
+  set textContent(value) {
+    this.text = String(value);
+  }
+
+  insertBefore(el, anchor) {
+    if (el.parent) el.parent.removeChild(el);
+    const index = anchor === null ? this.children.length : this.children.indexOf(anchor);
+    if (index === -1) throw new Error("Anchor is not a child of this node");
+    this.children.splice(index, 0, el);
+    el.parent = this;
+  }
+
+  appendChild(el) {
+    this.insertBefore(el, null);
+  }
+
+  removeChild(el) {
+    const index = this.children.indexOf(el);
+    if (index === -1) throw new Error("Node is not a child of this node");
+    this.children.splice(index, 1);
+    el.parent = null;
+  }
+
+  setAttribute(name, value) {
+    // Just like the DOM, values are converted to strings
+    this.attributes[name] = String(value);
+  }
+
+  removeAttribute(name) {
+    delete this.attributes[name];
+  }
+
+  addEventListener(type, listener) {
+    (this.listeners[type] ||= []).push(listener);
+    listenerRefs.push(new WeakRef(listener));
+  }
+
+  removeEventListener(type, listener) {
+    const listeners = this.listeners[type] || [];
+    const index = listeners.indexOf(listener);
+    if (index === -1) throw new Error("Unknown listener");
+    listeners.splice(index, 1);
+  }
+
+  toJSON() {
+    const types = Object.keys(this.listeners).sort();
+    return [this.type, this.text, this.attributes, types, this.children];
+  }
+}
+
+globalThis.document = {
+  createElement: (type) => new Node(type),
+  createTextNode: (text) => Object.assign(new Node("#text"), { text }),
+};
+globalThis.window = { document: globalThis.document };
+
+const root = new Node("root");
+// Arguments of the calls of the callback of the applier, since the last command
+let calls = [];
+let applier = null;
+
+const commands = {
+  // Creates an applier by evaluating a JavaScript expression
+  async evaluate(source) {
+    applier = eval(source)(root, (...args) => calls.push(args));
+  },
+  // Creates an applier with the `createApplier` function of an ES module
+  async import(path) {
+    const { createApplier } = await import(pathToFileURL(path));
+    applier = { apply: createApplier(root, (...args) => calls.push(args)) };
+  },
+  async apply(data) {
+    applier.apply(data);
+  },
+  async node(id) {
+    return applier.node(id);
+  },
+  async root() {
+    return root;
+  },
+  // Calls the listeners of the node at the given path of child indices
+  async fire(path, type, event) {
+    const node = path.reduce((node, index) => node.children[index], root);
+    for (const listener of node.listeners[type] || []) listener(event);
+  },
+  // Number of event listeners that can not be garbage collected
+  async listeners() {
+    global.gc();
+    return listenerRefs.filter((ref) => ref.deref() !== undefined).length;
+  },
+};
+
+async function main() {
+  for await (const line of readline.createInterface({ input: process.stdin })) {
+    const [command, ...args] = JSON.parse(line);
+    let response;
+    try {
+      const result = await commands[command](...args);
+      response = { result: result === undefined ? null : result, calls };
+    } catch (error) {
+      response = { error: String(error.stack || error) };
+    }
+    calls = [];
+    process.stdout.write(JSON.stringify(response) + "\n");
+  }
+}
+
+main();
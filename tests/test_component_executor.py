@@ -0,0 +1,123 @@
+import threading
+from concurrent.futures import wait
+
+from observ import reactive
+
+import kolla
+
+
+def test_component_run_in_executor(parse_source):
+    Search, namespace = parse_source(
+        """
+        <search :count="len(matches)" />
+
+        <script>
+        import threading
+
+        import kolla
+
+        release = threading.Event()
+        instances = []
+
+        def find(query, records):
+            if query == "slow":
+                release.wait()
+            return [record for record in records if query in record]
+
+        class Search(kolla.Component):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.state["matches"] = []
+                instances.append(self)
+
+            def search(self, query):
+                return self.run_in_executor(
+                    find, query, ["apple", "banana", "cherry"], key="matches"
+                )
+        </script>
+        """
+    )
+
+    gui = kolla.Kolla(kolla.DictRenderer(), event_loop_type=kolla.EventLoopType.SYNC)
+    container = {"type": "root"}
+    gui.render(Search, container)
+    search = namespace["instances"][0]
+    element = container["children"][0]
+
+    future = search.search("an")
+    wait([future])
+    assert future.result() == ["banana"]
+    # Results are only committed on the main thread
+    assert element["attrs"]["count"] == 0
+    assert gui.process_pending() == 1
+    assert element["attrs"]["count"] == 1
+    assert search.state["matches"] == ["banana"]
+
+    # A newer job supersedes a running one
+    slow = search.search("slow")
+    fast = search.search("e")
+    wait([fast])
+    namespace["release"].set()
+    wait([slow])
+    gui.process_pending()
+    assert search.state["matches"] == ["apple", "cherry"]
+    assert element["attrs"]["count"] == 2
+    assert not search._jobs
+
+
+def test_component_run_in_executor_unmount(parse_source):
+    _, namespace = parse_source(
+        """
+        <worker />
+
+        <script>
+        import kolla
+
+        workers = []
+
+        class Worker(kolla.Component):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                workers.append(self)
+        </script>
+        """
+    )
+
+    Parent, namespace = parse_source(
+        """
+        <parent>
+          <Worker v-if="show" />
+        </parent>
+
+        <script>
+        import kolla
+
+        try:
+            import Worker
+        except:
+            pass
+
+        class Parent(kolla.Component):
+            pass
+        </script>
+        """,
+        namespace=namespace,
+    )
+
+    gui = kolla.Kolla(kolla.DictRenderer(), event_loop_type=kolla.EventLoopType.SYNC)
+    container = {"type": "root"}
+    state = reactive({"show": True})
+    gui.render(Parent, container, state=state)
+    worker = namespace["workers"][0]
+
+    release = threading.Event()
+    future = worker.run_in_executor(release.wait, key="result")
+    assert worker._jobs
+
+    state["show"] = False
+    assert not worker._jobs
+    release.set()
+    wait([future])
+    gui.process_pending()
+    # The result of the unmounted component is discarded
+    assert "result" not in worker.state
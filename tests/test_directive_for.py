@@ -1,7 +1,7 @@
 import pytest
 from observ import reactive
 
-from kolla import EventLoopType, Kolla
+from kolla import Columns, EventLoopType, Kolla
 from kolla.renderers import DictRenderer
 from kolla.renderers.dict_renderer import format_dict
 
@@ -552,3 +552,70 @@ def test_for_regression(parse_source):
 
     assert "children" in container["children"][0], format_dict(container)
     assert len(container["children"][0]["children"]) == 1, format_dict(container)
+
+
+def test_for_columns(parse_source):
+    np = pytest.importorskip("numpy")
+    App, namespace = parse_source(
+        """
+        <node
+          v-for="row in table"
+          :value="cell(row, 'value')"
+          :label="row.label"
+        />
+
+        <script>
+        import kolla
+
+        evaluated = []
+
+        def cell(row, name):
+            evaluated.append(row.index)
+            return row[name]
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    table = Columns({"value": np.arange(100), "label": np.array(["a"] * 100)})
+    state = reactive({"table": table})
+    container = {"type": "root"}
+    gui = Kolla(renderer=DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(App, container, state=state)
+
+    evaluated = namespace["evaluated"]
+    assert len(container["children"]) == 100
+    assert container["children"][5]["attrs"]["value"] == 5
+    assert len(evaluated) == 100
+
+    # Only the bindings of the changed rows are evaluated
+    evaluated.clear()
+    values = np.arange(100)
+    values[[3, 50]] = [-3, -50]
+    changed = table.update(value=values)
+    assert changed.tolist() == [3, 50]
+    assert sorted(evaluated) == [3, 50]
+    assert container["children"][50]["attrs"]["value"] == -50
+    assert container["children"][51]["attrs"]["value"] == 51
+
+    evaluated.clear()
+    table.update(label=np.array(["a"] * 99 + ["b"]))
+    assert evaluated == [99]
+    assert container["children"][99]["attrs"]["label"] == "b"
+
+    # Changing the length updates the list
+    table.update(value=np.arange(10), label=np.array(["c"] * 10))
+    assert len(container["children"]) == 10
+    assert container["children"][9]["attrs"]["label"] == "c"
+    # The deps of the removed rows are dropped
+    assert sorted(table._row_deps) == list(range(10))
+
+    # Rows that are added again are tracked from scratch
+    table.update(value=np.arange(20), label=np.array(["d"] * 20))
+    assert len(container["children"]) == 20
+    assert sorted(table._row_deps) == list(range(20))
+
+    with pytest.raises(ValueError):
+        table.update(value=np.arange(3))
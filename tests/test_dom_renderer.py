@@ -0,0 +1,179 @@
+import importlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+from observ import reactive
+
+import kolla.renderers
+from kolla import EventLoopType, Kolla
+
+
+class Node:
+    """Stand-in for a DOM node that counts the calls into 'JavaScript'."""
+
+    calls = 0
+
+    def __init__(self, type, text=None):
+        self.type = type
+        self.children = []
+        self.attributes = {}
+        self.listeners = {}
+        self.text = text
+
+    def __setattr__(self, name, value):
+        if name == "textContent":
+            Node.calls += 1
+            name, value = "text", str(value)
+        super().__setattr__(name, value)
+
+    def insertBefore(self, el, anchor):  # noqa: N802
+        Node.calls += 1
+        index = self.children.index(anchor) if anchor is not None else None
+        self.children.insert(len(self.children) if index is None else index, el)
+
+    def appendChild(self, el):  # noqa: N802
+        Node.calls += 1
+        self.children.append(el)
+
+    def removeChild(self, el):  # noqa: N802
+        Node.calls += 1
+        self.children.remove(el)
+
+    def setAttribute(self, attr, value):  # noqa: N802
+        Node.calls += 1
+        self.attributes[attr] = str(value)
+
+    def removeAttribute(self, attr):  # noqa: N802
+        Node.calls += 1
+        self.attributes.pop(attr, None)
+
+    def addEventListener(self, event_type, listener):  # noqa: N802
+        Node.calls += 1
+        self.listeners.setdefault(event_type, []).append(listener)
+
+    def removeEventListener(self, event_type, listener):  # noqa: N802
+        Node.calls += 1
+        self.listeners[event_type].remove(listener)
+
+    def to_list(self):
+        """Same format as the nodes of fake_dom.js."""
+        return [
+            self.type,
+            self.text,
+            self.attributes,
+            sorted(self.listeners),
+            [child.to_list() for child in self.children],
+        ]
+
+
+class Document:
+    def createElement(self, type):  # noqa: N802
+        Node.calls += 1
+        return Node(type)
+
+    def createTextNode(self, text):  # noqa: N802
+        Node.calls += 1
+        return Node("#text", text)
+
+
+@pytest.fixture
+def dom_renderer(monkeypatch, fake_dom):
+    """
+    Imports the dom_renderer module with a stub for the `js` module, that
+    evaluates JavaScript with the fake DOM in node.
+    """
+
+    def eval(source):
+        def create_applier(container, dispatch):
+            assert container is fake_dom
+            fake_dom.evaluate(source, dispatch)
+            return SimpleNamespace(apply=fake_dom.apply, node=fake_dom.node)
+
+        return create_applier
+
+    js = SimpleNamespace(window=SimpleNamespace(document=Document()), eval=eval)
+    monkeypatch.setitem(sys.modules, "js", js)
+    yield importlib.import_module("kolla.renderers.dom_renderer")
+    del sys.modules["kolla.renderers.dom_renderer"]
+    delattr(kolla.renderers, "dom_renderer")
+
+
+APP = """
+<div :class="kind" :title="None if kind == 'a' else kind">
+  <button
+    v-for="i in range(count)"
+    :value="i"
+    :disabled="i == 0"
+    :hidden="False"
+    @click="bump"
+  />
+  <span v-if="count > 2" title="many" />
+</div>
+
+<script>
+import kolla
+
+class App(kolla.Component):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state["count"] = self.props["start"]
+
+    def bump(self, event):
+        self.state["count"] += event
+</script>
+"""
+
+
+def test_batched_dom_renderer(dom_renderer, fake_dom, parse_source):
+    App, _ = parse_source(APP)
+
+    # Render the same app with both renderers
+    Node.calls = 0
+    container = Node("root")
+    state = reactive({"start": 2, "kind": "a"})
+    gui = Kolla(dom_renderer.DomRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(App, container, state=state)
+    calls = Node.calls
+
+    batched_state = reactive({"start": 2, "kind": "a"})
+    renderer = dom_renderer.BatchedDomRenderer(fake_dom)
+    batched_gui = Kolla(renderer, event_loop_type=EventLoopType.SYNC)
+    batched_gui.render(App, renderer.root, state=batched_state)
+    # Everything is applied with a single call, once mounted
+    assert renderer.batches == 1
+    assert fake_dom.applied == 1
+    assert calls > 10
+    assert fake_dom.root() == container.to_list()
+    div = renderer.element(batched_gui.fragment.children[0].element)
+    assert div == fake_dom.root()[4][0]
+    # True sets an empty attribute, False and None remove it
+    assert div[2] == {"class": "a"}
+    assert [button[2] for button in div[4]] == [
+        {"value": "0", "disabled": ""},
+        {"value": "1"},
+    ]
+
+    # Events are dispatched to the handlers, the changes are applied after every
+    # flush of the scheduler
+    state["kind"] = "b"
+    batched_state["kind"] = "b"
+    assert fake_dom.root() == container.to_list()
+    (listener,) = container.children[0].children[1].listeners["click"]
+    listener(2)
+    fake_dom.fire([0, 1], "click", 2)
+    assert fake_dom.root() == container.to_list()
+    assert fake_dom.root()[4][0][2] == {"class": "b", "title": "b"}
+    assert len(fake_dom.root()[4][0][4]) == 5
+
+    (listener,) = container.children[0].children[0].listeners["click"]
+    listener(-3)
+    fake_dom.fire([0, 0], "click", -3)
+    assert fake_dom.root() == container.to_list()
+    assert len(fake_dom.root()[4][0][4]) == 1
+    # The handlers of removed nodes are released, on both sides
+    assert len(renderer._handlers) == 1
+    assert fake_dom.live_listeners() == 1
+    # Nothing is left to apply
+    renderer.flush()
+    assert renderer.batches == fake_dom.applied
@@ -0,0 +1,26 @@
+from kolla.renderers.html_batch import BatchRenderer, render_html_batch
+from kolla.renderers.html_renderer import render_html
+
+
+def test_render_html_batch():
+    from tests.data.html.report import Report
+
+    documents = [{"title": f"Report {i}", "values": list(range(i))} for i in range(10)]
+    expected = ["".join(render_html(Report, props)) for props in documents]
+    assert expected[2] == (
+        '<report title="Report 2"><row value="0"></row><row value="1"></row></report>'
+    )
+
+    # Documents are returned in order
+    result = list(render_html_batch(Report, documents, processes=2, chunksize=3))
+    assert result == expected
+
+    # Components can also be passed by path or by name
+    with BatchRenderer("tests/data/html/report.cgx", processes=2) as batch:
+        assert list(batch.render(documents)) == expected
+        assert list(batch.render(documents[:3])) == expected[:3]
+        assert batch.documents == 13
+        assert batch.throughput > 0
+
+    with BatchRenderer("tests.data.html.report:Report", processes=1) as batch:
+        assert list(batch.render(documents)) == expected
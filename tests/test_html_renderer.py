@@ -0,0 +1,167 @@
+import threading
+
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+from kolla.fragment import StaticValue
+from kolla.renderers.html_renderer import (
+    Element,
+    HTMLRenderer,
+    StreamingHTMLRenderer,
+    render_html,
+)
+
+
+def test_html_renderer(parse_source):
+    App, _ = parse_source(
+        """
+        <ul :class="kind">
+          <li v-for="item in items" :title="item" />
+        </ul>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    gui = Kolla(HTMLRenderer(), event_loop_type=EventLoopType.SYNC)
+    container = Element("root")
+    state = reactive({"kind": "list", "items": ["a", "b"]})
+    gui.render(App, container, state=state)
+
+    ul = container.children[0]
+    assert ul.attributes == {"class": "list"}
+    assert [li.attributes["title"] for li in ul.children] == ["a", "b"]
+
+
+def test_render_html_streaming(parse_source):
+    App, _ = parse_source(
+        """
+        <html>
+          <table v-bind="table_attrs">
+            <tr v-for="i, row in enumerate(rows)" :class="'odd' if i % 2 else None">
+              <td :title="row['name']" />
+              <td v-if="row['value'] > 1" :value="row['value']" />
+              <td v-else empty />
+            </tr>
+          </table>
+          <br />
+          <footer :hidden="hidden" />
+        </html>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    rows = [{"name": f'<row "{i}">', "value": i} for i in range(3)]
+    props = {"rows": rows, "table_attrs": {"id": "t & c"}, "hidden": True}
+    html = "".join(render_html(App, props))
+    assert html == (
+        "<html>"
+        '<table id="t &amp; c">'
+        '<tr><td title="&lt;row &quot;0&quot;&gt;"></td><td empty></td></tr>'
+        '<tr class="odd"><td title="&lt;row &quot;1&quot;&gt;"></td>'
+        "<td empty></td></tr>"
+        '<tr><td title="&lt;row &quot;2&quot;&gt;"></td><td value="2"></td></tr>'
+        "</table>"
+        "<br>"
+        "<footer hidden></footer>"
+        "</html>"
+    )
+
+    # The output is yielded in chunks while rendering
+    chunks = list(render_html(App, props, chunk_size=10))
+    assert len(chunks) > 5
+    assert "".join(chunks) == html
+
+
+def test_render_html_slots():
+    from tests.data.slots.template import Template
+
+    html = "".join(render_html(Template))
+    assert html == (
+        "<widget>"
+        '<header><label text="header content"></label></header>'
+        '<content><label text="content"></label>'
+        '<label text="even more content"></label></content>'
+        '<footer><label text="footer content"></label></footer>'
+        "</widget>"
+    )
+
+
+def test_static_renderer_mount(parse_source):
+    App, _ = parse_source(
+        """
+        <div :class="kind">
+          <p v-for="i in range(count)" :id="i" />
+        </div>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    renderer = StreamingHTMLRenderer()
+    gui = Kolla(renderer, event_loop_type=EventLoopType.SYNC)
+    state = reactive({"count": 2, "kind": "a"})
+    gui.render(App, renderer.root, state=state)
+    renderer.close()
+    assert renderer.take() == '<div class="a"><p id="0"></p><p id="1"></p></div>'
+
+    # No watchers are installed for static output
+    div = gui.fragment.children[0]
+    assert isinstance(div._watchers["bind:class"], StaticValue)
+    list_fragment = div.children[0]
+    assert not list_fragment._watchers
+    # The fragments of the items are dropped once written
+    assert not list_fragment.children
+    state["count"] = 3
+    state["kind"] = "b"
+    assert not list_fragment.children
+    assert renderer.take() == ""
+
+
+def test_render_html_mounted(parse_source):
+    App, namespace = parse_source(
+        """
+        <ul>
+          <li v-for="i in range(count)" :value="i" />
+        </ul>
+
+        <script>
+        import kolla
+
+        mounted = []
+
+        class App(kolla.Component):
+            def mounted(self):
+                mounted.append(self)
+        </script>
+        """
+    )
+
+    # Components are mounted like any other renderer, including their hooks
+    assert "".join(render_html(App, {"count": 2})) == (
+        '<ul><li value="0"></li><li value="1"></li></ul>'
+    )
+    assert len(namespace["mounted"]) == 1
+
+    # Rendering stops when the output is not consumed anymore
+    chunks = render_html(App, {"count": 10_000}, chunk_size=10)
+    assert next(chunks).startswith("<ul>")
+    chunks.close()
+    assert not any(thread.name == "kolla-html" for thread in threading.enumerate())
+    assert len(namespace["mounted"]) == 1
@@ -1,6 +1,11 @@
+import subprocess
+import sys
+from importlib.util import find_spec
+
 import pytest
 from observ import reactive
 
+import kolla
 from kolla import EventLoopType, Kolla
 from kolla.renderers import DictRenderer
 
@@ -77,3 +82,28 @@ def test_reactive_element(parse_source):
     state["count"] += 1
 
     assert counter["attrs"]["count"] == 1, counter
+
+
+def test_import_is_lazy():
+    # Renderers for optional dependencies should only be imported on first use
+    code = (
+        "import sys, kolla; "
+        "assert not {'PySide6', 'pygfx', 'js'} & set(sys.modules), sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_attributes():
+    assert kolla.__version__
+    assert kolla.DictRenderer is DictRenderer
+    assert "PySideRenderer" in dir(kolla)
+
+    with pytest.raises(AttributeError):
+        kolla.NonExistingRenderer
+
+    if find_spec("PySide6"):
+        from kolla.renderers.pyside_renderer import PySideRenderer
+
+        assert kolla.PySideRenderer is PySideRenderer
+    else:
+        assert not hasattr(kolla, "PySideRenderer")
@@ -1,7 +1,10 @@
+import textwrap
+
 import pytest
 
 from kolla import EventLoopType, Kolla
 from kolla.renderers import DictRenderer
+from kolla.sfc.parser import KollaParser
 
 
 def test_parser_unclosed_element(parse_source):
@@ -49,3 +52,53 @@ def test_parser_unclosed_root_element(parse_source):
             </script>
             """
         )
+
+
+def test_parser_tree():
+    parser = KollaParser()
+    parser.feed(
+        textwrap.dedent(
+            """\
+            <App>
+              <!-- <ignored /> -->
+              <Sub-Component
+                :value="a > 1 and b < 2" title='say "hi"' flag
+                Unquoted=value escaped="&lt;&amp;"
+              />
+              <item>text &amp; more</item>
+            </app>
+
+            <script>
+            if a < b and c</d:
+                pass
+            </SCRIPT>
+            """
+        )
+    )
+    app, script = parser.root.children
+
+    assert app.tag == "App"
+    assert (app.location, app.end) == ((1, 0), (8, 0))
+    sub, item = app.children
+    assert sub.tag == "Sub-Component"
+    assert sub.attrs == {
+        ":value": "a > 1 and b < 2",
+        "title": 'say "hi"',
+        "flag": True,
+        "unquoted": "value",
+        "escaped": "<&",
+    }
+    assert sub.attr_locations == {
+        ":value": (4, 4),
+        "title": (4, 29),
+        "flag": (4, 46),
+        "unquoted": (5, 4),
+        "escaped": (5, 19),
+    }
+    # Self-closing elements end where they start
+    assert sub.end == sub.location == (3, 2)
+    assert item.data == "text & more"
+    assert item.parent() is app
+
+    assert script.data == "if a < b and c</d:\n    pass"
+    assert (script.location, script.end) == ((10, 0), (13, 0))
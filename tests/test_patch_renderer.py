@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+from observ import reactive
+
+from kolla import DictRenderer, EventLoopType, Kolla
+from kolla.renderers.patch_renderer import APPLIER_PATH, PatchClient, PatchRenderer
+
+
+def test_patch_renderer(parse_source):
+    App, _ = parse_source(
+        """
+        <app :title="title">
+          <item
+            v-for="i in range(count)"
+            :value="i"
+            :label="f'Item {i}'"
+            @click="bump"
+          />
+          <label v-if="count > 2" text="many" />
+        </app>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.state["count"] = self.props["start"]
+
+            def bump(self, amount):
+                self.state["count"] += amount
+        </script>
+        """
+    )
+
+    patches = []
+    events = []
+    renderer = PatchRenderer(patches.append)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    # Flush manually, instead of after every flush of the scheduler
+    renderer.register_request_flush(None)
+    state = reactive({"start": 2, "title": "a"})
+    gui.render(App, renderer.root, state=state)
+
+    container = {"type": "root"}
+    client = PatchClient(DictRenderer(), container, events.append)
+    # Nothing is sent until the batch is complete
+    assert not patches
+    renderer.flush()
+    assert len(patches) == 1
+    client.apply(patches.pop())
+
+    app = container["children"][0]
+    assert app["attrs"] == {"title": "a"}
+    assert [child["attrs"] for child in app["children"]] == [
+        {"value": 0, "label": "Item 0"},
+        {"value": 1, "label": "Item 1"},
+    ]
+
+    # Only the last value of an attribute within a batch is sent
+    state["title"] = "b"
+    state["title"] = "c"
+    renderer.flush()
+    assert json.loads(patches[0]) == [["a", 1, "title", "c"]]
+    client.apply(patches.pop())
+    assert app["attrs"] == {"title": "c"}
+
+    # Events are sent back, after which the changes are sent
+    (listener,) = app["children"][1]["handlers"]["click"]
+    listener(2)
+    renderer.dispatch(events.pop())
+    renderer.flush()
+    client.apply(patches.pop())
+    assert [child["type"] for child in app["children"]] == ["item"] * 4 + ["label"]
+    assert app["children"][3]["attrs"]["label"] == "Item 3"
+
+    (listener,) = app["children"][0]["handlers"]["click"]
+    listener(-3)
+    renderer.dispatch(events.pop())
+    renderer.flush()
+    client.apply(patches.pop())
+    assert [child["attrs"]["value"] for child in app["children"]] == [0]
+    # Removed nodes and their event handlers are released
+    assert len(client.nodes) == 3
+    assert len(renderer._handlers) == 1
+    assert len(client._listeners) == 1
+    assert renderer.patches == 4
+
+
+def test_patch_renderer_asyncio(parse_source):
+    App, _ = parse_source(
+        """
+        <item v-for="i in range(count)" :value="i * factor" />
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    async def main():
+        patches = []
+        renderer = PatchRenderer(patches.append)
+        gui = Kolla(renderer=renderer)
+        state = reactive({"count": 3, "factor": 1})
+        gui.render(App, renderer.root, state=state)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(patches) == 1
+
+        # One patch per scheduler flush
+        state["count"] = 4
+        state["factor"] = 2
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(patches) == 2
+        operations = json.loads(patches[1])
+        # Item 0 keeps its value, so no operation is sent for it
+        assert sorted(op[0] for op in operations) == ["a"] * 3 + ["c", "i"]
+
+    asyncio.run(main())
+
+
+def test_patch_applier(fake_dom, parse_source):
+    App, _ = parse_source(
+        """
+        <app :title="None if count > 2 else 'few'">
+          <item
+            v-for="i in range(count)"
+            :value="i"
+            :selected="i == 0"
+            @click="bump"
+          />
+          <label v-if="count > 2" text="many" />
+        </app>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.state["count"] = 2
+
+            def bump(self, event):
+                self.state["count"] += int(event["value"])
+        </script>
+        """
+    )
+
+    renderer = PatchRenderer(fake_dom.apply)
+    fake_dom.load(APPLIER_PATH, renderer.dispatch)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    gui.render(App, renderer.root)
+    assert renderer.patches == 1
+
+    (app,) = fake_dom.root()[4]
+    assert app[:4] == ["app", None, {"title": "few"}, []]
+    # True sets an empty attribute, False removes it
+    assert [(item[0], item[2], item[3]) for item in app[4]] == [
+        ("item", {"value": "0", "selected": ""}, ["click"]),
+        ("item", {"value": "1"}, ["click"]),
+    ]
+
+    # Events are sent back with their details, after which the changes are sent
+    fake_dom.fire([0, 1], "click", {"type": "click", "target": {"value": "2"}})
+    (app,) = fake_dom.root()[4]
+    # None removes the attribute
+    assert app[2] == {}
+    assert [item[0] for item in app[4]] == ["item"] * 4 + ["label"]
+    assert app[4][3][2] == {"value": "3"}
+
+    fake_dom.fire([0, 0], "click", {"type": "click", "target": {"value": "-3"}})
+    (app,) = fake_dom.root()[4]
+    assert [item[2] for item in app[4]] == [{"value": "0", "selected": ""}]
+    # The listeners of removed nodes are released
+    assert fake_dom.live_listeners() == 1
+    assert fake_dom.applied == renderer.patches
@@ -0,0 +1,71 @@
+import pstats
+
+from observ import reactive
+from observ.dep import Dep
+
+from kolla import DictRenderer, EventLoopType, Kolla, profiling
+
+
+def test_profiler(parse_source, tmp_path):
+    App, _ = parse_source(
+        """
+        <app :title="title">
+          <item v-for="value in items" :value="value" />
+          <label v-if="len(items) > 2" text="many" />
+        </app>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    gui = Kolla(DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    notify = Dep.notify
+    state = reactive({"title": "a", "items": [1, 2]})
+    with profiling.profile() as profiler:
+        # Only the watchers of the fragments are instrumented
+        assert Dep.notify is notify
+        gui.render(App, {"type": "root"}, state=state)
+        for title in "bcd":
+            state["title"] = title
+        state["items"].append(3)
+    # Profiling is disabled again
+    state["title"] = "e"
+    assert profiling.profiler is None
+
+    bindings = {binding.name: binding for binding in profiler.bindings}
+    assert set(bindings) == {
+        "App.app[bind:title]",
+        "App.list",
+        "App.item[bind:value]",
+        "App.control_flow",
+    }
+    title = bindings["App.app[bind:title]"]
+    assert title.evaluations == 4
+    assert title.callbacks == 3
+    assert title.triggers == {"<initial>": 1, "['title']": 3}
+    # Bindings point to the line of their attribute in the template
+    assert title.location == ("<template>", 2)
+    assert bindings["App.item[bind:value]"].location == ("<template>", 3)
+    assert bindings["App.control_flow"].location == ("<template>", 4)
+    # Triggers are labelled with the names that the expressions look up
+    for name in ("App.list", "App.control_flow"):
+        assert set(bindings[name].triggers) == {"<initial>", "['items']"}
+    assert bindings["App.item[bind:value]"].trigger == "<changed>"
+
+    report = profiler.report(sort="evaluations")
+    assert report.splitlines()[1].split()[0] == "4"
+    assert "App.app[bind:title] (<template>:" in report
+    assert "['title'] x3" in report
+
+    path = tmp_path / "kolla.prof"
+    profiler.dump_stats(path)
+    stats = pstats.Stats(str(path))
+    # The three item bindings share the location of their expression
+    assert stats.total_calls == sum(b.evaluations for b in profiler.bindings)
+    ((filename, _, name),) = [key for key in stats.stats if "title" in key[2]]
+    assert (filename, name) == ("<template>", "App.app[bind:title]")
@@ -0,0 +1,510 @@
+import hashlib
+
+import pytest
+from observ import reactive
+
+from kolla import EventLoopType, Kolla, RawArray
+
+gfx = pytest.importorskip("pygfx")
+from pygfx.objects import RootEventHandler, WindowEvent  # noqa: E402
+
+from kolla.renderers import PygfxRenderer  # noqa: E402
+from kolla.renderers.pygfx.assets import asset, content_key  # noqa: E402
+
+
+@pytest.fixture
+def points_app(parse_source):
+    App, _ = parse_source(
+        """
+        <group>
+          <mesh
+            v-for="i in range(count)"
+            :local.position="(i, offset, 0)"
+          />
+        </group>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+    return App
+
+
+def test_pygfx_notify_per_flush_sync(points_app):
+    renderer = PygfxRenderer()
+    summaries = []
+    renderer.add_on_change_handler(summaries.append, with_changes=True)
+
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    container = gfx.Scene()
+    state = reactive({"count": 2, "offset": 0})
+    gui.render(points_app, container, state=state)
+
+    # Once for mounting the group and the meshes
+    assert len(summaries) == 1
+    assert len(summaries[0].created) == 3
+
+    # Once for the flush of the scheduler that creates another mesh
+    state["count"] = 3
+    mesh = container.children[0].children[2]
+    assert summaries[1].created == summaries[1].inserted == [mesh]
+    assert summaries[1].attributes == {mesh: {"local.position"}}
+
+
+def test_pygfx_notify_coalesced(points_app):
+    renderer = PygfxRenderer()
+    calls = []
+    summaries = []
+    renderer.add_on_change_handler(lambda: calls.append(None))
+    renderer.add_on_change_handler(summaries.append, with_changes=True)
+
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    requests = []
+    renderer.register_request_flush(lambda: requests.append(None))
+    container = gfx.Scene()
+    state = reactive({"count": 100, "offset": 0})
+    gui.render(points_app, container, state=state)
+
+    assert len(requests) == 1
+    assert not calls
+
+    renderer.notify()
+    assert len(calls) == 1
+    changes = summaries[-1]
+    assert changes.structural
+    assert len(changes.created) == 101
+    assert len(changes.inserted) == 101
+    assert len(changes.attributes) == 100
+
+    # Nothing changed, so no notification
+    renderer.notify()
+    assert len(calls) == 1
+
+    state["offset"] = 1
+    assert len(requests) == 2
+
+    renderer.notify()
+    assert len(calls) == 2
+    changes = summaries[-1]
+    assert not changes.structural
+    assert changes.objects == set(container.children[0].children)
+    assert all(attrs == {"local.position"} for attrs in changes.attributes.values())
+
+    state["count"] = 90
+    renderer.notify()
+    changes = summaries[-1]
+    assert changes.structural
+    assert len(changes.removed) == 10
+
+    renderer.remove_on_change_handler(summaries.append)
+    state["count"] = 80
+    renderer.notify()
+    assert len(calls) == 4
+    assert len(summaries) == 3
+
+
+def test_pygfx_instance_group(parse_source):
+    App, namespace = parse_source(
+        """
+        <instance-group>
+          <mesh
+            v-for="i in range(count)"
+            :geometry="geometry"
+            :material="selected_material if i == selected else material"
+            :local.position="(i, 0, 0)"
+            @click="on_click"
+          />
+          <mesh :geometry="geometry" />
+        </instance-group>
+
+        <script>
+        import kolla
+        import pygfx as gfx
+
+        geometry = gfx.box_geometry()
+        material = gfx.MeshBasicMaterial()
+        selected_material = gfx.MeshBasicMaterial(color="red")
+        clicked = []
+
+        class App(kolla.Component):
+            def on_click(self, event):
+                clicked.append(event)
+        </script>
+        """
+    )
+
+    state = reactive({"count": 100, "selected": -1})
+    gui = Kolla(renderer=PygfxRenderer(), event_loop_type=EventLoopType.SYNC)
+    container = gfx.Scene()
+    gui.render(App, container, state=state)
+
+    group = container.children[0]
+    instanced = [c for c in group.children if isinstance(c, gfx.InstancedMesh)]
+    # The mesh without material is added as a regular child
+    assert len(group.children) == 2
+    assert len(instanced) == 1
+    assert len(group.instances) == 100
+    mesh = instanced[0]
+    assert mesh.instance_buffer.nitems >= 100
+    assert mesh.get_matrix_at(5)[0, 3] == 5
+
+    # Changing the material moves the instance to another InstancedMesh
+    state["selected"] = 5
+    instanced = [c for c in group.children if isinstance(c, gfx.InstancedMesh)]
+    assert len(instanced) == 2
+    selected_material = namespace["selected_material"]
+    selected = next(c for c in instanced if c.material is selected_material)
+    assert selected.get_matrix_at(0)[0, 3] == 5
+
+    # Picking an instance dispatches the event to the logical mesh
+    logical = next(m for m in group.instances if m.local.position[0] == 5)
+    received = []
+    logical.add_event_handler(received.append, "click")
+    event = gfx.PointerEvent(
+        type="click", x=0, y=0, pick_info={"instance_index": 0}, target=selected
+    )
+    selected.handle_event(event)
+    assert received == [event]
+    assert namespace["clicked"] == [event]
+
+    state["count"] = 3
+    assert len(group.instances) == 3
+    instanced = [c for c in group.children if isinstance(c, gfx.InstancedMesh)]
+    assert len(instanced) == 1
+    assert instanced[0].get_matrix_at(2)[0, 3] == 2
+    assert not instanced[0].get_matrix_at(3).any()
+
+
+def test_pygfx_raw_array_binding(parse_source):
+    np = pytest.importorskip("numpy")
+    App, _ = parse_source(
+        """
+        <points :geometry="geometry" :geometry.positions="positions" />
+
+        <script>
+        import kolla
+        import pygfx as gfx
+
+        geometry = gfx.Geometry()
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    positions = RawArray(np.zeros((1000, 3), dtype=np.float32))
+    state = reactive({"positions": positions})
+    renderer = PygfxRenderer()
+    summaries = []
+    renderer.add_on_change_handler(summaries.append, with_changes=True)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    renderer.register_request_flush(lambda: None)
+    container = gfx.Scene()
+    gui.render(App, container, state=state)
+    renderer.notify()
+
+    points = container.children[0]
+    buffer = points.geometry.positions
+    # The buffer shares the memory of the array
+    assert buffer.data is positions.array
+    assert state["positions"] is positions
+
+    ranges = []
+    update_range = buffer.update_range
+    buffer.update_range = lambda offset, size: (
+        ranges.append((offset, size)),
+        update_range(offset, size),
+    )
+    positions[100:200] = 1
+    positions.array[5] = 2
+    positions.mark_dirty(5, 6)
+    assert buffer.data[150, 0] == 1
+    assert ranges == [(100, 100), (5, 1)]
+    assert positions.take_dirty() == [(5, 6), (100, 200)]
+    assert positions.version == 2
+
+    # Negative indices are relative to the end of the array
+    ranges.clear()
+    positions[-1] = 3
+    positions[-3:-2, 0] = 4
+    assert ranges == [(999, 1), (997, 1)]
+    assert positions.take_dirty() == [(997, 998), (999, 1000)]
+
+    # Setting the array dirty also notifies the on change handlers
+    renderer.notify()
+    assert summaries[-1].attributes == {points: {"geometry.positions"}}
+
+    # Replacing the array unsubscribes from the previous one
+    other = RawArray(np.ones((10, 3), dtype=np.float32))
+    state["positions"] = other
+    assert not positions._subscribers
+    assert points.geometry.positions.data is other.array
+
+
+def test_pygfx_raw_array_unbound_on_remove(parse_source):
+    np = pytest.importorskip("numpy")
+    App, _ = parse_source(
+        """
+        <group>
+          <points
+            v-if="visible"
+            :geometry="geometry"
+            :geometry.positions="positions"
+          />
+        </group>
+
+        <script>
+        import kolla
+        import pygfx as gfx
+
+        geometry = gfx.Geometry()
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    positions = RawArray(np.zeros((10, 3), dtype=np.float32))
+    state = reactive({"positions": positions, "visible": True})
+    renderer = PygfxRenderer()
+    summaries = []
+    renderer.add_on_change_handler(summaries.append, with_changes=True)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    renderer.register_request_flush(lambda: None)
+    container = gfx.Scene()
+    gui.render(App, container, state=state)
+
+    group = container.children[0]
+    points = group.children[0]
+    buffer = points.geometry.positions
+    buffer.update_range = lambda offset, size: pytest.fail("Removed points updated")
+    assert positions._subscribers
+
+    state["visible"] = False
+    assert not group.children
+    assert not positions._subscribers
+    renderer.notify()
+
+    # Writing to the array no longer reaches the removed points
+    count = len(summaries)
+    positions[0] = 1
+    renderer.notify()
+    assert all(points not in summary.attributes for summary in summaries[count:])
+
+
+def test_raw_array_dirty_ranges_are_bounded():
+    np = pytest.importorskip("numpy")
+    positions = RawArray(np.zeros((1000, 3), dtype=np.float32))
+    # Changes that are consumed by subscribers only (nobody takes the ranges)
+    positions.subscribe(lambda start, stop: None)
+
+    for index in range(0, 1000, 2):
+        positions[index] = 1
+    dirty = positions.take_dirty()
+    assert len(dirty) <= 32
+    assert dirty[0][0] == 0
+    assert dirty[-1][1] == 999
+
+    positions[10:20] = 1
+    positions[15:30] = 1
+    positions[30] = 1
+    assert positions.take_dirty() == [(10, 31)]
+
+
+def test_pygfx_cull_group(parse_source):
+    App, _ = parse_source(
+        """
+        <cull-group :camera="camera" :renderer="wgpu_renderer" :hysteresis="1">
+          <mesh
+            v-for="i in range(count)"
+            :name="f'{label} {i}'"
+            :geometry="geometry"
+            :material="material"
+            :local.position="(i * 10 + offset, 0, 0)"
+          />
+          <group />
+        </cull-group>
+
+        <script>
+        import kolla
+        import pygfx as gfx
+
+        geometry = gfx.box_geometry()
+        material = gfx.MeshBasicMaterial()
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    def render():
+        # Stand-in for a WgpuRenderer, which dispatches 'before_render' events
+        event = WindowEvent("before_render", target=None, root=renderer)
+        renderer.dispatch_event(event)
+
+    def names(objects):
+        return sorted(obj.name for obj in objects if obj.geometry)
+
+    camera = gfx.OrthographicCamera(20, 20)
+    camera.local.position = (0, 0, 10)
+    renderer = RootEventHandler()
+    state = reactive(
+        {
+            "count": 100,
+            "offset": 0,
+            "label": "a",
+            "camera": camera,
+            "wgpu_renderer": None,
+        }
+    )
+    gui = Kolla(renderer=PygfxRenderer(), event_loop_type=EventLoopType.SYNC)
+    container = gfx.Scene()
+    gui.render(App, container, state=state)
+
+    group = container.children[0]
+    assert len(group.members) == 101
+    # New members are attached by culling, right before rendering
+    assert len(group.children) == 0
+    state["wgpu_renderer"] = renderer
+    render()
+    # Only the meshes at x=0 and x=10 intersect the frustum (x in [-10, 10])
+    # and the group without bounds is always attached
+    assert names(group.children) == ["a 0", "a 1"]
+    assert len(group.children) == 3
+
+    # The watchers of culled members are paused, except for their bounds
+    state["label"] = "b"
+    assert names(group.children) == ["b 0", "b 1"]
+    assert names(group.members) == sorted(
+        f"b {i}" if i < 2 else f"a {i}" for i in range(100)
+    )
+
+    # Move the meshes slightly: the mesh at x=11 is outside of the frustum,
+    # but within the hysteresis so it stays attached
+    state["offset"] = 1
+    assert group.cull() == (0, 0)
+    state["offset"] = 2
+    assert group.cull() == (0, 1)
+    assert names(group.children) == ["b 0"]
+
+    # Moving the camera attaches the other meshes, which catch up
+    camera.local.position = (500, 0, 10)
+    render()
+    assert names(group.children) == ["b 49", "b 50"]
+    assert len(group.children) == 3
+    assert group.members[1].name == "b 1"
+    state["label"] = "c"
+    assert group.members[1].name == "b 1"
+
+    state["count"] = 10
+    assert len(group.members) == 11
+    render()
+    assert len(group.children) == 1
+
+    # Culling stops when the renderer is unset
+    state["wgpu_renderer"] = None
+    camera.local.position = (0, 0, 10)
+    render()
+    assert len(group.children) == 1
+    assert group.cull() == (1, 0)
+    assert names(group.children) == ["c 0"]
+
+
+def test_pygfx_shared_assets(parse_source):
+    App, _ = parse_source(
+        """
+        <group>
+          <mesh
+            v-for="i in range(count)"
+            :geometry="asset(gfx.sphere_geometry, radius=1 if i < big else 0.5)"
+            :material="asset(gfx.MeshPhongMaterial, color=[1, 0, 0])"
+          />
+        </group>
+
+        <script>
+        import kolla
+        import pygfx as gfx
+        from kolla.renderers.pygfx.assets import asset
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    state = reactive({"count": 10, "big": 0})
+    renderer = PygfxRenderer()
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    container = gfx.Scene()
+    gui.render(App, container, state=state)
+
+    meshes = container.children[0].children
+    assert len({id(mesh.geometry) for mesh in meshes}) == 1
+    assert len({id(mesh.material) for mesh in meshes}) == 1
+    stats = renderer.assets.stats()
+    assert stats["assets"] == 2
+    assert stats["references"] == 20
+    assert stats["hits"] == 18
+    assert stats["hit_rate"] == 0.9
+    geometry_size = sum(
+        buffer.nbytes
+        for buffer in meshes[0].geometry.values()
+        if isinstance(buffer, gfx.Buffer)
+    )
+    assert stats["bytes_saved"] == 9 * geometry_size
+
+    state["big"] = 2
+    meshes = container.children[0].children
+    assert meshes[0].geometry is meshes[1].geometry
+    assert meshes[0].geometry is not meshes[2].geometry
+    assert renderer.assets.stats()["assets"] == 3
+
+    # Replacing an asset with an equal one keeps the shared object, also when
+    # the element is its only user
+    state["big"] = 1
+    mesh = meshes[0]
+    geometry = mesh.geometry
+    misses = renderer.assets.misses
+    renderer.set_attribute(mesh, "geometry", asset(gfx.sphere_geometry, radius=1))
+    assert mesh.geometry is geometry
+    assert renderer.assets.misses == misses
+
+    # Releasing the last users of an asset drops it from the cache
+    state["big"] = 0
+    assert renderer.assets.stats()["assets"] == 2
+    state["count"] = 0
+    stats = renderer.assets.stats()
+    assert stats["assets"] == 0
+    assert stats["references"] == 0
+
+
+def test_pygfx_asset_keys(monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    # Values are compared by type and value, containers and arrays by content
+    assert content_key(1) != content_key(1.0) != content_key(True)
+    assert content_key([1, {"a": (2,)}]) == content_key([1, {"a": (2,)}])
+    assert content_key([1, 2]) != content_key((1, 2))
+    assert content_key({1, 2}) == content_key(frozenset({2, 1}))
+    with pytest.raises(TypeError):
+        asset(gfx.MeshPhongMaterial, color=bytearray(b"red"))
+
+    # Arrays are hashed only once per object
+    hashes = []
+    blake2b = hashlib.blake2b
+    monkeypatch.setattr(
+        hashlib, "blake2b", lambda data: hashes.append(1) or blake2b(data)
+    )
+    positions = np.zeros((100, 3), dtype=np.float32)
+    assert content_key(positions) == content_key(positions)
+    assert len(hashes) == 1
+    assert content_key(positions.copy()) == content_key(positions)
+    assert len(hashes) == 2
+    assert content_key(positions.astype(np.float64)) != content_key(positions)
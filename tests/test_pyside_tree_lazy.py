@@ -0,0 +1,125 @@
+import pytest
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+from kolla.renderers import PySideRenderer  # noqa: E402
+
+ChildIndicatorPolicy = QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy
+
+
+@pytest.fixture
+def tree_app(parse_source):
+    App, _ = parse_source(
+        """
+        <treewidget>
+          <treewidgetitem
+            v-for="i in range(count)"
+            :content="{0: f'item {i}'}"
+            lazy
+            :unload_timeout="timeout"
+          >
+            <treewidgetitem
+              v-for="j in range(children)"
+              :content="{0: f'{label} {i}.{j}'}"
+            />
+          </treewidgetitem>
+        </treewidget>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+    return App
+
+
+def render(component_class, state):
+    state.setdefault("children", 3)
+    state.setdefault("label", "child")
+    renderer = PySideRenderer(autoshow=False)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    container = renderer.create_element("widget")
+    gui.render(component_class, container, state=state)
+    tree = container.findChild(QtWidgets.QTreeWidget)
+    return gui, tree
+
+
+def test_tree_lazy_unloaded_children_are_paused(qapp, qtbot, tree_app):
+    state = reactive({"count": 1, "timeout": 10})
+    _gui, tree = render(tree_app, state)
+
+    item = tree.invisibleRootItem().child(0)
+    item.setExpanded(True)
+    item.setExpanded(False)
+    qtbot.waitUntil(lambda: item.childCount() == 0)
+
+    # Changes don't mount anything into the collapsed item
+    state["children"] = 4
+    state["label"] = "node"
+    assert item.childCount() == 0
+    assert item.childIndicatorPolicy() == ChildIndicatorPolicy.ShowIndicator
+
+    # Expanding again catches up with the changes
+    item.setExpanded(True)
+    assert item.childCount() == 4
+    assert [item.child(j).text(0) for j in range(4)] == [
+        f"node 0.{j}" for j in range(4)
+    ]
+
+
+def test_tree_lazy_children_mounted_on_expand(qapp, tree_app):
+    _gui, tree = render(tree_app, {"count": 5, "timeout": None})
+
+    root = tree.invisibleRootItem()
+    assert root.childCount() == 5
+    for idx in range(root.childCount()):
+        item = root.child(idx)
+        assert item.childCount() == 0
+        # Expand indicator is shown, even without children
+        assert item.childIndicatorPolicy() == ChildIndicatorPolicy.ShowIndicator
+
+    item = root.child(2)
+    item.setExpanded(True)
+
+    assert item.childCount() == 3
+    assert item.child(0).text(0) == "child 2.0"
+    assert root.child(1).childCount() == 0
+
+    # Collapsing without a timeout keeps the children
+    item.setExpanded(False)
+    item.setExpanded(True)
+    assert item.childCount() == 3
+
+
+def test_tree_lazy_children_unmounted_after_timeout(qapp, qtbot, tree_app):
+    _gui, tree = render(tree_app, {"count": 2, "timeout": 10})
+
+    item = tree.invisibleRootItem().child(0)
+    item.setExpanded(True)
+    assert item.childCount() == 3
+
+    item.setExpanded(False)
+    qtbot.waitUntil(lambda: item.childCount() == 0)
+    assert item.childIndicatorPolicy() == ChildIndicatorPolicy.ShowIndicator
+
+    # Expanding again mounts the children again
+    item.setExpanded(True)
+    assert item.childCount() == 3
+    assert item.child(2).text(0) == "child 0.2"
+
+
+def test_tree_lazy_expanding_cancels_unmount(qapp, qtbot, tree_app):
+    _gui, tree = render(tree_app, {"count": 1, "timeout": 50})
+
+    item = tree.invisibleRootItem().child(0)
+    item.setExpanded(True)
+    item.setExpanded(False)
+    item.setExpanded(True)
+
+    qtbot.wait(100)
+    assert item.childCount() == 3
@@ -0,0 +1,99 @@
+import pytest
+from observ import reactive
+
+from kolla import EventLoopType, Kolla
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+from kolla.renderers import PySideRenderer  # noqa: E402
+
+
+def process_deferred_deletes(qapp):
+    qapp.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+
+
+def test_unmount_destroys_elements(qapp, parse_source):
+    App, _ = parse_source(
+        """
+        <widget>
+          <button
+            v-for="i in range(count)"
+            :text="str(i)"
+            @clicked="clicked"
+            @mouse-press="pressed"
+          />
+        </widget>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            def clicked(self):
+                pass
+
+            def pressed(self, event):
+                pass
+        </script>
+        """
+    )
+
+    renderer = PySideRenderer(autoshow=False)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    container = renderer.create_element("widget")
+    state = reactive({"count": 10})
+    gui.render(App, container, state=state)
+
+    assert renderer.live_objects()["button"] == 10
+    root = container.layout().itemAt(0).widget()
+    layout = root.layout()
+    buttons = [layout.itemAt(idx).widget() for idx in range(layout.count())]
+    assert all(button.slots["clicked"] for button in buttons)
+    assert all(hasattr(button, "_event_filter") for button in buttons)
+
+    state["count"] = 2
+    process_deferred_deletes(qapp)
+
+    assert renderer.live_objects()["button"] == 2
+    for button in buttons[2:]:
+        assert not hasattr(button, "slots")
+        assert not hasattr(button, "_event_filter")
+
+    state["count"] = 0
+    process_deferred_deletes(qapp)
+
+    assert renderer.live_objects()["button"] == 0
+    assert renderer.live_objects()["widget"] == 2
+
+
+def test_unmount_churn_bounded(qapp, parse_source):
+    App, _ = parse_source(
+        """
+        <widget>
+          <widget v-if="show">
+            <label
+              v-for="i in range(10)"
+              :text="str(i)"
+            />
+          </widget>
+        </widget>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    renderer = PySideRenderer(autoshow=False)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    container = renderer.create_element("widget")
+    state = reactive({"show": True})
+    gui.render(App, container, state=state)
+
+    expected = renderer.live_objects()
+    for _ in range(5):
+        state["show"] = False
+        state["show"] = True
+        process_deferred_deletes(qapp)
+        assert renderer.live_objects() == expected
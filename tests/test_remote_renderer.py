@@ -0,0 +1,136 @@
+import textwrap
+import time
+from multiprocessing import Pipe
+
+from observ import reactive
+
+from kolla import DictRenderer, EventLoopType, Kolla
+from kolla.renderers.remote_renderer import RemoteHost, RemoteRenderer, start_worker
+from kolla.sfc import compiler
+
+
+def test_remote_renderer(parse_source):
+    App, _ = parse_source(
+        """
+        <app>
+          <item
+            v-for="i in range(count)"
+            :value="i"
+            :label="f'Item {i}'"
+            :data="{'index': i}"
+            @click="bump"
+          />
+          <label v-if="count > 2" text="many" />
+        </app>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.state["count"] = self.props["start"]
+
+            def bump(self, amount):
+                self.state["count"] += amount
+        </script>
+        """
+    )
+
+    host_connection, worker_connection = Pipe()
+    renderer = RemoteRenderer(worker_connection)
+    gui = Kolla(renderer=renderer, event_loop_type=EventLoopType.SYNC)
+    # Send manually, instead of after every flush of the scheduler
+    renderer.register_request_flush(None)
+    gui.render(App, renderer.root, state=reactive({"start": 2}))
+
+    container = {"type": "root"}
+    host = RemoteHost(DictRenderer(), container, host_connection)
+    # Nothing is sent until the batch is complete
+    assert host.poll() == 0
+    renderer.send()
+    assert host.poll() == 1
+
+    app = container["children"][0]
+    assert [child["attrs"] for child in app["children"]] == [
+        {"value": 0, "label": "Item 0", "data": {"index": 0}},
+        {"value": 1, "label": "Item 1", "data": {"index": 1}},
+    ]
+
+    # Events are sent back to the worker, which sends back the changes
+    (listener,) = app["children"][1]["handlers"]["click"]
+    listener(2)
+    renderer.dispatch(worker_connection.recv_bytes())
+    renderer.send()
+    assert host.poll() == 1
+    assert [child["type"] for child in app["children"]] == ["item"] * 4 + ["label"]
+    assert app["children"][3]["attrs"]["label"] == "Item 3"
+
+    (listener,) = app["children"][0]["handlers"]["click"]
+    listener(-3)
+    renderer.dispatch(worker_connection.recv_bytes())
+    renderer.send()
+    host.poll()
+    assert [child["attrs"]["value"] for child in app["children"]] == [0]
+    # Removed elements and their event handlers are released
+    assert len(host.elements) == 3
+    assert len(renderer._handlers) == 1
+    assert len(host._listeners) == 1
+    assert sum(map(len, host._element_listeners.values())) == 1
+    assert host.batches == 3
+
+
+WORKER_SOURCE = """
+<app :result="result" :ticks="ticks" />
+
+<script>
+import asyncio
+
+import kolla
+
+def compute():
+    return sum(range(10))
+
+class App(kolla.Component):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state["result"] = None
+        self.state["ticks"] = 0
+
+    def mounted(self):
+        self.run_in_executor(compute, key="result")
+        asyncio.get_running_loop().call_later(0.01, self.tick)
+
+    def tick(self):
+        self.state["ticks"] += 1
+        if self.state["ticks"] < 3:
+            asyncio.get_running_loop().call_later(0.01, self.tick)
+</script>
+"""
+
+
+def create_worker_app():
+    """Called in the worker process."""
+    App, _ = compiler.load_from_string(textwrap.dedent(WORKER_SOURCE))
+    return App, reactive({})
+
+
+def test_remote_worker_changes_without_events():
+    process, connection = start_worker(create_worker_app)
+    container = {"type": "root"}
+    host = RemoteHost(DictRenderer(), container, connection)
+    try:
+        # The results of jobs and timers in the worker are streamed, without
+        # any events of the host
+        deadline = time.monotonic() + 30
+        expected = {"result": 45, "ticks": 3}
+        while time.monotonic() < deadline:
+            host.poll(timeout=0.1)
+            children = container.get("children")
+            if children and children[0]["attrs"] == expected:
+                break
+        assert container["children"][0]["attrs"] == expected
+        assert host.batches > 1
+    finally:
+        connection.close()
+        process.join(timeout=10)
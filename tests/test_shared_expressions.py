@@ -0,0 +1,186 @@
+import textwrap
+
+from observ import reactive
+
+from kolla import DictRenderer, EventLoopType, Kolla
+from kolla.sfc import compiler
+
+SOURCE = """\
+<app>
+  <label
+    :text="labels[idx] + '!'"
+    :tool_tip="labels[idx] + '!'"
+  />
+  <item
+    v-for="row in items"
+    :key="row['id']"
+    :text="row['label']"
+    :title="f'{prefix}: ' + row['label']"
+    :class="f'{prefix}: '"
+  />
+</app>
+
+<script>
+import kolla
+
+class Labels:
+    reads = 0
+
+    def __getitem__(self, idx):
+        Labels.reads += 1
+        return ["foo", "bar"][idx]
+
+labels = Labels()
+
+class App(kolla.Component):
+    pass
+</script>
+"""
+
+
+def render(component, state):
+    """Returns the container and the gui, which has to be kept alive."""
+    container = {"type": "root"}
+    gui = Kolla(DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(component, container, state=state)
+    return container, gui
+
+
+def test_shared_expression_evaluated_once(parse_source):
+    App, namespace = parse_source(SOURCE)
+    Labels = namespace["Labels"]
+    state = reactive(
+        {
+            "idx": 0,
+            "prefix": "a",
+            "items": [{"id": 1, "label": "foo"}, {"id": 2, "label": "bar"}],
+        }
+    )
+    container, _gui = render(App, state)
+
+    label = container["children"][0]["children"][0]
+    assert label["attrs"]["text"] == "foo!"
+    assert label["attrs"]["tool_tip"] == "foo!"
+    assert Labels.reads == 1
+
+    state["idx"] = 1
+    assert label["attrs"]["text"] == "bar!"
+    assert label["attrs"]["tool_tip"] == "bar!"
+    assert Labels.reads == 2
+
+    state["prefix"] = "b"
+    items = container["children"][0]["children"][1:]
+    assert [item["attrs"]["title"] for item in items] == ["b: foo", "b: bar"]
+    assert [item["attrs"]["class"] for item in items] == ["b: ", "b: "]
+
+
+def test_shared_expressions_in_render_function():
+    dump = compiler.dump_render_function("<template>", SOURCE)
+
+    # The expression and the loop invariant are shared, where first used
+    assert " 3 |     _shared0 = computed(lambda: self._lookup('labels'," in dump
+    assert " 3 |     label0.set_bind('text', lambda: _shared0())" in dump
+    assert " 4 |     label0.set_bind('tool_tip', lambda: _shared0())" in dump
+    assert "10 |     _shared1 = computed(lambda: f\"{self._lookup('prefix'," in dump
+    assert "lambda: _shared1() + unpacked0()['row']['label'])" in dump
+    # Looking up a variable is cheaper than sharing it
+    assert "set_bind('key', lambda: unpacked0()['row']['id'])" in dump
+    assert dump.count("computed(") == 2
+
+
+def test_repeats_within_binding_are_not_shared():
+    dump = compiler.dump_render_function(
+        "<template>",
+        textwrap.dedent(
+            """
+        <app :text="f'{name}' + f'{name}'" />
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+        ),
+    )
+
+    assert "computed(" not in dump
+
+
+def test_impure_calls_are_not_shared(parse_source):
+    App, _ = parse_source(
+        """
+        <app>
+          <item
+            v-for="i in items"
+            :pos="(random.random(), random.random())"
+            :other="(random.random(), random.random())"
+          />
+        </app>
+
+        <script>
+        import random
+
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+    container, _gui = render(App, reactive({"items": [0, 1]}))
+
+    items = container["children"][0]["children"]
+    values = [item["attrs"][attr] for item in items for attr in ("pos", "other")]
+    assert len({value for pair in values for value in pair}) == 8
+
+
+def test_invariant_of_single_binding_is_not_hoisted(parse_source):
+    App, _ = parse_source(
+        """
+        <app>
+          <item v-for="i in items" :text="f'{ticks()} {len(items) * 5}'" />
+        </app>
+
+        <script>
+        import kolla
+
+        counter = 0
+
+        def ticks():
+            global counter
+            counter += 1
+            return counter
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+    container, _gui = render(App, reactive({"items": [0, 1, 2, 3]}))
+
+    texts = [item["attrs"]["text"] for item in container["children"][0]["children"]]
+    assert texts == ["1 20", "2 20", "3 20", "4 20"]
+
+
+def test_iterators_are_not_shared(parse_source):
+    App, _ = parse_source(
+        """
+        <app>
+          <item v-for="i, x in enumerate(items)" :value="x" />
+          <item v-for="i, x in enumerate(items)" :value="i" />
+        </app>
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+    container, _gui = render(App, reactive({"items": ["a", "b"]}))
+
+    values = [item["attrs"]["value"] for item in container["children"][0]["children"]]
+    assert values == ["a", "b", 0, 1]
@@ -0,0 +1,68 @@
+import traceback
+
+import pytest
+from observ import reactive
+
+from kolla import DictRenderer, EventLoopType, Kolla
+from kolla.sfc import compiler
+from kolla.sfc.parser import KollaParser
+
+SOURCE = """\
+<app :title="title">
+  <item
+    v-for="x in items"
+    :value="1 / x"
+    @click="select(x)"
+  />
+</app>
+
+<script>
+import kolla
+
+class App(kolla.Component):
+    def select(self, x):
+        pass
+</script>
+"""
+
+
+def test_parser_attribute_locations():
+    parser = KollaParser()
+    parser.feed(SOURCE)
+    app = parser.root.children[0]
+    item = app.children[0]
+
+    assert app.location == (1, 0)
+    assert app.attr_locations == {":title": (1, 5)}
+    assert item.attr_locations == {
+        "v-for": (3, 4),
+        ":value": (4, 4),
+        "@click": (5, 4),
+    }
+
+
+def test_traceback_points_to_template(tmp_path):
+    path = tmp_path / "app.cgx"
+    path.write_text(SOURCE)
+    App, _ = compiler.load(path)
+
+    gui = Kolla(DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    with pytest.raises(ZeroDivisionError) as exc_info:
+        gui.render(App, {"type": "root"}, state=reactive({"title": "a", "items": [0]}))
+
+    frames = traceback.extract_tb(exc_info.tb)
+    frame = next(frame for frame in frames if frame.filename == str(path))
+    assert frame.lineno == 4
+    assert frame.line == ':value="1 / x"'
+
+
+def test_dump_render_function():
+    dump = compiler.dump_render_function("<template>", SOURCE)
+    lines = dump.splitlines()
+
+    assert lines[0] == "15 | def render(self, renderer):"
+    assert " 1 |     app0.set_bind('title'," in dump
+    assert " 3 |     def create_item1(context):" in dump
+    assert " 4 |         item1.set_bind('value'," in dump
+    assert " 5 |         item1.set_event('click'," in dump
+    assert lines[-1] == "15 |     return component"
@@ -0,0 +1,122 @@
+import queue
+import threading
+
+import pytest
+from observ import reactive, watch
+
+import kolla
+
+
+def test_state_channel(parse_source):
+    App, _ = parse_source(
+        """
+        <app :count="count" :temperature="sensors['temperature']" />
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    gui = kolla.Kolla(kolla.DictRenderer(), event_loop_type=kolla.EventLoopType.SYNC)
+    container = {"type": "root"}
+    state = reactive({"count": 0, "sensors": {"temperature": 0.0}})
+    gui.render(App, container, state=state)
+    element = container["children"][0]
+    channel = gui.channel(state)
+    flushes = []
+    # Keep a reference to the watcher, to keep it alive
+    watcher = watch(
+        lambda: (state["count"], state["sensors"]["temperature"]),
+        lambda value: flushes.append(value),
+    )
+
+    def produce():
+        for i in range(1, 1001):
+            channel.put("count", i)
+            channel.put(("sensors", "temperature"), i / 10)
+
+    threads = [threading.Thread(target=produce) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Nothing is applied until the main thread processes the updates
+    assert element["attrs"]["count"] == 0
+    assert channel.received == 8000
+    assert len(channel) == 2
+
+    assert gui.process_pending() == 1
+    # The latest value of each key wins and all updates are applied at once
+    assert element["attrs"]["count"] == 1000
+    assert element["attrs"]["temperature"] == 100.0
+    assert channel.applied == 2
+    assert flushes == [(1000, 100.0)]
+
+    channel.update({"count": 1, ("sensors", "temperature"): 1.5})
+    gui.process_pending()
+    assert element["attrs"] == {"count": 1, "temperature": 1.5}
+    assert channel.batches == 2
+    assert len(flushes) == 2
+    del watcher
+
+
+def test_state_channel_backpressure():
+    gui = kolla.Kolla(kolla.DictRenderer(), event_loop_type=kolla.EventLoopType.SYNC)
+    state = reactive({})
+    channel = gui.channel(state, maxsize=2)
+
+    channel.put("a", 1)
+    channel.put("b", 1)
+    # Keys that are already pending are always accepted
+    channel.put("a", 2)
+    with pytest.raises(queue.Full):
+        channel.put("c", 1, block=False)
+    with pytest.raises(queue.Full):
+        channel.put("c", 1, timeout=0.01)
+
+    # Blocked producers continue once the updates are applied
+    producer = threading.Thread(target=channel.put, args=("c", 3))
+    producer.start()
+    producer.join(0.05)
+    assert producer.is_alive()
+    gui.process_pending()
+    producer.join()
+    gui.process_pending()
+    assert state == {"a": 2, "b": 1, "c": 3}
+
+
+def test_state_channel_sparse_indices(monkeypatch):
+    gui = kolla.Kolla(kolla.DictRenderer(), event_loop_type=kolla.EventLoopType.SYNC)
+    other = kolla.Kolla(kolla.DictRenderer(), event_loop_type=kolla.EventLoopType.SYNC)
+    state = reactive({"values": list(range(10))})
+    channel = gui.channel(state)
+    flushes = []
+    # Keep a reference to the watcher, to keep it alive
+    watcher = watch(lambda: state["values"], flushes.append, deep=True)
+    # Record the writes to the list
+    writes = []
+    values = state["values"]
+    setitem = type(values).__setitem__
+
+    def record(self, index, value):
+        writes.append(index)
+        setitem(self, index, value)
+
+    monkeypatch.setattr(type(values), "__setitem__", record)
+    channel.update({("values", 7): -7, ("values", 1): -1, ("values", 2): -2})
+    # Every instance has its own queue
+    assert other.process_pending() == 0
+    assert gui.process_pending() == 1
+    monkeypatch.undo()
+
+    # Only the updated indices are written, consecutive ones at once
+    assert writes == [slice(1, 3), 7]
+    assert state["values"] == [0, -1, -2, 3, 4, 5, 6, -7, 8, 9]
+    # The scheduler is flushed once for all writes
+    assert len(flushes) == 1
+    del watcher
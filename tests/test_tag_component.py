@@ -1,5 +1,6 @@
-from observ import reactive
+from observ import reactive, watch
 
+import kolla
 from kolla import EventLoopType, Kolla
 from kolla.renderers import DictRenderer
 
@@ -129,3 +130,144 @@ def test_component_tag_props_and_events(parse_source):
         handler()
 
     assert el["attrs"]["count"] == 1
+
+
+def test_component_raw_props(parse_source):
+    _, namespace = parse_source(
+        """
+        <sub :size="len(data.value)" :first="data.value[0]['name']" />
+
+        <script>
+        import kolla
+
+        class SubComponent(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    App, namespace = parse_source(
+        """
+        <el>
+          <SubComponent :data="data" />
+          <item v-for="row in data" :name="row['name']" />
+        </el>
+
+        <script>
+        import kolla
+
+        try:
+            import SubComponent
+        except:
+            pass
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """,
+        namespace=namespace,
+    )
+
+    items = [{"name": "a"}, {"name": "b"}]
+    data = kolla.raw(items)
+    state = reactive({"data": data})
+    container = {"type": "root"}
+    gui = Kolla(renderer=DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(App, container, state=state)
+
+    el = container["children"][0]
+    sub = el["children"][0]
+    assert sub["attrs"] == {"size": 2, "first": "a"}
+    assert [item["attrs"]["name"] for item in el["children"][1:]] == ["a", "b"]
+
+    # The value is passed by reference, without being proxied
+    assert state["data"] is data
+    assert data.value is items
+    assert kolla.raw(data) is data
+
+    # Modifications in place are only picked up after calling `changed`
+    items.append({"name": "c"})
+    items[0]["name"] = "z"
+    assert sub["attrs"]["size"] == 2
+    data.changed()
+    assert sub["attrs"] == {"size": 3, "first": "z"}
+    assert data.version == 1
+    assert [item["attrs"]["name"] for item in el["children"][1:]] == ["z", "b", "c"]
+
+    state["data"] = kolla.raw([{"name": "x"}])
+    assert sub["attrs"] == {"size": 1, "first": "x"}
+    assert len(el["children"]) == 2
+
+
+def test_raw_boxes_compare_by_value_identity():
+    items = [{"name": "a"}]
+    state = reactive({"items": items, "tick": 0})
+
+    def boxed():
+        state["tick"]
+        # Boxed again on every evaluation, as in a template expression
+        return kolla.raw(state["items"])
+
+    changes = []
+    watcher = watch(boxed, lambda new, old: changes.append(new), sync=True)
+    first = watcher.value
+    assert first == kolla.raw(items)
+    assert hash(first) == hash(kolla.raw(items))
+    assert first != kolla.raw(list(items))
+    assert first != kolla.shallow(items)
+
+    # An equal box does not count as a change
+    state["tick"] += 1
+    assert changes == []
+    assert watcher.value is first
+
+    # All boxes of a value share its version, so calling `changed` on a new box
+    # re-evaluates the watchers that read the value through the kept box
+    sizes = []
+    size = watch(
+        lambda: len(first.value), lambda new, old: sizes.append(new), sync=True
+    )
+    items.append({"name": "b"})
+    kolla.raw(items).changed()
+    assert sizes == [2]
+    assert size.value == 2
+    assert first.version == 1
+
+    state["items"] = [{"name": "x"}]
+    assert len(changes) == 1
+    assert changes[0].value == [{"name": "x"}]
+
+
+def test_component_shallow_props(parse_source):
+    App, _ = parse_source(
+        """
+        <sub :size="len(data.value)" :first="data.value['first']['name']" />
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    first = {"name": "a"}
+    source = reactive({"first": first})
+    data = kolla.shallow(source)
+    container = {"type": "root"}
+    gui = Kolla(renderer=DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    gui.render(App, container, state={"data": data})
+
+    sub = container["children"][0]
+    assert sub["attrs"] == {"size": 1, "first": "a"}
+    # Nested values are not proxied
+    assert data.value["first"] is first
+
+    # Top-level changes are tracked, nested changes are not
+    source["second"] = {}
+    assert sub["attrs"]["size"] == 2
+    first["name"] = "b"
+    assert sub["attrs"]["first"] == "a"
+    data.changed()
+    assert sub["attrs"]["first"] == "b"
@@ -0,0 +1,99 @@
+import json
+import logging
+
+from observ import reactive
+
+from kolla import DictRenderer, EventLoopType, Kolla, tracing
+
+
+def test_tracing(parse_source, tmp_path):
+    Item, _ = parse_source(
+        """
+        <item :value="value" />
+
+        <script>
+        import kolla
+
+        class Item(kolla.Component):
+            pass
+        </script>
+        """
+    )
+    App, _ = parse_source(
+        """
+        <app :title="title">
+          <Item v-for="i in range(count)" :value="i" />
+        </app>
+
+        <script>
+        import kolla
+
+        try:
+            import Item
+        except:
+            pass
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """,
+        namespace={"Item": Item},
+    )
+
+    renderer = DictRenderer()
+    gui = Kolla(renderer, event_loop_type=EventLoopType.SYNC)
+    state = reactive({"title": "a", "count": 2})
+    with tracing.trace() as tracer:
+        gui.render(App, {"type": "root"}, state=state)
+        state["title"] = "b"
+    # Tracing is disabled again
+    assert "set_attribute" not in vars(renderer)
+    state["count"] = 3
+    assert tracing.tracer is None
+
+    names = [event["name"] for event in tracer.events]
+    for name in ["App.render", "App.mount", "App.mounted", "Item.render"]:
+        assert name in names
+    assert names.count("Item.mount") == 2
+    assert names.count("flush") == 1
+    assert "App.app[bind:title]" in names
+
+    events = {event["name"]: event for event in tracer.events}
+    assert events["App.render"]["args"]["location"].startswith("<template>:")
+    assert events["create_element"]["cat"] == "renderer"
+    # The watcher span contains the renderer call
+    flush, watcher = events["flush"], events["App.app[bind:title]"]
+    assert flush["ts"] <= watcher["ts"]
+    assert watcher["ts"] + watcher["dur"] <= flush["ts"] + flush["dur"]
+    assert events["set_attribute"]["args"] == {"attr": "title"}
+
+    path = tmp_path / "trace.json"
+    tracer.save(path)
+    assert json.loads(path.read_text())["traceEvents"] == tracer.events
+
+
+def test_log_slow_flushes(parse_source, caplog):
+    App, _ = parse_source(
+        """
+        <app :title="title" />
+
+        <script>
+        import kolla
+
+        class App(kolla.Component):
+            pass
+        </script>
+        """
+    )
+
+    gui = Kolla(DictRenderer(), event_loop_type=EventLoopType.SYNC)
+    state = reactive({"title": "a"})
+    gui.render(App, {"type": "root"}, state=state)
+
+    tracing.log_slow_flushes(0)
+    try:
+        with caplog.at_level(logging.WARNING, logger="kolla.tracing"):
+            state["title"] = "b"
+    finally:
+        tracing.log_slow_flushes(None)
+    assert "Slow flush" in caplog.text